@@ -21,6 +21,7 @@ def register():
     operators.start_queue_timer()
 
 def unregister():
+    operators.stop_queue_timer()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     operators.unregister_scene_props()
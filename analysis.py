@@ -0,0 +1,209 @@
+import time
+
+import numpy as np
+
+from .mesh_arrays import read_coords, read_topology, read_edges, next_corner, edge_keys
+from .mesh_merge import find_close_pairs
+
+# Nearest neighbour histogram bins as fractions of the median edge length.
+# The first bin holds exact duplicates, the last everything from 0.1 up.
+HISTOGRAM_EDGES = (0.0, 1e-4, 1e-3, 1e-2, 1e-1)
+
+# Rough QuadriFlow cost on an average desktop, corrected by observed runs:
+# (fixed, per input triangle, per target face)
+REMESH_SECONDS = (0.5, 4e-5, 2e-4)
+REMESH_BYTES = (64 << 20, 1500, 4000)
+
+# ------------------------------
+# Pure NumPy core
+# ------------------------------
+def face_mix(loop_totals):
+    """(triangles, quads, ngons)"""
+    tris = int(np.count_nonzero(loop_totals == 3))
+    quads = int(np.count_nonzero(loop_totals == 4))
+    return tris, quads, len(loop_totals) - tris - quads
+
+def edge_usage(loop_verts, loop_starts, loop_totals, edges, vertex_count):
+    """(boundary edges, non-manifold edges): edges with one face, and edges with more than two or none"""
+    if len(loop_verts) == 0:
+        return 0, len(edges)
+    keys = edge_keys(np.column_stack((loop_verts, loop_verts[next_corner(loop_starts, loop_totals)])), vertex_count)
+    _, faces = np.unique(keys, return_counts=True)
+    wire = max(len(edges) - len(faces), 0)
+    return int(np.count_nonzero(faces == 1)), int(np.count_nonzero(faces > 2)) + wire
+
+def nearest_distances(coords, radius):
+    """Distance from every vertex to its nearest other vertex, inf when nothing is closer than `radius`"""
+    coords = np.asarray(coords, dtype=np.float64)
+    nearest = np.full(len(coords), np.inf)
+    a, b = find_close_pairs(coords, radius)
+    if len(a):
+        distances = np.linalg.norm(coords[a] - coords[b], axis=1)
+        np.minimum.at(nearest, a, distances)
+        np.minimum.at(nearest, b, distances)
+    return nearest
+
+def distance_histogram(nearest, edge_length):
+    """Vertex counts per HISTOGRAM_EDGES bin, as [(upper bound, count)], the last bound is inf"""
+    bounds = np.array(HISTOGRAM_EDGES[1:]) * edge_length
+    exact = int(np.count_nonzero(nearest == 0.0))
+    counts = np.bincount(np.searchsorted(bounds, nearest[nearest > 0.0], side='right'), minlength=len(bounds) + 1)
+    counts[0] += exact
+    return list(zip([*bounds.tolist(), float('inf')], counts.tolist()))
+
+def suggest_merge_distance(nearest, edge_length):
+    """
+    Merge distance that welds the near-duplicate vertices but no real
+    geometry, None when there are no near duplicates.
+
+    Duplicates sit far below the edge length, so the suggestion ends at the
+    first gap of a decade or more in the sorted nearest neighbour distances.
+    """
+    close = np.sort(nearest[nearest < 0.1 * edge_length])
+    if len(close) == 0:
+        return None
+    logs = np.log10(np.maximum(close, edge_length * 1e-7))
+    gaps = np.diff(np.append(logs, np.log10(edge_length)))
+    end = close[np.flatnonzero(gaps >= 1.0)[0]]
+    return float(min(max(end * 2.0, edge_length * 1e-5), 0.1 * edge_length))
+
+def analyze_buffers(coords, loop_verts, loop_starts, loop_totals, edges):
+    """Statistics of one mesh as a plain dict"""
+    tris, quads, ngons = face_mix(loop_totals)
+    boundary, non_manifold = edge_usage(loop_verts, loop_starts, loop_totals, edges, len(coords))
+    result = {
+        "vertices": len(coords),
+        "faces": len(loop_totals),
+        "tris": tris,
+        "quads": quads,
+        "ngons": ngons,
+        "triangles": int((loop_totals - 2).sum()) if len(loop_totals) else 0,
+        "boundary_edges": boundary,
+        "non_manifold_edges": non_manifold,
+        "bounds": (coords.min(axis=0).tolist(), coords.max(axis=0).tolist()) if len(coords) else None,
+        "edge_length": 0.0,
+        "histogram": [],
+        "duplicates": 0,
+        "merge_distance": None,
+    }
+    lengths = np.linalg.norm(coords[edges[:, 0]] - coords[edges[:, 1]], axis=1) if len(edges) else np.empty(0)
+    lengths = lengths[lengths > 0.0]
+    if len(lengths):
+        edge_length = float(np.median(lengths))
+        nearest = nearest_distances(coords, 0.1 * edge_length)
+        merge_distance = suggest_merge_distance(nearest, edge_length)
+        result.update(
+            edge_length=edge_length,
+            histogram=distance_histogram(nearest, edge_length),
+            merge_distance=merge_distance,
+            duplicates=int(np.count_nonzero(nearest <= merge_distance)) if merge_distance else 0,
+        )
+    return result
+
+# ------------------------------
+# Remesh cost prediction
+# ------------------------------
+class RemeshCostModel:
+    """
+    QuadriFlow time and memory estimate from the input triangle count and
+    the target face count. Every finished remesh scales the built-in rates
+    towards what this machine actually needed.
+    """
+
+    def __init__(self):
+        self.time_scale = 1.0
+        self.memory_scale = 1.0
+        self.samples = 0
+
+    @staticmethod
+    def _base(rates, triangles, target_faces):
+        fixed, per_triangle, per_face = rates
+        return fixed + per_triangle * triangles + per_face * target_faces
+
+    def estimate(self, triangles, target_faces):
+        """(seconds, bytes)"""
+        return (self._base(REMESH_SECONDS, triangles, target_faces) * self.time_scale,
+                int(self._base(REMESH_BYTES, triangles, target_faces) * self.memory_scale))
+
+    def max_triangles(self, target_faces, budget_bytes):
+        """Largest input triangle count whose estimated peak stays within `budget_bytes`"""
+        fixed, per_triangle, per_face = REMESH_BYTES
+        return max(int((budget_bytes / self.memory_scale - fixed - per_face * target_faces) / per_triangle), 0)
+
+    def observe(self, triangles, target_faces, seconds, peak_bytes=None):
+        # Moving average of the measured/base ratio, recent runs weigh more
+        weight = 1.0 if self.samples == 0 else 0.3
+        self.time_scale += weight * (seconds / self._base(REMESH_SECONDS, triangles, target_faces) - self.time_scale)
+        if peak_bytes:
+            self.memory_scale += weight * (peak_bytes / self._base(REMESH_BYTES, triangles, target_faces) - self.memory_scale)
+        self.samples += 1
+
+remesh_costs = RemeshCostModel()
+
+# ------------------------------
+# Cache
+# ------------------------------
+class AnalysisCache:
+    """
+    Analysis results per mesh datablock. The panel only reads from here,
+    entries are computed by the Analyze operator and dropped by the
+    depsgraph handler as soon as the mesh geometry changes.
+    """
+
+    def __init__(self):
+        self._results = {}
+
+    def get(self, mesh):
+        return self._results.get(mesh.as_pointer())
+
+    def analyze(self, mesh):
+        start = time.perf_counter()
+        loop_verts, loop_starts, loop_totals = read_topology(mesh)
+        result = analyze_buffers(read_coords(mesh), loop_verts, loop_starts, loop_totals, read_edges(mesh))
+        result["seconds"] = time.perf_counter() - start
+        self._results[mesh.as_pointer()] = result
+        return result
+
+    def invalidate(self, mesh):
+        self._results.pop(mesh.as_pointer(), None)
+
+    def clear(self):
+        self._results.clear()
+
+analysis_cache = AnalysisCache()
+
+def _on_depsgraph_update(scene, depsgraph):
+    if not analysis_cache._results:
+        return
+    import bpy
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry:
+            continue
+        datablock = update.id.original
+        if isinstance(datablock, bpy.types.Object):
+            datablock = datablock.data
+        if isinstance(datablock, bpy.types.Mesh):
+            analysis_cache.invalidate(datablock)
+
+def _on_load(*_):
+    # Pointers of the previous file may be reused by the new one
+    analysis_cache.clear()
+
+def _handlers():
+    # bpy is imported here so the NumPy core above loads without Blender
+    import bpy
+    return ((bpy.app.handlers.depsgraph_update_post, _on_depsgraph_update),
+            (bpy.app.handlers.load_post, _on_load))
+
+def register_handlers():
+    import bpy
+    for handlers, fn in _handlers():
+        if fn not in handlers:
+            # persistent() marks the function itself, so it survives loading files
+            handlers.append(bpy.app.handlers.persistent(fn))
+
+def unregister_handlers():
+    for handlers, fn in _handlers():
+        if fn in handlers:
+            handlers.remove(fn)
+    analysis_cache.clear()
@@ -0,0 +1,437 @@
+import os
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+import numpy as np
+
+from . import bake_worker
+from .mesh_arrays import read_coords
+
+TILE_SIZE = 256
+# Fewest rays per background worker, below that Blender's startup costs more than the casts save
+MIN_WORKER_RAYS = 250000
+BAKE_UV_NAME = "BakeUV"
+# Colour used where the source has no material at all
+DEFAULT_BASE_COLOR = (0.8, 0.8, 0.8)
+
+# ------------------------------
+# Mesh sampling data
+# ------------------------------
+class TriangleMesh:
+    """World space triangles of an evaluated object with corner normals, UVs and materials"""
+
+    def __init__(self, obj, depsgraph, uv_name=None):
+        eval_obj = obj.evaluated_get(depsgraph)
+        mesh = eval_obj.to_mesh()
+        try:
+            mesh.calc_loop_triangles()
+            count = len(mesh.loop_triangles)
+            self.tri_verts = np.empty(count * 3, dtype=np.int32)
+            mesh.loop_triangles.foreach_get("vertices", self.tri_verts)
+            self.tri_verts = self.tri_verts.reshape(-1, 3)
+            self.tri_loops = np.empty(count * 3, dtype=np.int32)
+            mesh.loop_triangles.foreach_get("loops", self.tri_loops)
+            self.tri_loops = self.tri_loops.reshape(-1, 3)
+            tri_polys = np.empty(count, dtype=np.int32)
+            mesh.loop_triangles.foreach_get("polygon_index", tri_polys)
+
+            matrix = np.array(obj.matrix_world, dtype=np.float64)
+            self.coords = read_coords(mesh).astype(np.float64) @ matrix[:3, :3].T + matrix[:3, 3]
+
+            normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+            if hasattr(mesh, "corner_normals"):
+                mesh.corner_normals.foreach_get("vector", normals)
+            else:
+                mesh.calc_normals_split()
+                mesh.loops.foreach_get("normal", normals)
+            normal_matrix = np.linalg.inv(matrix[:3, :3]).T
+            self.corner_normals = _normalize(normals.reshape(-1, 3).astype(np.float64) @ normal_matrix.T)
+
+            layer = mesh.uv_layers.get(uv_name) if uv_name else mesh.uv_layers.active
+            self.corner_uvs = None
+            if layer is not None:
+                uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+                layer.data.foreach_get("uv", uvs)
+                self.corner_uvs = uvs.reshape(-1, 2).astype(np.float64)
+
+            materials = np.empty(len(mesh.polygons), dtype=np.int32)
+            mesh.polygons.foreach_get("material_index", materials)
+            self.tri_materials = materials[tri_polys]
+        finally:
+            eval_obj.to_mesh_clear()
+        self.materials = [slot.material for slot in obj.material_slots]
+
+    def barycentric(self, tris, points):
+        a, b, c = (self.coords[self.tri_verts[tris, i]] for i in range(3))
+        return _barycentric(a, b, c, points)
+
+    def interpolate(self, corner_values, tris, bary):
+        values = corner_values[self.tri_loops[tris]]
+        return np.einsum('ij,ijk->ik', bary, values)
+
+def _normalize(vectors):
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+def _barycentric(a, b, c, p):
+    v0, v1, v2 = b - a, c - a, p - a
+    d00 = np.einsum('ij,ij->i', v0, v0)
+    d01 = np.einsum('ij,ij->i', v0, v1)
+    d11 = np.einsum('ij,ij->i', v1, v1)
+    d20 = np.einsum('ij,ij->i', v2, v0)
+    d21 = np.einsum('ij,ij->i', v2, v1)
+    denom = d00 * d11 - d01 * d01
+    denom = np.where(np.abs(denom) < 1e-30, 1e-30, denom)
+    v = (d11 * d20 - d01 * d21) / denom
+    w = (d00 * d21 - d01 * d20) / denom
+    return np.column_stack((1.0 - v - w, v, w))
+
+# ------------------------------
+# Base colour lookup
+# ------------------------------
+def linear_to_srgb(color):
+    color = np.clip(color, 0.0, 1.0)
+    return np.where(color <= 0.0031308, color * 12.92, 1.055 * np.power(color, 1.0 / 2.4) - 0.055)
+
+class BaseColorSource:
+    """Base Color of a material: an image texture sampled by UV, or the socket's constant colour"""
+
+    def __init__(self, material):
+        self.pixels = None
+        self.constant = linear_to_srgb(np.array(DEFAULT_BASE_COLOR))
+        principled = None
+        if material and material.use_nodes:
+            principled = next((n for n in material.node_tree.nodes if n.type == 'BSDF_PRINCIPLED'), None)
+        if principled is None:
+            return
+        socket = principled.inputs['Base Color']
+        if socket.is_linked and socket.links[0].from_node.type == 'TEX_IMAGE' and socket.links[0].from_node.image:
+            image = socket.links[0].from_node.image
+            width, height = image.size
+            if width and height:
+                pixels = np.empty(width * height * image.channels, dtype=np.float32)
+                image.pixels.foreach_get(pixels)
+                self.pixels = pixels.reshape(height, width, image.channels)[:, :, :3]
+        else:
+            self.constant = linear_to_srgb(np.array(socket.default_value[:3]))
+
+    def sample(self, uvs):
+        if self.pixels is None:
+            return np.broadcast_to(self.constant, (len(uvs), 3))
+        # Bilinear lookup with repeat wrapping, like the default Image Texture node
+        height, width = self.pixels.shape[:2]
+        x = uvs[:, 0] * width - 0.5
+        y = uvs[:, 1] * height - 0.5
+        x0, y0 = np.floor(x).astype(np.int64), np.floor(y).astype(np.int64)
+        fx, fy = (x - x0)[:, None], (y - y0)[:, None]
+        x0, x1 = x0 % width, (x0 + 1) % width
+        y0, y1 = y0 % height, (y0 + 1) % height
+        top = self.pixels[y0, x0] * (1 - fx) + self.pixels[y0, x1] * fx
+        bottom = self.pixels[y1, x0] * (1 - fx) + self.pixels[y1, x1] * fx
+        return top * (1 - fy) + bottom * fy
+
+# ------------------------------
+# Baker
+# ------------------------------
+class NativeBaker:
+    """
+    Selected-to-active transfer baker for base colour and tangent space normal maps.
+
+    Texels of the target's BakeUV layer are rasterized per tile, a ray is cast
+    from every texel (pushed out along the target normal by `extrusion`) back
+    onto a BVH of the source, and the hit is shaded from the source's corner
+    normals and Base Color. Rasterizing and shading are vectorized per tile.
+    The ray casts are one BVHTree call per texel and hold the GIL, so large
+    bakes split them over up to `workers` background Blender processes
+    (bake_worker.py) that each rebuild the BVH from the source triangles.
+    """
+
+    def __init__(self, source, target, size=2048, margin=2, extrusion=None, workers=1, blender=None):
+        self.source_obj = source
+        self.target_obj = target
+        self.size = size
+        self.margin = margin
+        self.extrusion = extrusion
+        self.workers = workers
+        self.blender = blender
+        self.timings = {}
+
+    def bake(self):
+        """Bake both maps, returns (base_color, normal) as (size, size, 4) float32 arrays"""
+        start = time.perf_counter()
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        self.source = TriangleMesh(self.source_obj, depsgraph)
+        self.target = TriangleMesh(self.target_obj, depsgraph, BAKE_UV_NAME)
+        if self.target.corner_uvs is None:
+            raise ValueError(f"{self.target_obj.name} has no {BAKE_UV_NAME} layer")
+        self.colors = [BaseColorSource(material) for material in self.source.materials] or [BaseColorSource(None)]
+        if self.extrusion is None:
+            extent = self.source.coords.max(axis=0) - self.source.coords.min(axis=0)
+            self.extrusion = float(np.linalg.norm(extent)) * 0.02
+        self._prepare_target()
+        self.timings["setup"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tiles = [(x, y) for y in range(0, self.size, TILE_SIZE) for x in range(0, self.size, TILE_SIZE)]
+        rasters = [raster for raster in map(self._rasterize_tile, tiles) if raster is not None]
+        self.timings["raster"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rays = [self._rays(raster) for raster in rasters] or [(np.empty((0, 3)),) * 3]
+        origins, directions, fallback = (np.concatenate(parts) for parts in zip(*rays))
+        del rays
+        hit_points, hit_tris = self._cast(origins, directions, fallback, self.extrusion * 2.0)
+        del origins, directions, fallback
+        self.timings["rays"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.base_color = np.zeros((self.size, self.size, 4), dtype=np.float32)
+        self.normal = np.zeros((self.size, self.size, 4), dtype=np.float32)
+        self.mask = np.zeros((self.size, self.size), dtype=bool)
+        offset = 0
+        for raster in rasters:
+            count = len(raster[0])
+            self._shade(raster, hit_points[offset:offset + count], hit_tris[offset:offset + count])
+            offset += count
+        self.timings["shade"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for pixels in (self.base_color, self.normal):
+            pixels[:, :, 3] = 1.0
+            _dilate(pixels, self.mask, self.margin)
+        self.timings["margin"] = time.perf_counter() - start
+        return self.base_color, self.normal
+
+    def _prepare_target(self):
+        target = self.target
+        uv = target.corner_uvs[target.tri_loops]
+        self.tri_pixels = uv * self.size - 0.5
+        self.tri_min = np.floor(self.tri_pixels.min(axis=1)).astype(np.int64)
+        self.tri_max = np.ceil(self.tri_pixels.max(axis=1)).astype(np.int64)
+
+        # Per triangle tangent and bitangent from positions and BakeUV
+        p = target.coords[target.tri_verts]
+        e1, e2 = p[:, 1] - p[:, 0], p[:, 2] - p[:, 0]
+        d1, d2 = uv[:, 1] - uv[:, 0], uv[:, 2] - uv[:, 0]
+        det = d1[:, 0] * d2[:, 1] - d2[:, 0] * d1[:, 1]
+        inv = np.where(np.abs(det) < 1e-20, 0.0, 1.0 / np.where(det == 0, 1.0, det))[:, None]
+        self.tri_tangent = (e1 * d2[:, 1:2] - e2 * d1[:, 1:2]) * inv
+        self.tri_bitangent = (e2 * d1[:, 0:1] - e1 * d2[:, 0:1]) * inv
+
+    def _rasterize(self, x0, y0, x1, y1):
+        """Texels of the tile covered by target triangles: (x, y, triangle, barycentric)"""
+        overlap = np.flatnonzero(
+            (self.tri_max[:, 0] >= x0) & (self.tri_min[:, 0] < x1) &
+            (self.tri_max[:, 1] >= y0) & (self.tri_min[:, 1] < y1)
+        )
+        lo = np.maximum(self.tri_min[overlap], (x0, y0))
+        hi = np.minimum(self.tri_max[overlap], (x1 - 1, y1 - 1))
+        spans = np.maximum(hi - lo + 1, 0)
+        counts = spans[:, 0] * spans[:, 1]
+        total = int(counts.sum())
+        if total == 0:
+            return None
+
+        tris = np.repeat(overlap, counts)
+        local = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        width = np.repeat(np.maximum(spans[:, 0], 1), counts)
+        x = np.repeat(lo[:, 0], counts) + local % width
+        y = np.repeat(lo[:, 1], counts) + local // width
+
+        corners = self.tri_pixels[tris]
+        texel = np.column_stack((x, y)).astype(np.float64)
+        v0, v1, v2 = corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0], texel - corners[:, 0]
+        denom = v0[:, 0] * v1[:, 1] - v1[:, 0] * v0[:, 1]
+        denom = np.where(np.abs(denom) < 1e-20, 1e-20, denom)
+        v = (v2[:, 0] * v1[:, 1] - v1[:, 0] * v2[:, 1]) / denom
+        w = (v0[:, 0] * v2[:, 1] - v2[:, 0] * v0[:, 1]) / denom
+        bary = np.column_stack((1.0 - v - w, v, w))
+        inside = (bary >= -1e-6).all(axis=1)
+        x, y, tris, bary = x[inside], y[inside], tris[inside], bary[inside]
+
+        # Overlapping UV islands: the highest triangle index wins
+        texel_ids = y * self.size + x
+        order = np.lexsort((tris, texel_ids))
+        last = np.append(texel_ids[order][1:] != texel_ids[order][:-1], True)
+        keep = order[last]
+        return x[keep], y[keep], tris[keep], bary[keep]
+
+    def _rasterize_tile(self, tile):
+        x0, y0 = tile
+        return self._rasterize(x0, y0, min(x0 + TILE_SIZE, self.size), min(y0 + TILE_SIZE, self.size))
+
+    def _surface(self, raster):
+        """Target surface points and interpolated normals of rasterized texels"""
+        _, _, tris, bary = raster
+        target = self.target
+        points = np.einsum('ij,ijk->ik', bary, target.coords[target.tri_verts[tris]])
+        normals = _normalize(target.interpolate(target.corner_normals, tris, bary))
+        return points, normals
+
+    def _rays(self, raster):
+        """(origins, directions, fallback points) of the rays cast from rasterized texels"""
+        points, normals = self._surface(raster)
+        return points + normals * self.extrusion, -normals, points
+
+    def _cast(self, origins, directions, fallback, reach):
+        """
+        (hit points, hit triangles) of all rays. Large bakes are split over
+        background Blender processes, small ones are cast in this process.
+        """
+        workers = min(self.workers, len(origins) // MIN_WORKER_RAYS)
+        if workers <= 1:
+            bvh = bake_worker.build_bvh(self.source.coords, self.source.tri_verts)
+            return bake_worker.cast_rays(bvh, origins, directions, fallback, reach)
+
+        blender = self.blender or bpy.app.binary_path
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bake_worker.py")
+        bounds = np.linspace(0, len(origins), workers + 1).astype(np.int64)
+        with tempfile.TemporaryDirectory(prefix="meshtools_bake_") as workdir:
+            mesh_path = os.path.join(workdir, "mesh.npz")
+            np.savez(mesh_path, coords=self.source.coords, tri_verts=self.source.tri_verts)
+
+            def run(index):
+                chunk = slice(bounds[index], bounds[index + 1])
+                rays_path = os.path.join(workdir, f"rays_{index}.npz")
+                hits_path = os.path.join(workdir, f"hits_{index}.npz")
+                np.savez(rays_path, origins=origins[chunk], directions=directions[chunk], fallback=fallback[chunk], reach=reach)
+                command = [
+                    blender, "--background", "--factory-startup", "--python-exit-code", "1",
+                    "--python", script, "--", mesh_path, rays_path, hits_path,
+                ]
+                process = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+                try:
+                    with np.load(hits_path) as hits:
+                        return hits["points"], hits["tris"]
+                except OSError:
+                    error = (process.stderr or "").strip().splitlines()[-1:] or [f"exit code {process.returncode}"]
+                    raise RuntimeError(f"Bake worker failed: {error[0]}") from None
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                chunks = list(pool.map(run, range(workers)))
+        return np.concatenate([points for points, _ in chunks]), np.concatenate([tris for _, tris in chunks])
+
+    def _shade(self, raster, hit_points, hit_tris):
+        x, y, tris, _ = raster
+        _, normals = self._surface(raster)
+        hit = hit_tris >= 0
+        x, y, tris, normals, hit_points, hit_tris = x[hit], y[hit], tris[hit], normals[hit], hit_points[hit], hit_tris[hit]
+        if len(x) == 0:
+            return
+        source = self.source
+        source_bary = source.barycentric(hit_tris, hit_points)
+        source_normals = _normalize(source.interpolate(source.corner_normals, hit_tris, source_bary))
+
+        # Tangent space normal map (OpenGL convention, as Blender's Normal Map node expects)
+        tangent = self.tri_tangent[tris]
+        tangent = _normalize(tangent - normals * np.einsum('ij,ij->i', normals, tangent)[:, None])
+        sign = np.sign(np.einsum('ij,ij->i', np.cross(normals, tangent), self.tri_bitangent[tris]))
+        bitangent = np.cross(normals, tangent) * np.where(sign == 0, 1.0, sign)[:, None]
+        local = np.column_stack((
+            np.einsum('ij,ij->i', source_normals, tangent),
+            np.einsum('ij,ij->i', source_normals, bitangent),
+            np.einsum('ij,ij->i', source_normals, normals),
+        ))
+        self.normal[y, x, :3] = local * 0.5 + 0.5
+
+        # Base colour from the hit material's texture or constant colour
+        uvs = source.interpolate(source.corner_uvs, hit_tris, source_bary) if source.corner_uvs is not None else None
+        materials = np.clip(source.tri_materials[hit_tris], 0, len(self.colors) - 1)
+        colors = np.empty((len(x), 3))
+        for index in np.unique(materials):
+            selected = materials == index
+            if uvs is None:
+                colors[selected] = self.colors[index].constant
+            else:
+                colors[selected] = self.colors[index].sample(uvs[selected])
+        self.base_color[y, x, :3] = colors
+        self.mask[y, x] = True
+
+def _shift(array, dy, dx):
+    """`array` moved by (dy, dx) pixels, the border is repeated instead of wrapping around"""
+    height, width = array.shape[:2]
+    padded = np.pad(array, ((1, 1), (1, 1)) + ((0, 0),) * (array.ndim - 2), mode="edge")
+    return padded[1 - dy:1 - dy + height, 1 - dx:1 - dx + width]
+
+def _dilate(pixels, mask, margin):
+    """Grow baked texels outwards by `margin` pixels so filtering doesn't bleed background in"""
+    mask = mask.copy()
+    for _ in range(margin):
+        grown = mask.copy()
+        for dy, dx in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+            fill = _shift(mask, dy, dx) & ~grown
+            pixels[fill] = _shift(pixels, dy, dx)[fill]
+            grown |= fill
+        mask = grown
+
+# ------------------------------
+# Images and material
+# ------------------------------
+def _store_image(name, pixels, non_color, directory):
+    image = bpy.data.images.get(name)
+    if image is None or tuple(image.size) != (pixels.shape[1], pixels.shape[0]):
+        if image is not None:
+            bpy.data.images.remove(image)
+        image = bpy.data.images.new(name, pixels.shape[1], pixels.shape[0], alpha=False)
+    if non_color:
+        image.colorspace_settings.name = 'Non-Color'
+    image.pixels.foreach_set(pixels.ravel())
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        image.filepath_raw = os.path.join(directory, name + ".png")
+        image.file_format = 'PNG'
+        image.save()
+    image.update()
+    return image
+
+def bake_output_dir():
+    """Where baked maps are saved: next to the .blend when it is saved, the temp dir otherwise"""
+    if bpy.data.filepath:
+        return bpy.path.abspath("//textures")
+    return os.path.join(bpy.app.tempdir, "meshtools_textures")
+
+def bake_maps(source, target, size=2048, margin=2, workers=None):
+    """
+    Bake base colour and normal from `source` onto `target` with up to
+    `workers` ray cast processes (all cores by default), returns
+    (color image, normal image, timings).
+    """
+    baker = NativeBaker(source, target, size=size, margin=margin, workers=workers or os.cpu_count() or 1)
+    base_color, normal = baker.bake()
+
+    start = time.perf_counter()
+    directory = bake_output_dir()
+    color_image = _store_image(f"{target.name}_BaseColor", base_color, False, directory)
+    normal_image = _store_image(f"{target.name}_Normal", normal, True, directory)
+    baker.timings["images"] = time.perf_counter() - start
+    return color_image, normal_image, baker.timings
+
+def create_baked_material(target, color_image, normal_image):
+    """Replace the materials of `target` with one using the baked maps on BakeUV"""
+    material = bpy.data.materials.get(f"{target.name}_Baked") or bpy.data.materials.new(f"{target.name}_Baked")
+    material.use_nodes = True
+    nodes = material.node_tree.nodes
+    links = material.node_tree.links
+    nodes.clear()
+    output = nodes.new('ShaderNodeOutputMaterial')
+    principled = nodes.new('ShaderNodeBsdfPrincipled')
+    uv_map = nodes.new('ShaderNodeUVMap')
+    uv_map.uv_map = BAKE_UV_NAME
+    color_node = nodes.new('ShaderNodeTexImage')
+    color_node.image = color_image
+    normal_node = nodes.new('ShaderNodeTexImage')
+    normal_node.image = normal_image
+    normal_map = nodes.new('ShaderNodeNormalMap')
+    normal_map.uv_map = BAKE_UV_NAME
+    links.new(uv_map.outputs['UV'], color_node.inputs['Vector'])
+    links.new(uv_map.outputs['UV'], normal_node.inputs['Vector'])
+    links.new(color_node.outputs['Color'], principled.inputs['Base Color'])
+    links.new(normal_node.outputs['Color'], normal_map.inputs['Color'])
+    links.new(normal_map.outputs['Normal'], principled.inputs['Normal'])
+    links.new(principled.outputs['BSDF'], output.inputs['Surface'])
+
+    target.data.materials.clear()
+    target.data.materials.append(material)
+    return material
@@ -0,0 +1,53 @@
+"""
+Ray cast worker of the built-in baker (bake_native).
+
+BVHTree ray casts hold the GIL, so large bakes split their rays over
+background Blender processes:
+
+    blender --background --factory-startup --python bake_worker.py -- MESH.npz RAYS.npz HITS.npz
+
+Every process rebuilds the source BVH from the `coords` and `tri_verts`
+arrays in MESH.npz, casts the rays in RAYS.npz and writes the hit
+locations and triangles (-1 for misses) to HITS.npz.
+"""
+import os
+import sys
+
+import numpy as np
+from mathutils import Vector
+from mathutils.bvhtree import BVHTree
+
+def build_bvh(coords, tri_verts):
+    return BVHTree.FromPolygons(coords.tolist(), tri_verts.tolist())
+
+def cast_rays(bvh, origins, directions, fallback, reach):
+    """
+    Cast every ray within `reach`, texels without a hit take the nearest
+    source point to their `fallback` position. Returns (hit points, hit
+    triangles) with -1 where nothing is in reach.
+    """
+    origins, directions, fallback = origins.tolist(), directions.tolist(), fallback.tolist()
+    hit_points = np.zeros((len(origins), 3))
+    hit_tris = np.full(len(origins), -1, dtype=np.int64)
+    for i in range(len(origins)):
+        location, _, index, _ = bvh.ray_cast(Vector(origins[i]), Vector(directions[i]), reach)
+        if index is None:
+            location, _, index, _ = bvh.find_nearest(Vector(fallback[i]), reach)
+        if index is not None:
+            hit_points[i] = location
+            hit_tris[i] = index
+    return hit_points, hit_tris
+
+def main(argv):
+    mesh_path, rays_path, hits_path = argv
+    with np.load(mesh_path) as mesh:
+        bvh = build_bvh(mesh["coords"], mesh["tri_verts"])
+    with np.load(rays_path) as rays:
+        hit_points, hit_tris = cast_rays(bvh, rays["origins"], rays["directions"], rays["fallback"], float(rays["reach"]))
+    # Written under a temporary name so a crashed worker never leaves a partial result
+    tmp_path = hits_path + ".tmp.npz"
+    np.savez(tmp_path, points=hit_points, tris=hit_tris)
+    os.replace(tmp_path, hits_path)
+
+if __name__ == "__main__":
+    main(sys.argv[sys.argv.index("--") + 1:])
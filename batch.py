@@ -0,0 +1,361 @@
+"""
+Headless batch pipeline for MeshTools.
+
+Runs import -> tris to quads -> merge by distance -> QuadriFlow remesh
+(-> optional bake) -> FBX export for many models, one file per
+`blender --background` worker process:
+
+    python batch.py MODELS_DIR_OR_MANIFEST --out OUT_DIR --workers 8 --blender /path/to/blender
+
+A manifest is either a JSON list (paths, or objects with a "path" plus
+per-job option overrides) or a text file with one path per line. Every job
+writes a result JSON, and a summary report is written to OUT_DIR/summary.json.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_EXTENSIONS = (".glb", ".gltf", ".obj", ".fbx")
+
+DEFAULT_OPTIONS = {
+    "tris_to_quads": True,
+    "merge": True,
+    "merge_distance": 0.0001,
+    "target_faces": 10000,
+    "remesh_memory_mb": 8192,
+    "bake": False,
+    "bake_backend": "BAKELAB",
+    # Batch workers already use the cores, so the built-in baker casts its rays in-process by default
+    "bake_workers": 1,
+}
+BAKE_BACKENDS = ("BAKELAB", "NATIVE")
+
+def normalize_options(overrides):
+    """DEFAULT_OPTIONS updated with checked overrides, raises ValueError for unknown keys or bad values"""
+    if not isinstance(overrides, dict):
+        raise ValueError("options must be a JSON object")
+    options = dict(DEFAULT_OPTIONS)
+    for key, value in overrides.items():
+        if key == "bakelab_module":
+            if not isinstance(value, str) or not value:
+                raise ValueError("bakelab_module must be a module name")
+            options[key] = value
+            continue
+        if key not in DEFAULT_OPTIONS:
+            raise ValueError(f"Unknown option {key!r}")
+        default = DEFAULT_OPTIONS[key]
+        if isinstance(default, bool):
+            if not isinstance(value, bool):
+                raise ValueError(f"{key} must be true or false")
+        elif isinstance(default, (int, float)):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"{key} must be a number")
+            if isinstance(default, int) and value != int(value):
+                raise ValueError(f"{key} must be a whole number")
+            value = type(default)(value)
+            if value < 0:
+                raise ValueError(f"{key} must not be negative")
+        else:
+            if not isinstance(value, str) or value.upper() not in BAKE_BACKENDS:
+                raise ValueError(f"{key} must be one of {', '.join(BAKE_BACKENDS)}")
+            value = value.upper()
+        options[key] = value
+    return options
+
+# ------------------------------
+# Job collection
+# ------------------------------
+def collect_jobs(source, options):
+    """Expand a model directory or manifest into a list of {"path", "options"} jobs"""
+    if os.path.isdir(source):
+        entries = sorted(
+            os.path.join(source, name) for name in os.listdir(source)
+            if name.lower().endswith(MODEL_EXTENSIONS)
+        )
+    elif source.lower().endswith(".json"):
+        with open(source, encoding="utf-8") as f:
+            entries = json.load(f)
+    else:
+        with open(source, encoding="utf-8") as f:
+            entries = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+    base_dir = os.path.dirname(os.path.abspath(source)) if os.path.isfile(source) else ""
+    jobs = []
+    names = set()
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"path": entry}
+        job_options = dict(options)
+        job_options.update({k: v for k, v in entry.items() if k != "path"})
+        # Output names must stay unique when models only differ by extension or folder
+        name = stem = os.path.splitext(os.path.basename(entry["path"]))[0]
+        suffix = 1
+        while name in names:
+            suffix += 1
+            name = f"{stem}_{suffix}"
+        names.add(name)
+        jobs.append({"path": os.path.join(base_dir, entry["path"]), "name": name, "options": job_options})
+    return jobs
+
+# ------------------------------
+# Coordinator
+# ------------------------------
+def run_job(job, out_dir, blender, timeout, extra_args=()):
+    """Run one job in a fresh background Blender, returns its result dict"""
+    result_path = os.path.join(out_dir, "results", job["name"] + ".json")
+    log_path = os.path.join(out_dir, "logs", job["name"] + ".log")
+    command = [
+        blender, "--background", "--factory-startup", *extra_args,
+        "--python", os.path.abspath(__file__), "--",
+        "--worker", job["path"],
+        "--out", os.path.join(out_dir, job["name"] + ".fbx"),
+        "--result", result_path,
+        "--options", json.dumps(job["options"]),
+    ]
+    start = time.perf_counter()
+    try:
+        with open(log_path, "w", encoding="utf-8") as log_file:
+            process = subprocess.run(command, stdout=log_file, stderr=subprocess.STDOUT, timeout=timeout)
+        returncode = process.returncode
+        error = None
+    except subprocess.TimeoutExpired:
+        returncode = None
+        error = f"Timed out after {timeout}s"
+    except OSError as e:
+        returncode = None
+        error = f"Could not start Blender: {e}"
+
+    result = {"input": job["path"], "status": "failed", "error": error}
+    if os.path.exists(result_path):
+        with open(result_path, encoding="utf-8") as f:
+            result = json.load(f)
+    elif error is None:
+        result["error"] = f"Worker exited with code {returncode} without a result, see {log_path}"
+    result["wall_seconds"] = round(time.perf_counter() - start, 3)
+    result["log"] = log_path
+    return result
+
+def run_batch(jobs, out_dir, blender, workers, timeout=None, extra_args=()):
+    """Run all jobs on a pool of `workers` Blender processes, returns the summary dict"""
+    os.makedirs(os.path.join(out_dir, "results"), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, "logs"), exist_ok=True)
+
+    start = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(run_job, job, out_dir, blender, timeout, extra_args) for job in jobs]
+        for done, future in enumerate(futures, 1):
+            result = future.result()
+            results.append(result)
+            print(f"[{done}/{len(jobs)}] {result['status']:>6}  {result['wall_seconds']:8.1f}s  {result['input']}", flush=True)
+
+    failed = [r for r in results if r["status"] != "ok"]
+    summary = {
+        "jobs": len(results),
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "workers": workers,
+        "wall_seconds": round(time.perf_counter() - start, 3),
+        "results": results,
+    }
+    with open(os.path.join(out_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+# ------------------------------
+# Worker (runs inside Blender)
+# ------------------------------
+def load_addon():
+    """Import and register the add-on from this checkout inside the worker"""
+    spec = importlib.util.spec_from_file_location(
+        "meshtools", os.path.join(ADDON_DIR, "__init__.py"), submodule_search_locations=[ADDON_DIR]
+    )
+    addon = importlib.util.module_from_spec(spec)
+    sys.modules["meshtools"] = addon
+    spec.loader.exec_module(addon)
+    addon.register()
+    return addon
+
+def process_model(operators, path, output, options):
+    """Run the MeshTools chain on one model file in the current Blender session"""
+    import bpy
+
+    scene = bpy.context.scene
+    scene.merge_distance = options["merge_distance"]
+    scene.target_faces = options["target_faces"]
+    scene.meshtools_remesh_memory_budget = options["remesh_memory_mb"]
+    stages = {}
+
+    def stage(name, fn):
+        start = time.perf_counter()
+        value = fn()
+        stages[name] = round(time.perf_counter() - start, 3)
+        return value
+
+    if not stage("import", lambda: operators.import_model_file(path)):
+        raise RuntimeError(f"Import failed for {path}")
+
+    meshes = [obj for obj in scene.objects if obj.type == 'MESH']
+    if not meshes:
+        raise RuntimeError("Model contains no meshes")
+    bpy.ops.object.select_all(action='DESELECT')
+    for obj in meshes:
+        obj.select_set(True)
+    bpy.context.view_layer.objects.active = meshes[0]
+    if len(meshes) > 1:
+        stage("join", bpy.ops.object.join)
+    source = bpy.context.view_layer.objects.active
+    faces_in = len(source.data.polygons)
+
+    if options["tris_to_quads"]:
+        stage("tris_to_quads", bpy.ops.wm.meshtools_tris_to_quads)
+    if options["merge"]:
+        stage("merge", bpy.ops.wm.meshtools_merge_vertices)
+
+    remeshed = stage("remesh", lambda: operators.quadriflow_remesh_duplicate(bpy.context, source))
+
+    if options["bake"]:
+        bpy.ops.object.select_all(action='DESELECT')
+        source.select_set(True)
+        remeshed.select_set(True)
+        bpy.context.view_layer.objects.active = remeshed
+        scene.meshtools_bake_backend = options["bake_backend"]
+        scene.meshtools_bake_workers = options["bake_workers"]
+        job = operators.bake_selected_to_active(bpy.context, source, remeshed)
+        if job.state != 'DONE':
+            raise RuntimeError(job.error)
+        stages.update({name: round(seconds, 3) for name, seconds in job.timings.items()})
+
+    scene.meshtools_export_fbx_path = output
+    bpy.ops.object.select_all(action='DESELECT')
+    remeshed.select_set(True)
+    bpy.context.view_layer.objects.active = remeshed
+    stage("export", bpy.ops.wm.meshtools_quick_export_fbx)
+
+    return {
+        "output": output,
+        "faces_in": faces_in,
+        "faces_out": len(remeshed.data.polygons),
+        "stages": stages,
+    }
+
+def worker_main(args):
+    options = dict(DEFAULT_OPTIONS)
+    options.update(json.loads(args.options))
+    start = time.perf_counter()
+    result = {"input": args.worker, "status": "failed", "error": None}
+    try:
+        import bpy
+        # Start from an empty scene so only the imported model is processed
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        if options["bake"] and options["bake_backend"] == 'BAKELAB':
+            import addon_utils
+            addon_utils.enable(options.get("bakelab_module", "BakeLab2"), default_set=False)
+        addon = load_addon()
+        result.update(process_model(addon.operators, args.worker, args.out, options))
+        result["status"] = "ok"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - start, 3)
+
+    os.makedirs(os.path.dirname(args.result), exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(args.result), delete=False, suffix=".tmp") as f:
+        json.dump(result, f, indent=2)
+    os.replace(f.name, args.result)
+
+def export_worker_main(args):
+    """Export the named objects of the opened .blend, one FBX each (used by the parallel incremental export)"""
+    names = json.loads(args.export_objects)
+    result = {"exported": [], "failed": {}}
+    try:
+        import bpy
+        addon = load_addon()
+        for name in names:
+            obj = bpy.data.objects.get(name)
+            if obj is None:
+                result["failed"][name] = "Object not found in the saved file"
+                continue
+            try:
+                addon.export_manifest.export_object(obj, os.path.join(args.out, addon.export_manifest.export_filename(obj)))
+                result["exported"].append(name)
+            except Exception as e:
+                result["failed"][name] = f"{type(e).__name__}: {e}"
+    except Exception as e:
+        result["failed"].update({name: f"{type(e).__name__}: {e}" for name in names if name not in result["exported"]})
+
+    with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(args.result), delete=False, suffix=".tmp") as f:
+        json.dump(result, f, indent=2)
+    os.replace(f.name, args.result)
+
+# ------------------------------
+# Command line
+# ------------------------------
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Run the MeshTools pipeline on many models with background Blender workers.")
+    parser.add_argument("source", nargs="?", help="Directory of models or manifest file")
+    parser.add_argument("--out", required=True, help="Output directory for FBX files and reports (FBX path for --worker)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of Blender processes")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable")
+    parser.add_argument("--timeout", type=float, default=None, help="Per job timeout in seconds")
+    parser.add_argument("--target-faces", type=int, default=DEFAULT_OPTIONS["target_faces"])
+    parser.add_argument("--remesh-memory-mb", type=int, default=DEFAULT_OPTIONS["remesh_memory_mb"],
+                        help="Per worker QuadriFlow memory budget, larger scans are remeshed from a decimated proxy (0 disables)")
+    parser.add_argument("--merge-distance", type=float, default=DEFAULT_OPTIONS["merge_distance"])
+    parser.add_argument("--no-quads", action="store_true", help="Skip tris to quads")
+    parser.add_argument("--no-merge", action="store_true", help="Skip merge by distance")
+    parser.add_argument("--bake", action="store_true", help="Bake base color and normal maps before export")
+    parser.add_argument("--bake-backend", choices=("bakelab", "native"), default="bakelab",
+                        help="BakeLab2 add-on or the built-in CPU baker")
+    parser.add_argument("--bake-workers", type=int, default=DEFAULT_OPTIONS["bake_workers"],
+                        help="Ray cast processes per built-in bake, 0 uses all cores")
+    # Internal: run a single job inside Blender
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    parser.add_argument("--options", default="{}", help=argparse.SUPPRESS)
+    parser.add_argument("--export-objects", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def main(argv):
+    args = parse_args(argv)
+    if args.worker:
+        worker_main(args)
+        return 0
+    if args.export_objects:
+        export_worker_main(args)
+        return 0
+    if not args.source:
+        print("No model directory or manifest given")
+        return 2
+
+    options = dict(DEFAULT_OPTIONS)
+    options.update({
+        "tris_to_quads": not args.no_quads,
+        "merge": not args.no_merge,
+        "merge_distance": args.merge_distance,
+        "target_faces": args.target_faces,
+        "remesh_memory_mb": args.remesh_memory_mb,
+        "bake": args.bake,
+        "bake_backend": args.bake_backend.upper(),
+        "bake_workers": args.bake_workers,
+    })
+    jobs = collect_jobs(args.source, options)
+    if not jobs:
+        print(f"No models found in {args.source}")
+        return 2
+
+    out_dir = os.path.abspath(args.out)
+    summary = run_batch(jobs, out_dir, args.blender, args.workers, args.timeout)
+    print(f"{summary['succeeded']}/{summary['jobs']} succeeded in {summary['wall_seconds']:.1f}s "
+          f"with {args.workers} workers, report: {os.path.join(out_dir, 'summary.json')}")
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    sys.exit(main(argv))
@@ -0,0 +1,48 @@
+"""Shared helpers for the MeshTools benchmarks"""
+import importlib
+import importlib.util
+import os
+import sys
+import types
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "meshtools"
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+def script_args():
+    """Arguments after `--` when running inside Blender, sys.argv otherwise"""
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    return [] if bpy else sys.argv[1:]
+
+def import_addon_module(name):
+    """Import one add-on module without running the add-on's __init__ (no bpy needed)"""
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [ADDON_DIR]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{name}")
+
+def import_addon():
+    """Import the whole add-on from this checkout without registering it, returns the package"""
+    if PACKAGE in sys.modules and hasattr(sys.modules[PACKAGE], "register"):
+        return sys.modules[PACKAGE]
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE, os.path.join(ADDON_DIR, "__init__.py"), submodule_search_locations=[ADDON_DIR]
+    )
+    addon = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE] = addon
+    spec.loader.exec_module(addon)
+    return addon
+
+def load_addon():
+    """Import and register the whole add-on from this checkout, returns the package"""
+    if PACKAGE in sys.modules and hasattr(sys.modules[PACKAGE], "register"):
+        return sys.modules[PACKAGE]
+    addon = import_addon()
+    addon.register()
+    return addon
@@ -0,0 +1,105 @@
+"""
+GLB import benchmark.
+
+    python benchmarks/bench_glb_import.py [face counts...]
+    blender --background --factory-startup --python benchmarks/bench_glb_import.py -- [face counts...]
+
+Writes synthetic GLB files (a triangulated noisy grid with UVs). Plain
+Python times how long the fast path needs to map the file and read the
+position/index/UV accessors. Inside Blender it also times the complete fast
+import against the stock glTF importer.
+"""
+import json
+import os
+import struct
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _harness import bpy, script_args, import_addon_module
+
+def grid_mesh(faces, seed=0):
+    """Triangulated noisy grid with about `faces` triangles: (coords, indices, uvs)"""
+    side = max(int(np.sqrt(faces / 2)), 1)
+    u, v = np.meshgrid(np.linspace(0.0, 1.0, side + 1), np.linspace(0.0, 1.0, side + 1))
+    noise = np.random.default_rng(seed).normal(0.0, 0.002, u.shape)
+    coords = np.column_stack((u.ravel(), (0.05 * np.sin(u * 12.0) + noise).ravel(), v.ravel())).astype(np.float32)
+    first = (np.arange(side)[:, None] * (side + 1) + np.arange(side)).ravel()
+    quads = np.column_stack((first, first + side + 1, first + side + 2, first + 1))
+    indices = np.concatenate((quads[:, [0, 1, 2]], quads[:, [0, 2, 3]])).astype(np.uint32)
+    uvs = np.column_stack((u.ravel(), 1.0 - v.ravel())).astype(np.float32)
+    return coords, indices, uvs
+
+def write_glb(path, coords, indices, uvs):
+    """Minimal single mesh GLB with POSITION, TEXCOORD_0 and uint32 indices"""
+    blobs = [coords.tobytes(), uvs.tobytes(), indices.tobytes()]
+    views, offset = [], 0
+    for blob in blobs:
+        views.append({"buffer": 0, "byteOffset": offset, "byteLength": len(blob)})
+        offset += (len(blob) + 3) & ~3
+    binary = b"".join(blob.ljust((len(blob) + 3) & ~3, b"\0") for blob in blobs)
+    gltf = {
+        "asset": {"version": "2.0"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"mesh": 0, "name": "BenchGrid"}],
+        "meshes": [{"name": "BenchGrid", "primitives": [{"attributes": {"POSITION": 0, "TEXCOORD_0": 1}, "indices": 2}]}],
+        "accessors": [
+            {"bufferView": 0, "componentType": 5126, "count": len(coords), "type": "VEC3",
+             "min": coords.min(axis=0).tolist(), "max": coords.max(axis=0).tolist()},
+            {"bufferView": 1, "componentType": 5126, "count": len(uvs), "type": "VEC2"},
+            {"bufferView": 2, "componentType": 5125, "count": indices.size, "type": "SCALAR"},
+        ],
+        "bufferViews": views,
+        "buffers": [{"byteLength": len(binary)}],
+    }
+    text = json.dumps(gltf).encode("utf-8")
+    text = text.ljust((len(text) + 3) & ~3, b" ")
+    with open(path, "wb") as f:
+        f.write(struct.pack("<4sII", b"glTF", 2, 12 + 8 + len(text) + 8 + len(binary)))
+        f.write(struct.pack("<II", len(text), 0x4E4F534A) + text)
+        f.write(struct.pack("<II", len(binary), 0x004E4942) + binary)
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def clear_scene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    bpy.data.orphans_purge(do_recursive=True)
+
+def main():
+    counts = [int(arg) for arg in script_args()] or [100_000, 1_000_000, 4_000_000]
+    gltf_fast = import_addon_module("gltf_fast")
+
+    with tempfile.TemporaryDirectory(prefix="meshtools_glb_") as workdir:
+        for count in counts:
+            path = os.path.join(workdir, f"grid_{count}.glb")
+            write_glb(path, *grid_mesh(count))
+            size_mb = os.path.getsize(path) / (1 << 20)
+
+            def read_accessors():
+                with gltf_fast.GLBFile(path) as glb:
+                    coords, loop_verts, _, corner_uvs, _, _ = glb.mesh_buffers(0)
+                    return len(coords), len(loop_verts) // 3
+            seconds, (verts, faces) = timed(read_accessors)
+            print(f"{faces:>9} tris ({size_mb:6.1f} MB)  fast accessors   {seconds:8.3f}s  {verts} verts")
+            if bpy is None:
+                continue
+
+            clear_scene()
+            seconds, objects = timed(lambda: gltf_fast.import_glb(path, bpy.context.scene.collection))
+            print(f"{faces:>9} tris ({size_mb:6.1f} MB)  fast import      {seconds:8.3f}s  {len(objects[0].data.polygons)} faces")
+
+            clear_scene()
+            seconds, _ = timed(lambda: bpy.ops.import_scene.gltf(filepath=path))
+            print(f"{faces:>9} tris ({size_mb:6.1f} MB)  import_scene.gltf {seconds:7.3f}s")
+            clear_scene()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Merge by distance benchmark.
+
+    python benchmarks/bench_merge.py [vertex counts...]
+    blender --background --python benchmarks/bench_merge.py -- [vertex counts...]
+
+Plain Python times the NumPy weld core on synthetic duplicate-vertex soups.
+Inside Blender the same data is also welded as a mesh, once with the bulk
+engine and once with the old Edit mode remove_doubles operator.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _harness import bpy, script_args, import_addon_module
+
+MERGE_DISTANCE = 0.0001
+
+def vertex_soup(count, seed=0):
+    """Triangle soup of `count` vertices where every position is used about three times"""
+    rng = np.random.default_rng(seed)
+    unique = rng.random((max(count // 3, 3), 3)).astype(np.float32)
+    coords = unique[rng.integers(0, len(unique), count - count % 3)]
+    coords += rng.normal(0.0, MERGE_DISTANCE * 0.1, coords.shape).astype(np.float32)
+    return coords
+
+def soup_object(coords):
+    mesh = bpy.data.meshes.new("BenchSoup")
+    mesh.vertices.add(len(coords))
+    mesh.vertices.foreach_set("co", coords.ravel())
+    mesh.loops.add(len(coords))
+    mesh.loops.foreach_set("vertex_index", np.arange(len(coords), dtype=np.int32))
+    mesh.polygons.add(len(coords) // 3)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, len(coords), 3, dtype=np.int32))
+    mesh.update(calc_edges=True)
+    obj = bpy.data.objects.new("BenchSoup", mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def main():
+    counts = [int(arg) for arg in script_args()] or [30_000, 300_000, 3_000_000]
+    mesh_merge = import_addon_module("mesh_merge")
+
+    for count in counts:
+        coords = vertex_soup(count)
+        seconds, (_, keep) = timed(lambda: mesh_merge.weld_map(coords, MERGE_DISTANCE))
+        print(f"{len(coords):>9} verts  numpy core      {seconds:8.3f}s  -> {len(keep)} verts")
+        if bpy is None:
+            continue
+
+        obj = soup_object(coords)
+        seconds, removed = timed(lambda: mesh_merge.merge_mesh_by_distance(obj.data, MERGE_DISTANCE))
+        print(f"{len(coords):>9} verts  bulk mesh       {seconds:8.3f}s  -> removed {removed}")
+
+        obj = soup_object(coords)
+        bpy.ops.object.select_all(action='DESELECT')
+        obj.select_set(True)
+        bpy.context.view_layer.objects.active = obj
+
+        def remove_doubles():
+            bpy.ops.object.mode_set(mode='EDIT')
+            bpy.ops.mesh.select_all(action='SELECT')
+            bpy.ops.mesh.remove_doubles(threshold=MERGE_DISTANCE)
+            bpy.ops.object.mode_set(mode='OBJECT')
+            return len(coords) - len(obj.data.vertices)
+
+        seconds, removed = timed(remove_doubles)
+        print(f"{len(coords):>9} verts  remove_doubles  {seconds:8.3f}s  -> removed {removed}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Tris to quads benchmark.
+
+    python benchmarks/bench_quads.py [grid sizes...]
+    blender --background --python benchmarks/bench_quads.py -- [grid sizes...]
+
+Plain Python times the NumPy pairing core on triangulated, slightly noisy
+grids (2 * size^2 triangles). Inside Blender the same grid is also converted
+as a mesh, once with the bulk engine and once with the old Edit mode
+tris_convert_to_quads operator.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _harness import bpy, script_args, import_addon_module
+
+ANGLE_LIMIT = 40.0
+SHAPE_THRESHOLD = 40.0
+
+def triangulated_grid(size, noise=0.01, seed=0):
+    """Coordinates and (loop_verts, loop_starts, loop_totals) of a grid split along random diagonals"""
+    rng = np.random.default_rng(seed)
+    xs, ys = np.meshgrid(np.arange(size + 1), np.arange(size + 1), indexing='ij')
+    coords = np.column_stack((xs.ravel(), ys.ravel(), rng.normal(0.0, noise, xs.size))).astype(np.float32)
+
+    i, j = (a.ravel() for a in np.meshgrid(np.arange(size), np.arange(size), indexing='ij'))
+    v00 = i * (size + 1) + j
+    v10 = v00 + size + 1
+    v11, v01 = v10 + 1, v00 + 1
+    flip = (rng.random(len(v00)) < 0.5)[:, None]
+    first = np.where(flip, np.column_stack((v00, v10, v11)), np.column_stack((v00, v10, v01)))
+    second = np.where(flip, np.column_stack((v00, v11, v01)), np.column_stack((v10, v11, v01)))
+    tris = np.empty((2 * len(v00), 3), dtype=np.int32)
+    tris[0::2], tris[1::2] = first, second
+
+    loop_verts = tris.ravel()
+    loop_starts = np.arange(0, len(loop_verts), 3, dtype=np.int32)
+    return coords, loop_verts, loop_starts, np.full(len(loop_starts), 3, dtype=np.int32)
+
+def grid_object(coords, loop_verts, loop_starts):
+    mesh = bpy.data.meshes.new("BenchGrid")
+    mesh.vertices.add(len(coords))
+    mesh.vertices.foreach_set("co", coords.ravel())
+    mesh.loops.add(len(loop_verts))
+    mesh.loops.foreach_set("vertex_index", loop_verts)
+    mesh.polygons.add(len(loop_starts))
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    mesh.update(calc_edges=True)
+    obj = bpy.data.objects.new("BenchGrid", mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def main():
+    sizes = [int(arg) for arg in script_args()] or [100, 300, 1000]
+    quads = import_addon_module("quads")
+
+    for size in sizes:
+        coords, loop_verts, loop_starts, loop_totals = triangulated_grid(size)
+
+        def numpy_core():
+            face_a, face_b, _, score = quads.candidate_pairs(
+                coords, loop_verts, loop_starts, loop_totals, ANGLE_LIMIT, SHAPE_THRESHOLD
+            )
+            return len(quads.greedy_pairs(face_a, face_b, score, len(loop_totals)))
+
+        seconds, joined = timed(numpy_core)
+        print(f"{len(loop_totals):>9} tris  numpy core            {seconds:8.3f}s  -> {joined} quads")
+        if bpy is None:
+            continue
+
+        obj = grid_object(coords, loop_verts, loop_starts)
+        seconds, joined = timed(lambda: quads.tris_to_quads_mesh(obj.data, ANGLE_LIMIT, SHAPE_THRESHOLD))
+        print(f"{len(loop_totals):>9} tris  bulk mesh             {seconds:8.3f}s  -> {joined} quads")
+
+        obj = grid_object(coords, loop_verts, loop_starts)
+        bpy.ops.object.select_all(action='DESELECT')
+        obj.select_set(True)
+        bpy.context.view_layer.objects.active = obj
+
+        def edit_mode_operator():
+            bpy.ops.object.mode_set(mode='EDIT')
+            bpy.ops.mesh.select_all(action='SELECT')
+            bpy.ops.mesh.tris_convert_to_quads()
+            bpy.ops.object.mode_set(mode='OBJECT')
+            return len(loop_totals) - len(obj.data.polygons)
+
+        seconds, joined = timed(edit_mode_operator)
+        print(f"{len(loop_totals):>9} tris  tris_convert_to_quads {seconds:8.3f}s  -> {joined} quads")
+
+if __name__ == "__main__":
+    main()
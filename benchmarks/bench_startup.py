@@ -0,0 +1,98 @@
+"""
+Add-on startup benchmark.
+
+    python benchmarks/bench_startup.py [--budget-ms 50]
+    blender --background --factory-startup --python benchmarks/bench_startup.py -- [--budget-ms 300]
+
+Plain Python imports the download module in a fresh interpreter and checks
+that `requests` stays unloaded until the first download. Inside Blender it
+times importing and registering the whole add-on, lists the heavy modules
+that registration pulled in and checks that the queue timer unregisters
+itself when there is nothing to do. Exits with status 1 when the import
+took longer than the budget or a check failed.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _harness import bpy, script_args, import_addon, import_addon_module
+
+# Modules that should only load once a feature needs them
+LAZY_MODULES = ("requests", "urllib3")
+IDLE_TICKS = 1000
+
+def fresh_import(module):
+    """(milliseconds, lazy modules loaded) for importing one add-on module in a new interpreter"""
+    code = (
+        "import json, sys, time\n"
+        f"sys.path.insert(0, {os.path.dirname(os.path.abspath(__file__))!r})\n"
+        "from _harness import import_addon_module\n"
+        "start = time.perf_counter()\n"
+        f"import_addon_module({module!r})\n"
+        "seconds = time.perf_counter() - start\n"
+        f"print(json.dumps([seconds * 1000, [name for name in {LAZY_MODULES!r} if name in sys.modules]]))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+def bench_python(budget_ms):
+    milliseconds, loaded = fresh_import("download")
+    print(f"import download    {milliseconds:8.1f} ms")
+    failures = []
+    if loaded:
+        failures.append(f"importing download loaded {', '.join(loaded)}")
+    if milliseconds > budget_ms:
+        failures.append(f"import took {milliseconds:.1f} ms, budget {budget_ms:.0f} ms")
+    return failures
+
+def bench_blender(budget_ms):
+    before = set(sys.modules)
+    start = time.perf_counter()
+    addon = import_addon()
+    import_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    addon.register()
+    register_ms = (time.perf_counter() - start) * 1000
+    loaded = sorted({name.split(".")[0] for name in set(sys.modules) - before} - {"meshtools"})
+    print(f"import add-on      {import_ms:8.1f} ms")
+    print(f"register           {register_ms:8.1f} ms")
+    print(f"new modules        {', '.join(loaded) or '-'}")
+
+    # Background mode runs no timers, so the idle tick is called directly
+    operators = import_addon_module("operators")
+    start = time.process_time()
+    results = {operators.queue_timer() for _ in range(IDLE_TICKS)}
+    tick_us = (time.process_time() - start) / IDLE_TICKS * 1e6
+    print(f"idle tick          {tick_us:8.1f} us CPU, reschedules: {'no' if results == {None} else 'yes'}")
+    addon.unregister()
+
+    failures = []
+    lazy = [name for name in LAZY_MODULES if name in loaded]
+    if lazy:
+        failures.append(f"registering loaded {', '.join(lazy)}")
+    if results != {None}:
+        failures.append("the queue timer keeps running with empty queues")
+    if import_ms + register_ms > budget_ms:
+        failures.append(f"import and register took {import_ms + register_ms:.1f} ms, budget {budget_ms:.0f} ms")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="MeshTools startup benchmark")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Import (and register) time budget, default 50 ms plain and 300 ms in Blender")
+    args = parser.parse_args(script_args())
+
+    if bpy is None:
+        failures = bench_python(args.budget_ms or 50.0)
+    else:
+        failures = bench_blender(args.budget_ms or 300.0)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
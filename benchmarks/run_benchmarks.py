@@ -0,0 +1,249 @@
+"""
+Benchmark suite for every MeshTools operator.
+
+    blender --background --factory-startup --python benchmarks/run_benchmarks.py -- \
+        --out results.json [--baseline baseline.json] [--threshold 0.2] [--sizes 10000 100000 1000000]
+
+Builds synthetic meshes (quad grids, noisy triangulated scans and
+duplicate-vertex triangle soups) at every requested face count, runs each
+operator of `operators.classes` on a fresh copy and records wall time and
+peak RSS, including the stages of the remesh + bake workflow. Results are
+written as JSON keyed by "kind/faces/name".
+
+With --baseline the run exits with status 1 when any entry got slower (or
+used more memory) than the baseline by more than --threshold. Outside
+Blender an existing results file can be checked against a baseline:
+
+    python benchmarks/run_benchmarks.py --results results.json --baseline baseline.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _harness import bpy, script_args, import_addon_module, load_addon
+
+MESH_KINDS = ("grid", "scan", "soup")
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+MERGE_DISTANCE = 0.0001
+
+# Operators that can't run unattended, with the reason recorded in the results
+SKIPPED = {
+    "wm.meshtools_import_model": "downloads from the network",
+    "wm.meshtools_cancel_import": "needs a running download",
+    "wm.meshtools_export_fbx": "opens a file browser",
+    "wm.meshtools_use_merge_suggestion": "only copies a cached analysis value",
+}
+
+# Ignore differences below these, small stages are dominated by noise
+MIN_DELTA = {"seconds": 0.05, "peak_rss_mb": 16.0}
+
+# ------------------------------
+# Synthetic meshes
+# ------------------------------
+def grid_faces(side):
+    """Quad corner indices of a side x side grid, (side * side, 4)"""
+    rows = np.arange(side)[:, None] * (side + 1)
+    first = (rows + np.arange(side)).ravel()
+    return np.column_stack((first, first + 1, first + side + 2, first + side + 1))
+
+def grid_coords(side, noise=0.0, seed=0):
+    u, v = np.meshgrid(np.linspace(0.0, 1.0, side + 1), np.linspace(0.0, 1.0, side + 1))
+    z = 0.05 * np.sin(u * 12.0) * np.cos(v * 9.0)
+    if noise:
+        z = z + np.random.default_rng(seed).normal(0.0, noise, z.shape)
+    return np.column_stack((u.ravel(), v.ravel(), z.ravel())).astype(np.float32)
+
+def synthetic_mesh(kind, faces):
+    """(coords, loop_verts, loop_starts) with roughly `faces` faces"""
+    if kind == "grid":
+        side = max(int(math.ceil(math.sqrt(faces))), 1)
+        coords, polys = grid_coords(side), grid_faces(side)
+    else:
+        # Triangulated noisy surface, like a photogrammetry scan
+        side = max(int(math.ceil(math.sqrt(faces / 2))), 1)
+        coords = grid_coords(side, noise=0.002)
+        quads = grid_faces(side)
+        polys = np.concatenate((quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]))
+        if kind == "soup":
+            # Every triangle gets its own vertices, jittered well below the merge distance
+            rng = np.random.default_rng(1)
+            coords = coords[polys.ravel()] + rng.normal(0.0, MERGE_DISTANCE * 0.1, (polys.size, 3)).astype(np.float32)
+            polys = np.arange(polys.size).reshape(-1, 3)
+    corners = polys.shape[1]
+    return coords, polys.ravel().astype(np.int32), np.arange(0, polys.size, corners, dtype=np.int32)
+
+def mesh_object(name, buffers):
+    mesh_arrays = import_addon_module("mesh_arrays")
+    mesh = bpy.data.meshes.new(name)
+    mesh_arrays.write_mesh(mesh, *buffers)
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    bpy.ops.object.select_all(action='DESELECT')
+    obj.select_set(True)
+    bpy.context.view_layer.objects.active = obj
+    return obj
+
+def clear_scene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    bpy.data.orphans_purge(do_recursive=True)
+
+# ------------------------------
+# Running
+# ------------------------------
+def operator_kwargs(idname, obj, workdir):
+    """Per operator preparation (not timed), returns the keyword arguments for the call"""
+    if idname == "wm.meshtools_import_local_model":
+        filepath = os.path.join(workdir, f"{obj.name}.fbx")
+        if not os.path.exists(filepath):
+            bpy.ops.export_scene.fbx(filepath=filepath, use_selection=True)
+        return {"filepath": filepath}
+    if idname in ("wm.meshtools_quick_export_fbx", "wm.meshtools_lod_chain"):
+        bpy.context.scene.meshtools_export_fbx_path = os.path.join(workdir, f"{obj.name}_out.fbx")
+    if idname == "wm.meshtools_export_changed":
+        bpy.context.scene.meshtools_export_dir = os.path.join(workdir, "export")
+        # Time a real export, not a manifest hit from the previous repeat
+        return {"force": True}
+    return {}
+
+def run_operator(profiling, idname, kind, faces, buffers, args, workdir):
+    """Run one operator on a fresh copy of the mesh, returns {name: entry} including its stages"""
+    if idname in SKIPPED:
+        return {idname: {"skipped": SKIPPED[idname]}}
+    if idname in ("wm.meshtools_bake", "wm.meshtools_lod_chain") and faces > args.remesh_max_faces:
+        return {idname: {"skipped": f"above --remesh-max-faces {args.remesh_max_faces}"}}
+
+    best = None
+    for _ in range(args.repeat):
+        clear_scene()
+        obj = mesh_object(f"{kind}_{faces}", buffers)
+        kwargs = operator_kwargs(idname, obj, workdir)
+        operator = getattr(bpy.ops.wm, idname.split(".", 1)[1])
+
+        # Every operator records its own stage named after its bl_idname
+        recorder = profiling.StageRecorder()
+        previous = profiling.install_recorder(recorder)
+        try:
+            result = operator(**kwargs)
+        finally:
+            profiling.install_recorder(previous)
+
+        entries = {
+            name: {
+                "seconds": round(stats["seconds"], 4),
+                "peak_rss_mb": round(stats["peak_rss"] / (1 << 20), 1),
+                "calls": stats["calls"],
+            }
+            for name, stats in recorder.stages.items()
+        }
+        entries[idname]["result"] = sorted(result)
+        if best is None or entries[idname]["seconds"] < best[idname]["seconds"]:
+            best = entries
+    return best
+
+def run_suite(args):
+    addon = load_addon()
+    operators = addon.operators
+    profiling = import_addon_module("profiling")
+
+    scene = bpy.context.scene
+    scene.merge_distance = MERGE_DISTANCE
+    scene.target_faces = args.target_faces
+    scene.meshtools_use_remesh_cache = False
+    scene.meshtools_bake_backend = 'NATIVE'
+    scene.meshtools_bake_size = args.bake_size
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="meshtools_bench_") as workdir:
+        for kind in args.kinds:
+            for faces in args.sizes:
+                buffers = synthetic_mesh(kind, faces)
+                for cls in operators.classes:
+                    entries = run_operator(profiling, cls.bl_idname, kind, faces, buffers, args, workdir)
+                    for name, entry in entries.items():
+                        key = f"{kind}/{faces}/{name}"
+                        results[key] = entry
+                        if "skipped" in entry:
+                            print(f"{key:<60} skipped ({entry['skipped']})")
+                        else:
+                            print(f"{key:<60} {entry['seconds']:9.3f}s {entry['peak_rss_mb']:9.1f} MB")
+        clear_scene()
+    return results
+
+# ------------------------------
+# Baseline comparison
+# ------------------------------
+def compare(results, baseline, threshold, min_delta=MIN_DELTA):
+    """Entries that got worse than `baseline` by more than `threshold` (0.2 = 20%)"""
+    regressions = []
+    for key, entry in sorted(results.items()):
+        base = baseline.get(key)
+        if not base:
+            continue
+        for metric, floor in min_delta.items():
+            if metric not in entry or metric not in base:
+                continue
+            new, old = entry[metric], base[metric]
+            if new > old * (1.0 + threshold) and new - old > floor:
+                regressions.append((key, metric, old, new))
+    return regressions
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Benchmark every MeshTools operator on synthetic meshes.")
+    parser.add_argument("--out", help="Write results JSON here")
+    parser.add_argument("--results", help="Check an existing results file instead of running (no Blender needed)")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown, 0.2 = 20%%")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Face counts")
+    parser.add_argument("--kinds", nargs="+", choices=MESH_KINDS, default=list(MESH_KINDS))
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per operator, the fastest is kept")
+    parser.add_argument("--target-faces", type=int, default=10000, help="QuadriFlow target faces")
+    parser.add_argument("--remesh-max-faces", type=int, default=1_000_000, help="Skip remesh + bake above this input size")
+    parser.add_argument("--bake-size", type=int, default=512, help="Texture size for the built-in baker")
+    return parser.parse_args(argv)
+
+def main(argv):
+    args = parse_args(argv)
+    if args.results:
+        results = load_results(args.results)
+    elif bpy is None:
+        print("Run inside Blender: blender --background --factory-startup --python benchmarks/run_benchmarks.py -- ...")
+        return 2
+    else:
+        results = run_suite(args)
+
+    if args.out:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "blender": bpy.app.version_string if bpy else None,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "results": results,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Results written to {args.out}")
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.threshold)
+        for key, metric, old, new in regressions:
+            print(f"REGRESSION {key} {metric}: {old} -> {new} ({(new / old - 1.0) if old else float('inf'):+.0%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(script_args()))
@@ -0,0 +1,329 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# requests is imported on first use, loading it costs more than the rest of the add-on's startup
+
+CHUNK_SIZE = 256 << 10
+INDEX_NAME = "index.json"
+
+class DownloadError(Exception):
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        # HTTP status of the failed response, None for transfer errors
+        self.status = status
+
+class DownloadCancelled(DownloadError):
+    pass
+
+class DownloadCache:
+    """
+    Persistent download cache for model files.
+
+    Files are streamed to disk in chunks (resuming interrupted downloads with
+    HTTP Range requests) and stored by SHA-256 of their content. The index maps
+    URLs to content hashes and ETags, so a URL that was fetched before is served
+    from disk without touching the network. The least recently used files are
+    evicted once the cache grows beyond `max_bytes`.
+    """
+
+    def __init__(self, root, max_bytes=4 << 30, timeout=30):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._objects = os.path.join(root, "objects")
+        self._partial = os.path.join(root, "partial")
+        self._index_path = os.path.join(root, INDEX_NAME)
+        self._lock = threading.Lock()
+        # URL -> pin count, their files are never evicted (see pin)
+        self._pinned = {}
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._partial, exist_ok=True)
+
+    # ------------------------------
+    # Index
+    # ------------------------------
+    def _load_index(self):
+        # Re-read every time, other Blender processes may share the cache directory
+        try:
+            with open(self._index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, index):
+        tmp_path = f"{self._index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self._index_path)
+
+    def _blob_name(self, sha256, filename):
+        ext = os.path.splitext(filename)[1].lower()
+        return os.path.join(sha256[:2], sha256 + ext)
+
+    def lookup(self, url):
+        """Cached path for `url`, or None"""
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(url)
+            if not entry:
+                return None
+            path = os.path.join(self._objects, entry["blob"])
+            if not os.path.exists(path):
+                del index[url]
+                self._save_index(index)
+                return None
+            entry["last_used"] = time.time()
+            self._save_index(index)
+            return path
+
+    # ------------------------------
+    # Download
+    # ------------------------------
+    def fetch(self, url, filename, session=None, progress=None, cancel=None):
+        """
+        Return a local path for `url`, downloading it only when it isn't cached yet.
+
+        progress(bytes_done, bytes_total) is called after every chunk (total is
+        None when the server doesn't send a length). Setting the `cancel` event
+        aborts with DownloadCancelled and keeps the partial file for a resume.
+        """
+        path = self.lookup(url)
+        if path:
+            return path
+
+        part_path = os.path.join(self._partial, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".part")
+        meta_path = part_path + ".json"
+        if session is None:
+            import requests as session
+        sha256, etag, size = self._download(session, url, part_path, meta_path, progress, cancel)
+
+        with self._lock:
+            index = self._load_index()
+            # Same content behind another URL is stored only once
+            blob = next((e["blob"] for e in index.values() if e["sha256"] == sha256
+                         and os.path.exists(os.path.join(self._objects, e["blob"]))), None)
+            if blob:
+                os.remove(part_path)
+            else:
+                blob = self._blob_name(sha256, filename)
+                os.makedirs(os.path.join(self._objects, sha256[:2]), exist_ok=True)
+                os.replace(part_path, os.path.join(self._objects, blob))
+            if os.path.exists(meta_path):
+                os.remove(meta_path)
+
+            index[url] = {
+                "sha256": sha256,
+                "etag": etag,
+                "size": size,
+                "blob": blob,
+                "last_used": time.time(),
+            }
+            self._evict(index)
+            self._save_index(index)
+        return os.path.join(self._objects, blob)
+
+    def _download(self, http, url, part_path, meta_path, progress, cancel):
+        headers = {}
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        validator = None
+        if offset:
+            try:
+                with open(meta_path, encoding="utf-8") as f:
+                    validator = json.load(f).get("validator")
+            except (OSError, ValueError):
+                validator = None
+            if validator:
+                # If-Range makes the server send the whole file when it changed since the first attempt
+                headers["Range"] = f"bytes={offset}-"
+                headers["If-Range"] = validator
+            else:
+                offset = 0
+
+        with http.get(url, headers=headers, stream=True, timeout=self.timeout) as r:
+            if r.status_code == 416 and offset:
+                # Range starts at the end: the partial file is already complete
+                return _hash_file(part_path), validator, offset
+            if r.status_code not in (200, 206):
+                raise DownloadError(f"Download failed: {r.status_code}", status=r.status_code)
+            if r.status_code == 200:
+                offset = 0
+
+            etag = r.headers.get("ETag")
+            validator = etag or r.headers.get("Last-Modified")
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump({"url": url, "validator": validator}, f)
+
+            length = r.headers.get("Content-Length")
+            expected = offset + int(length) if length and "Content-Encoding" not in r.headers else None
+
+            digest = hashlib.sha256()
+            mode = "r+b" if offset else "wb"
+            with open(part_path, mode) as f:
+                if offset:
+                    # Hash the part we already have, then append after it
+                    while True:
+                        block = f.read(CHUNK_SIZE)
+                        if not block:
+                            break
+                        digest.update(block)
+                    f.truncate(offset)
+                    f.seek(offset)
+                size = offset
+                for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                    if cancel is not None and cancel.is_set():
+                        raise DownloadCancelled("Download cancelled")
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+                    if progress:
+                        progress(size, expected)
+
+        if expected is not None and size != expected:
+            raise DownloadError(f"Download incomplete: got {size} of {expected} bytes")
+        return digest.hexdigest(), etag, size
+
+    # ------------------------------
+    # Eviction
+    # ------------------------------
+    def pin(self, urls):
+        """
+        Keep the files of `urls` from being evicted until unpin(), e.g. while
+        a download list is still waiting to import them. The cache may grow
+        past max_bytes meanwhile.
+        """
+        with self._lock:
+            for url in urls:
+                self._pinned[url] = self._pinned.get(url, 0) + 1
+
+    def unpin(self, urls):
+        with self._lock:
+            for url in urls:
+                count = self._pinned.get(url, 0) - 1
+                if count > 0:
+                    self._pinned[url] = count
+                else:
+                    self._pinned.pop(url, None)
+
+    def _evict(self, index):
+        """Drop least recently used files until the cache fits into max_bytes"""
+        blobs = {}
+        for url, entry in index.items():
+            blob = blobs.setdefault(entry["blob"], {"size": entry["size"], "last_used": 0, "urls": []})
+            blob["last_used"] = max(blob["last_used"], entry["last_used"])
+            blob["urls"].append(url)
+
+        total = sum(blob["size"] for blob in blobs.values())
+        # The newest file always stays, even when it is bigger than the whole budget
+        for name, blob in sorted(blobs.items(), key=lambda item: item[1]["last_used"])[:-1]:
+            if total <= self.max_bytes:
+                break
+            if any(url in self._pinned for url in blob["urls"]):
+                continue
+            for url in blob["urls"]:
+                del index[url]
+            path = os.path.join(self._objects, name)
+            if os.path.exists(path):
+                os.remove(path)
+            del blobs[name]
+            total -= blob["size"]
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+# ------------------------------
+# Concurrent downloads
+# ------------------------------
+def make_session(pool_size):
+    """Session whose connection pool keeps up to `pool_size` connections per host alive"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def is_retryable(error):
+    if isinstance(error, DownloadCancelled):
+        return False
+    if isinstance(error, DownloadError) and error.status is not None:
+        return error.status == 429 or error.status >= 500
+    import requests
+    return isinstance(error, (DownloadError, requests.RequestException, OSError))
+
+class DownloadQueue:
+    """
+    Downloads many files into a DownloadCache at once.
+
+    A bounded thread pool shares one pooled Session, so connections to a
+    host are reused across files. Every host gets at most `per_host`
+    parallel downloads. Failed transfers are retried with exponential
+    backoff and continue from the partial file.
+    """
+
+    RETRIES = 3
+    BACKOFF = 1.0
+
+    def __init__(self, cache, workers=4, per_host=2):
+        self.cache = cache
+        self.per_host = per_host
+        self.session = make_session(workers)
+        self.cancel_event = threading.Event()
+        self.bytes_done = 0
+        self.started = time.monotonic()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="MeshToolsDownload")
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def submit(self, url, filename, progress=None):
+        """Future of the local path for `url`, progress(bytes_done, bytes_total) is called per chunk"""
+        return self._pool.submit(self._fetch, url, filename, progress)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+        self.session.close()
+
+    def throughput(self):
+        """Bytes per second over all downloads since the queue was created"""
+        return self.bytes_done / max(time.monotonic() - self.started, 1e-6)
+
+    def _host_slot(self, url):
+        with self._lock:
+            return self._hosts.setdefault(urlsplit(url).netloc, threading.Semaphore(self.per_host))
+
+    def _fetch(self, url, filename, progress):
+        last = [0]
+
+        # Resumed attempts report from their offset, only bytes beyond the best so far count
+        def count(done, total):
+            with self._lock:
+                self.bytes_done += max(done - last[0], 0)
+            last[0] = done
+            if progress:
+                progress(done, total)
+
+        for attempt in range(self.RETRIES + 1):
+            if self.cancel_event.is_set():
+                raise DownloadCancelled("Download cancelled")
+            try:
+                with self._host_slot(url):
+                    return self.cache.fetch(url, filename, session=self.session, progress=count, cancel=self.cancel_event)
+            except Exception as e:
+                if attempt == self.RETRIES or not is_retryable(e):
+                    raise
+                delay = self.BACKOFF * 2 ** attempt * (0.5 + random.random())
+                if self.cancel_event.wait(delay):
+                    raise DownloadCancelled("Download cancelled")
@@ -0,0 +1,307 @@
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+import numpy as np
+
+from . import textures
+from .mesh_arrays import read_coords, read_topology
+
+MANIFEST_NAME = ".meshtools_manifest.json"
+# Bump when hashing changes, everything is exported again once
+MANIFEST_VERSION = 2
+
+# Shared by Quick Export and the per object export
+FBX_OPTIONS = dict(
+    use_selection=True,
+    apply_scale_options='FBX_SCALE_ALL',
+    bake_space_transform=False,
+    use_mesh_modifiers=True,
+    add_leaf_bones=False,
+    path_mode='COPY',
+)
+
+# ------------------------------
+# Manifest
+# ------------------------------
+class ExportManifest:
+    """
+    What was exported into a directory and from which inputs.
+
+    Every object entry holds the geometry, material and texture hashes of
+    its last export. Texture file hashes are cached by size and mtime so
+    unchanged images are not read again.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self.objects = {}
+        self.files = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.objects = data.get("objects", {})
+                self.files = data.get("files", {})
+        except (OSError, ValueError):
+            pass
+
+    def file_hash(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        entry = self.files.get(path)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return entry["sha256"]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self.files[path] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": digest.hexdigest()}
+        return self.files[path]["sha256"]
+
+    def is_current(self, name, hashes):
+        entry = self.objects.get(name)
+        if not entry or any(entry.get(key) != value for key, value in hashes.items()):
+            return False
+        return os.path.exists(os.path.join(self.directory, entry["file"]))
+
+    def record(self, name, hashes, filename):
+        self.objects[name] = dict(hashes, file=filename, exported=time.strftime("%Y-%m-%dT%H:%M:%S"))
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "objects": self.objects, "files": self.files}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+# ------------------------------
+# Hashing
+# ------------------------------
+def _update_array(digest, array):
+    array = np.ascontiguousarray(array)
+    digest.update(str((array.dtype.str, array.shape)).encode("ascii"))
+    digest.update(memoryview(array).cast("B"))
+
+def geometry_hash(obj, depsgraph):
+    """Hash of what the FBX exporter writes for the object: evaluated mesh plus world matrix"""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(obj.type.encode("ascii"))
+    _update_array(digest, np.array(obj.matrix_world, dtype=np.float32))
+    if obj.type != 'MESH':
+        return digest.hexdigest()
+
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        _update_array(digest, read_coords(mesh))
+        for array in read_topology(mesh):
+            _update_array(digest, array)
+        for prop, dtype in (("material_index", np.int32), ("use_smooth", bool)):
+            values = np.empty(len(mesh.polygons), dtype=dtype)
+            mesh.polygons.foreach_get(prop, values)
+            _update_array(digest, values)
+        # Custom split normals change the export without touching the topology
+        normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+        mesh.corner_normals.foreach_get("vector", normals)
+        _update_array(digest, normals)
+        for layer in mesh.uv_layers:
+            uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+            layer.data.foreach_get("uv", uvs)
+            digest.update(layer.name.encode("utf-8"))
+            _update_array(digest, uvs)
+    finally:
+        eval_obj.to_mesh_clear()
+    return digest.hexdigest()
+
+def _socket_value(socket):
+    value = getattr(socket, "default_value", None)
+    if value is None:
+        return None
+    try:
+        return [round(v, 6) for v in value]
+    except TypeError:
+        return round(value, 6) if isinstance(value, float) else value
+
+def object_materials(obj):
+    return [slot.material for slot in obj.material_slots if slot.material]
+
+def material_hash(materials):
+    """Hash of material names, node settings and links"""
+    digest = hashlib.blake2b(digest_size=20)
+    for material in materials:
+        description = {"name": material.name, "use_nodes": material.use_nodes,
+                       "diffuse": list(material.diffuse_color)}
+        if material.use_nodes and material.node_tree:
+            tree = material.node_tree
+            description["nodes"] = sorted(
+                (node.name, node.bl_idname, getattr(getattr(node, "image", None), "name", None),
+                 [(socket.identifier, _socket_value(socket)) for socket in node.inputs if not socket.is_linked])
+                for node in tree.nodes
+            )
+            description["links"] = sorted(
+                (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+                for link in tree.links
+            )
+        digest.update(json.dumps(description, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+def material_images(materials):
+    images = {}
+    for material in materials:
+        if material.use_nodes and material.node_tree:
+            for node in material.node_tree.nodes:
+                image = getattr(node, "image", None)
+                if image is not None:
+                    images[image.name] = image
+    return [images[name] for name in sorted(images)]
+
+def texture_hash(images, manifest):
+    """Hash of the texture contents: the file on disk, packed data, or the pixels of unsaved images"""
+    digest = hashlib.blake2b(digest_size=20)
+    for image in images:
+        digest.update(image.name.encode("utf-8"))
+        if image.packed_file is not None:
+            digest.update(hashlib.sha256(image.packed_file.data).digest())
+            continue
+        path = bpy.path.abspath(image.filepath) if image.filepath else ""
+        file_hash = manifest.file_hash(path) if path and not image.is_dirty else None
+        if file_hash:
+            digest.update(file_hash.encode("ascii"))
+        elif image.has_data:
+            pixels = np.empty(len(image.pixels), dtype=np.float32)
+            image.pixels.foreach_get(pixels)
+            _update_array(digest, pixels)
+    return digest.hexdigest()
+
+def object_hashes(obj, depsgraph, manifest):
+    materials = object_materials(obj)
+    return {
+        "geometry": geometry_hash(obj, depsgraph),
+        "materials": material_hash(materials),
+        "textures": texture_hash(material_images(materials), manifest),
+        # Texture store settings change the written files too
+        "texture_store": f"{bpy.context.scene.meshtools_texture_store}:{bpy.context.scene.meshtools_export_texture_size}"
+                         f":{bpy.context.scene.meshtools_texture_variants}",
+    }
+
+# ------------------------------
+# Export
+# ------------------------------
+def export_filename(obj):
+    return bpy.path.clean_name(obj.name) + ".fbx"
+
+def texture_variants(scene):
+    """The scene's extra texture resolutions, raises ValueError for an invalid list"""
+    return textures.parse_sizes(scene.meshtools_texture_variants)
+
+def export_fbx(filepath, objects):
+    """
+    Export the selection to `filepath`. With the scene's texture store on,
+    the textures of `objects` are deduplicated into a content-hashed folder
+    next to the FBX and referenced from there instead of being copied,
+    together with the scene's downscaled texture variants.
+    Returns the texture store stats, None without the store.
+    """
+    scene = bpy.context.scene
+    if not scene.meshtools_texture_store:
+        bpy.ops.export_scene.fbx(filepath=filepath, **FBX_OPTIONS)
+        return None
+    images = material_images([material for obj in objects for material in object_materials(obj)])
+    root = os.path.join(os.path.dirname(os.path.abspath(filepath)), textures.STORE_DIR)
+    with textures.stored_textures(images, root, int(scene.meshtools_export_texture_size), texture_variants(scene)) as stats:
+        bpy.ops.export_scene.fbx(filepath=filepath, **dict(FBX_OPTIONS, path_mode='RELATIVE'))
+    return stats
+
+def export_object(obj, filepath):
+    """Export only `obj` to `filepath`"""
+    for other in bpy.context.selected_objects:
+        other.select_set(False)
+    obj.select_set(True)
+    bpy.context.view_layer.objects.active = obj
+    export_fbx(filepath, [obj])
+
+def export_changed(objects, directory, workers=1, force=False, blender=None, addon_dir=None):
+    """
+    Export every object to its own FBX in `directory`, skipping objects
+    whose hashes match the manifest. With workers > 1 the exports run in
+    background Blender processes on a saved copy of the current file.
+    Returns (exported names, skipped names, {name: error}).
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest = ExportManifest(directory)
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+
+    changed, skipped = [], []
+    for obj in objects:
+        hashes = object_hashes(obj, depsgraph, manifest)
+        if not force and manifest.is_current(obj.name, hashes):
+            skipped.append(obj.name)
+        else:
+            changed.append((obj, hashes))
+
+    failed = {}
+    if changed and workers > 1 and len(changed) > 1:
+        failed = export_in_workers([obj.name for obj, _ in changed], directory, workers, blender, addon_dir)
+    elif changed:
+        selection = list(bpy.context.selected_objects)
+        active = bpy.context.view_layer.objects.active
+        for obj, _ in changed:
+            try:
+                export_object(obj, os.path.join(directory, export_filename(obj)))
+            except RuntimeError as e:
+                failed[obj.name] = str(e)
+        for obj in bpy.context.selected_objects:
+            obj.select_set(False)
+        for obj in selection:
+            obj.select_set(True)
+        bpy.context.view_layer.objects.active = active
+
+    exported = []
+    for obj, hashes in changed:
+        if obj.name not in failed:
+            manifest.record(obj.name, hashes, export_filename(obj))
+            exported.append(obj.name)
+    manifest.save()
+    return exported, skipped, failed
+
+def export_in_workers(names, directory, workers, blender=None, addon_dir=None):
+    """Export `names` with background Blender processes (batch.py export workers), returns {name: error}"""
+    blender = blender or bpy.app.binary_path
+    addon_dir = addon_dir or os.path.dirname(os.path.abspath(__file__))
+    workers = min(workers, len(names))
+    with tempfile.TemporaryDirectory(prefix="meshtools_export_") as workdir:
+        blend_path = os.path.join(workdir, "export.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=blend_path, copy=True)
+
+        def run(index):
+            chunk = names[index::workers]
+            result_path = os.path.join(workdir, f"result_{index}.json")
+            command = [
+                blender, "--background", "--factory-startup", blend_path,
+                "--python", os.path.join(addon_dir, "batch.py"), "--",
+                "--export-objects", json.dumps(chunk),
+                "--out", directory,
+                "--result", result_path,
+            ]
+            process = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            try:
+                with open(result_path, encoding="utf-8") as f:
+                    return json.load(f)["failed"]
+            except (OSError, ValueError, KeyError):
+                error = (process.stderr or "").strip().splitlines()[-1:] or [f"exit code {process.returncode}"]
+                return {name: f"Export worker failed: {error[0]}" for name in chunk}
+
+        failed = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for chunk_failed in pool.map(run, range(workers)):
+                failed.update(chunk_failed)
+    return failed
@@ -0,0 +1,326 @@
+import json
+import mmap
+import struct
+
+import numpy as np
+
+from .mesh_arrays import write_mesh
+
+GLB_MAGIC = b"glTF"
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+# componentType -> numpy dtype
+COMPONENT_TYPES = {
+    5120: np.int8,
+    5121: np.uint8,
+    5122: np.int16,
+    5123: np.uint16,
+    5125: np.uint32,
+    5126: np.float32,
+}
+TYPE_SIZES = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT2": 4, "MAT3": 9, "MAT4": 16}
+
+# Compressed or quantized data needs the full importer
+UNSUPPORTED_EXTENSIONS = {"KHR_draco_mesh_compression", "EXT_meshopt_compression", "KHR_mesh_quantization"}
+
+MODE_TRIANGLES = 4
+
+# glTF is Y up, Blender Z up: (x, y, z) -> (x, -z, y)
+Y_UP_TO_Z_UP = np.array([
+    [1.0, 0.0, 0.0, 0.0],
+    [0.0, 0.0, -1.0, 0.0],
+    [0.0, 1.0, 0.0, 0.0],
+    [0.0, 0.0, 0.0, 1.0],
+])
+
+class UnsupportedGLB(Exception):
+    """The file is valid but uses something only the stock importer handles"""
+
+# ------------------------------
+# Format detection
+# ------------------------------
+def detect_format(filepath):
+    """'GLB', 'GLTF', 'FBX' or 'OBJ' from the file's first bytes, None when unknown"""
+    with open(filepath, "rb") as f:
+        head = f.read(1024)
+    if head.startswith(GLB_MAGIC):
+        return 'GLB'
+    if head.startswith(b"Kaydara FBX Binary"):
+        return 'FBX'
+    text = head.lstrip(b"\xef\xbb\xbf \t\r\n")
+    if text.startswith(b"{"):
+        return 'GLTF'
+    if text.startswith(b"; FBX"):
+        return 'FBX'
+    for line in text.splitlines():
+        keyword = line.split(b" ", 1)[0]
+        if keyword in (b"#", b"") or keyword.startswith(b"#"):
+            continue
+        return 'OBJ' if keyword in (b"v", b"vn", b"vt", b"f", b"o", b"g", b"mtllib", b"usemtl", b"s") else None
+    return None
+
+# ------------------------------
+# GLB reader
+# ------------------------------
+class GLBFile:
+    """
+    Memory-mapped binary glTF.
+
+    Accessors are returned as NumPy views straight onto the mapped BIN chunk,
+    nothing is copied until a conversion is unavoidable (e.g. uint16 indices).
+    Use as a context manager; views must not outlive it.
+    """
+
+    def __init__(self, filepath):
+        self._file = open(filepath, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise UnsupportedGLB("empty file")
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse(self):
+        buffer = self._map
+        magic, version, length = struct.unpack_from("<4sII", buffer, 0)
+        if magic != GLB_MAGIC or version != 2:
+            raise UnsupportedGLB(f"not a glTF 2.0 binary (version {version})")
+        offset = 12
+        self.json = None
+        self.bin_offset = None
+        self.bin_length = 0
+        while offset + 8 <= min(length, len(buffer)):
+            chunk_length, chunk_type = struct.unpack_from("<II", buffer, offset)
+            start = offset + 8
+            if chunk_type == CHUNK_JSON:
+                self.json = json.loads(bytes(buffer[start:start + chunk_length]))
+            elif chunk_type == CHUNK_BIN and self.bin_offset is None:
+                self.bin_offset, self.bin_length = start, chunk_length
+            offset = start + chunk_length
+        if self.json is None:
+            raise UnsupportedGLB("missing JSON chunk")
+
+        extensions = UNSUPPORTED_EXTENSIONS.intersection(
+            self.json.get("extensionsRequired", []) + self.json.get("extensionsUsed", [])
+        )
+        if extensions:
+            raise UnsupportedGLB(", ".join(sorted(extensions)))
+        if any("uri" in buffer_info for buffer_info in self.json.get("buffers", [])):
+            raise UnsupportedGLB("external buffers")
+
+    def accessor(self, index):
+        """(count, components) view of accessor `index`"""
+        accessor = self.json["accessors"][index]
+        if "sparse" in accessor or "bufferView" not in accessor:
+            raise UnsupportedGLB("sparse or empty accessor")
+        if accessor.get("componentType") not in COMPONENT_TYPES or accessor.get("type") not in TYPE_SIZES:
+            raise UnsupportedGLB(f"accessor type {accessor.get('componentType')} {accessor.get('type')}")
+        dtype = np.dtype(COMPONENT_TYPES[accessor["componentType"]])
+        components = TYPE_SIZES[accessor["type"]]
+        count = accessor["count"]
+        if accessor.get("normalized"):
+            raise UnsupportedGLB("normalized integer accessor")
+        view = self.json["bufferViews"][accessor["bufferView"]]
+        if view.get("buffer", 0) != 0 or self.bin_offset is None:
+            raise UnsupportedGLB("accessor outside the BIN chunk")
+
+        start = self.bin_offset + view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+        element = dtype.itemsize * components
+        stride = view.get("byteStride") or element
+        end = start + stride * (count - 1) + element if count else start
+        if end > self.bin_offset + self.bin_length:
+            raise UnsupportedGLB("accessor runs past the BIN chunk")
+        return np.ndarray((count, components), dtype=dtype, buffer=self._map, offset=start,
+                          strides=(stride, dtype.itemsize))
+
+    def close(self):
+        try:
+            self._map.close()
+        except (BufferError, AttributeError):
+            # A view is still alive somewhere, the map is released with it
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------
+    # Meshes and nodes
+    # ------------------------------
+    def mesh_buffers(self, mesh_index):
+        """(coords, loop_verts, loop_starts, uvs or None, material per face, material indices) of one mesh"""
+        coords, indices, uvs, face_materials = [], [], [], []
+        materials = []
+        vertex_count = 0
+        for primitive in self.json["meshes"][mesh_index]["primitives"]:
+            if primitive.get("mode", MODE_TRIANGLES) != MODE_TRIANGLES:
+                raise UnsupportedGLB("non triangle primitive")
+            if "extensions" in primitive:
+                raise UnsupportedGLB("primitive extensions")
+            attributes = primitive.get("attributes", {})
+            if "POSITION" not in attributes:
+                raise UnsupportedGLB("primitive without POSITION")
+            position = self.accessor(attributes["POSITION"])
+            if position.dtype != np.float32 or position.shape[1] != 3:
+                raise UnsupportedGLB("quantized positions")
+            if "indices" in primitive:
+                index = self.accessor(primitive["indices"])[:, 0]
+            else:
+                index = np.arange(len(position), dtype=np.uint32)
+            # write_mesh doesn't validate, out of range indices would corrupt the mesh
+            if len(index) % 3:
+                raise UnsupportedGLB("index count not a multiple of 3")
+            if len(index) and int(index.max()) >= len(position):
+                raise UnsupportedGLB("index out of range")
+
+            material = primitive.get("material", -1)
+            if material not in materials:
+                materials.append(material)
+            coords.append(position)
+            indices.append(index if vertex_count == 0 else index.astype(np.int64) + vertex_count)
+            face_materials.append(np.full(len(index) // 3, materials.index(material), dtype=np.int32))
+            uv = self.accessor(attributes["TEXCOORD_0"]) if "TEXCOORD_0" in attributes else None
+            uvs.append(uv)
+            vertex_count += len(position)
+
+        # A single primitive keeps its zero-copy views, several are concatenated once
+        coords = coords[0] if len(coords) == 1 else np.concatenate(coords)
+        loop_verts = indices[0] if len(indices) == 1 else np.concatenate(indices)
+        if loop_verts.dtype != np.int32:
+            if loop_verts.dtype == np.uint32 and (not len(loop_verts) or loop_verts.max() < 2 ** 31):
+                loop_verts = loop_verts.view(np.int32)
+            else:
+                loop_verts = loop_verts.astype(np.int32)
+        loop_starts = np.arange(0, len(loop_verts), 3, dtype=np.int32)
+
+        corner_uvs = None
+        if all(uv is not None and uv.dtype == np.float32 for uv in uvs):
+            # Per corner UVs, V flipped to Blender's bottom-left origin
+            corner_uvs = (uvs[0] if len(uvs) == 1 else np.concatenate(uvs))[loop_verts]
+            corner_uvs[:, 1] = 1.0 - corner_uvs[:, 1]
+        return coords, loop_verts, loop_starts, corner_uvs, np.concatenate(face_materials), materials
+
+    def node_matrices(self):
+        """[(node index, 4x4 world matrix)] for every node with a mesh in the default scene"""
+        nodes = self.json.get("nodes", [])
+        scenes = self.json.get("scenes", [])
+        if scenes:
+            roots = scenes[self.json.get("scene", 0)].get("nodes", [])
+        else:
+            children = {child for node in nodes for child in node.get("children", [])}
+            roots = [i for i in range(len(nodes)) if i not in children]
+
+        result = []
+        stack = [(root, np.identity(4)) for root in reversed(roots)]
+        while stack:
+            index, parent = stack.pop()
+            node = nodes[index]
+            world = parent @ _node_matrix(node)
+            if "mesh" in node:
+                result.append((index, world))
+            stack.extend((child, world) for child in reversed(node.get("children", [])))
+        return result
+
+def _node_matrix(node):
+    if "matrix" in node:
+        return np.array(node["matrix"], dtype=np.float64).reshape(4, 4).T
+    x, y, z, w = node.get("rotation", (0.0, 0.0, 0.0, 1.0))
+    rotation = np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+    ])
+    matrix = np.identity(4)
+    matrix[:3, :3] = rotation * np.array(node.get("scale", (1.0, 1.0, 1.0)))
+    matrix[:3, 3] = node.get("translation", (0.0, 0.0, 0.0))
+    return matrix
+
+# ------------------------------
+# Blender import
+# ------------------------------
+# bpy is imported here only, so the reader above also works outside Blender
+def import_glb(filepath, collection):
+    """
+    Geometry-only GLB import: one object per mesh node, meshes shared between
+    instances, Y up converted on the object matrix. Materials are created by
+    name with their base colour factor only. Raises UnsupportedGLB for
+    anything that needs the stock importer. Returns the new objects.
+    """
+    import bpy
+
+    meshes = {}
+    objects = []
+    try:
+        _build(filepath, collection, meshes, objects)
+    except UnsupportedGLB:
+        # Leave nothing half imported behind for the stock importer
+        for obj in objects:
+            bpy.data.objects.remove(obj)
+        for mesh in meshes.values():
+            bpy.data.meshes.remove(mesh)
+        raise
+    return objects
+
+def _build(filepath, collection, meshes, objects):
+    import bpy
+    from mathutils import Matrix
+
+    with GLBFile(filepath) as glb:
+        gltf_materials = glb.json.get("materials", [])
+        nodes = glb.json.get("nodes", [])
+        placements = glb.node_matrices()
+        if not placements:
+            # No scene graph, place every mesh at the origin
+            placements = [(None, np.identity(4))] * len(glb.json.get("meshes", []))
+            mesh_indices = range(len(placements))
+        else:
+            mesh_indices = [nodes[index]["mesh"] for index, _ in placements]
+
+        for (node_index, matrix), mesh_index in zip(placements, mesh_indices):
+            mesh = meshes.get(mesh_index)
+            if mesh is None:
+                coords, loop_verts, loop_starts, corner_uvs, face_materials, material_ids = glb.mesh_buffers(mesh_index)
+                name = glb.json["meshes"][mesh_index].get("name") or f"Mesh_{mesh_index}"
+                mesh = bpy.data.meshes.new(name)
+                write_mesh(mesh, coords, loop_verts, loop_starts)
+                if corner_uvs is not None:
+                    mesh.uv_layers.new(name="UVMap").data.foreach_set("uv", corner_uvs.ravel())
+                mesh.polygons.foreach_set("material_index", face_materials)
+                for material_id in material_ids:
+                    mesh.materials.append(_material(gltf_materials, material_id))
+                mesh.update()
+                del coords, loop_verts, loop_starts, corner_uvs
+                meshes[mesh_index] = mesh
+
+            name = nodes[node_index].get("name") if node_index is not None else None
+            obj = bpy.data.objects.new(name or mesh.name, mesh)
+            obj.matrix_world = Matrix((Y_UP_TO_Z_UP @ matrix).tolist())
+            collection.objects.link(obj)
+            objects.append(obj)
+
+def _material(gltf_materials, index):
+    import bpy
+
+    if index < 0 or index >= len(gltf_materials):
+        return None
+    info = gltf_materials[index]
+    name = info.get("name") or f"Material_{index}"
+    material = bpy.data.materials.get(name)
+    if material is None:
+        material = bpy.data.materials.new(name)
+        material.use_nodes = True
+        principled = next((n for n in material.node_tree.nodes if n.type == 'BSDF_PRINCIPLED'), None)
+        pbr = info.get("pbrMetallicRoughness", {})
+        if principled is not None:
+            principled.inputs['Base Color'].default_value = pbr.get("baseColorFactor", (0.8, 0.8, 0.8, 1.0))
+            principled.inputs['Metallic'].default_value = pbr.get("metallicFactor", 1.0)
+            principled.inputs['Roughness'].default_value = pbr.get("roughnessFactor", 1.0)
+    return material
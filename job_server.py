@@ -0,0 +1,423 @@
+"""
+Job server for MeshTools: keeps background Blender processes warm and runs
+remesh/bake jobs on them back to back, without paying Blender startup and
+add-on registration per job.
+
+    python job_server.py serve --out OUT_DIR --workers 2 --blender /path/to/blender [--port 8765] [--queue 64]
+    python job_server.py submit --url https://example.com/model.glb --filename model.glb --wait
+    python job_server.py submit --path /models/scan.obj --options '{"target_faces": 5000, "bake": true}'
+    python job_server.py status JOB_ID
+
+HTTP API (JSON, bound to 127.0.0.1 by default):
+
+    POST /jobs        model_info ({"model_url", "filename"}) or {"path"}, plus
+                      optional "options" (see batch.DEFAULT_OPTIONS)
+                      -> 202 {"id", "status"}, 503 when the queue is full
+    GET  /jobs/ID     -> the job, including "result" once it finished;
+                      ?wait=SECONDS blocks until then
+    GET  /health      -> workers, queue depth and job counts
+
+Workers are `blender --background` processes running this file in worker
+mode. They read one job per line on stdin and answer with one result line
+on stdout, the rest of their output goes to OUT_DIR/logs.
+"""
+import argparse
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ADDON_DIR)
+import batch
+
+DEFAULT_PORT = 8765
+# Prefixes of the protocol lines on a worker's stdout, everything else is log output
+READY_MARKER = "@@meshtools-ready"
+RESULT_MARKER = "@@meshtools-result "
+# Finished jobs kept for status queries
+JOB_HISTORY = 1000
+
+# ------------------------------
+# Warm workers (coordinator side)
+# ------------------------------
+class WorkerDied(Exception):
+    pass
+
+class WarmWorker:
+    """One background Blender process that has the add-on loaded and waits for jobs on stdin"""
+
+    def __init__(self, index, blender, out_dir, extra_args=()):
+        self.index = index
+        self.blender = blender
+        self.out_dir = out_dir
+        self.extra_args = extra_args
+        self.process = None
+        self.jobs_run = 0
+        self._log = None
+
+    def start(self):
+        log_path = os.path.join(self.out_dir, "logs", f"worker_{self.index}.log")
+        self._log = open(log_path, "a", encoding="utf-8")
+        command = [
+            self.blender, "--background", "--factory-startup", *self.extra_args,
+            "--python", os.path.abspath(__file__), "--", "worker",
+        ]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.STDOUT, text=True, bufsize=1)
+        start = time.perf_counter()
+        self._read_until(READY_MARKER)
+        self.jobs_run = 0
+        print(f"Worker {self.index} ready in {time.perf_counter() - start:.1f}s", flush=True)
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            try:
+                self.process.stdin.close()
+                self.process.wait(timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+        if self._log:
+            self._log.close()
+            self._log = None
+
+    def _read_until(self, marker):
+        for line in self.process.stdout:
+            if line.startswith(marker):
+                return line[len(marker):]
+            self._log.write(line)
+            self._log.flush()
+        raise WorkerDied(f"Worker {self.index} exited with code {self.process.wait()}")
+
+    def run(self, job, timeout=None):
+        """Send `job` to the process and wait for its result, restarting the process when it died"""
+        watchdog = None
+        try:
+            if self.process is None or self.process.poll() is not None:
+                self.stop()
+                self.start()
+            if timeout:
+                watchdog = threading.Timer(timeout, self.process.kill)
+                watchdog.start()
+            self.process.stdin.write(json.dumps(job) + "\n")
+            self.process.stdin.flush()
+            result = json.loads(self._read_until(RESULT_MARKER))
+        except (OSError, WorkerDied) as e:
+            timed_out = watchdog is not None and watchdog.finished.is_set()
+            result = {"id": job["id"], "status": "failed",
+                      "error": f"Timed out after {timeout}s" if timed_out else str(e) or "Worker stopped responding"}
+            self.stop()
+        finally:
+            if watchdog:
+                watchdog.cancel()
+        self.jobs_run += 1
+        result["worker"] = self.index
+        return result
+
+class JobServer:
+    """Bounded job queue in front of a pool of warm workers"""
+
+    def __init__(self, out_dir, blender, workers=1, max_queue=64, timeout=None, extra_args=()):
+        self.out_dir = out_dir
+        self.timeout = timeout
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+        self.workers = [WarmWorker(index, blender, out_dir, extra_args) for index in range(max(1, workers))]
+        self._threads = []
+        os.makedirs(os.path.join(out_dir, "logs"), exist_ok=True)
+
+    def start(self):
+        for worker in self.workers:
+            thread = threading.Thread(target=self._work, args=(worker,), name=f"MeshToolsWorker{worker.index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def submit(self, request):
+        """Queue a job from a request body, raises queue.Full when no slot is free"""
+        if request.get("model_url"):
+            source = {"model_url": request["model_url"],
+                      "filename": request.get("filename") or os.path.basename(urllib.parse.urlparse(request["model_url"]).path)}
+        elif request.get("path"):
+            source = {"path": os.path.abspath(request["path"])}
+        else:
+            raise ValueError("A job needs a model_url or a path")
+        options = batch.normalize_options(request.get("options") or {})
+
+        job_id = uuid.uuid4().hex[:12]
+        name = os.path.splitext(source.get("filename") or os.path.basename(source["path"]))[0]
+        job = dict(source, id=job_id, options=options,
+                   out=os.path.join(self.out_dir, job_id, f"{name}.fbx"))
+        record = {"id": job_id, "status": "queued", "submitted": time.time(), "job": job}
+        with self._lock:
+            self.queue.put_nowait(record)
+            self.jobs[job_id] = record
+            while len(self.jobs) > JOB_HISTORY and next(iter(self.jobs.values()))["status"] in ("ok", "failed"):
+                self.jobs.popitem(last=False)
+        return record
+
+    def get(self, job_id, wait=0.0):
+        deadline = time.monotonic() + wait
+        with self._lock:
+            record = self.jobs.get(job_id)
+            while record and record["status"] in ("queued", "running") and time.monotonic() < deadline:
+                self._finished.wait(deadline - time.monotonic())
+            return dict(record) if record else None
+
+    def health(self):
+        with self._lock:
+            counts = {}
+            for record in self.jobs.values():
+                counts[record["status"]] = counts.get(record["status"], 0) + 1
+        return {
+            "workers": [{"index": w.index, "alive": bool(w.process and w.process.poll() is None), "jobs_run": w.jobs_run}
+                        for w in self.workers],
+            "queued": self.queue.qsize(),
+            "jobs": counts,
+        }
+
+    def _work(self, worker):
+        try:
+            worker.start()
+        except (OSError, WorkerDied) as e:
+            # run() starts it again with the first job
+            print(f"Worker {worker.index} failed to start: {e}", flush=True)
+            worker.stop()
+        while True:
+            record = self.queue.get()
+            if record is None:
+                break
+            with self._lock:
+                record["status"] = "running"
+                record["started"] = time.time()
+            result = worker.run(record["job"], self.timeout)
+            result["queue_seconds"] = round(record["started"] - record["submitted"], 3)
+            with self._lock:
+                record["status"] = "ok" if result.get("status") == "ok" else "failed"
+                record["result"] = result
+                self._finished.notify_all()
+            print(f"{record['status']:>6}  {result.get('seconds', 0.0):8.1f}s  worker {worker.index}  "
+                  f"{record['job'].get('filename') or record['job'].get('path')}", flush=True)
+        worker.stop()
+
+# ------------------------------
+# HTTP frontend
+# ------------------------------
+class JobRequestHandler(BaseHTTPRequestHandler):
+    server_version = "MeshToolsJobServer/1.0"
+
+    def _send(self, code, body):
+        data = json.dumps(body, indent=2).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            self._send(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            record = self.server.jobs.submit(json.loads(self.rfile.read(length) or b"{}"))
+        except (ValueError, TypeError, AttributeError) as e:
+            self._send(400, {"error": str(e)})
+            return
+        except queue.Full:
+            self._send(503, {"error": "Job queue is full, retry later"})
+            return
+        self._send(202, {"id": record["id"], "status": record["status"]})
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        if url.path.rstrip("/") == "/health":
+            self._send(200, self.server.jobs.health())
+            return
+        parts = url.path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] != "jobs":
+            self._send(404, {"error": "Not found"})
+            return
+        query = urllib.parse.parse_qs(url.query)
+        try:
+            wait = float(query.get("wait", ["0"])[0])
+        except ValueError:
+            wait = 0.0
+        record = self.server.jobs.get(parts[1], wait=min(wait, 3600.0))
+        if record is None:
+            self._send(404, {"error": f"Unknown job {parts[1]}"})
+            return
+        self._send(200, record)
+
+    def log_message(self, format, *args):
+        # Job progress is printed by the worker threads, skip the access log
+        pass
+
+def serve(args):
+    out_dir = os.path.abspath(args.out)
+    jobs = JobServer(out_dir, args.blender, workers=args.workers, max_queue=args.queue, timeout=args.timeout)
+    jobs.start()
+    httpd = ThreadingHTTPServer((args.host, args.port), JobRequestHandler)
+    httpd.jobs = jobs
+    print(f"MeshTools job server on http://{args.host}:{args.port} with {len(jobs.workers)} workers, output in {out_dir}",
+          flush=True)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        jobs.stop()
+    return 0
+
+# ------------------------------
+# Client
+# ------------------------------
+def request_json(method, url, body=None, timeout=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+def submit(args):
+    body = {"options": json.loads(args.options)}
+    if args.url:
+        body.update(model_url=args.url, filename=args.filename)
+    elif args.path:
+        body["path"] = args.path
+    else:
+        print("Give --url or --path")
+        return 2
+    code, reply = request_json("POST", f"{args.server}/jobs", body)
+    if code != 202:
+        print(reply.get("error", reply))
+        return 1
+    print(f"Queued job {reply['id']}", flush=True)
+    if not args.wait:
+        return 0
+    # Long polls, the server answers as soon as the job finished
+    while True:
+        code, record = request_json("GET", f"{args.server}/jobs/{reply['id']}?wait=60", timeout=90)
+        if record.get("status") not in ("queued", "running"):
+            break
+    print(json.dumps(record.get("result", record), indent=2))
+    return 0 if record.get("status") == "ok" else 1
+
+def status(args):
+    path = f"/jobs/{args.job_id}" if args.job_id else "/health"
+    code, reply = request_json("GET", args.server + path)
+    print(json.dumps(reply, indent=2))
+    return 0 if code == 200 else 1
+
+# ------------------------------
+# Worker (runs inside Blender)
+# ------------------------------
+def clear_data():
+    """Remove everything the previous job left, cheaper than loading a new file and keeps the add-on registered"""
+    import bpy
+    for collection in (bpy.data.objects, bpy.data.meshes, bpy.data.materials, bpy.data.images,
+                       bpy.data.textures, bpy.data.node_groups, bpy.data.collections, bpy.data.armatures,
+                       bpy.data.actions, bpy.data.cameras, bpy.data.lights):
+        for block in list(collection):
+            collection.remove(block)
+    bpy.data.orphans_purge(do_recursive=True)
+
+def run_worker_job(addon, job, bakelab_enabled):
+    import bpy
+    start = time.perf_counter()
+    result = {"id": job["id"], "status": "failed", "error": None}
+    try:
+        clear_data()
+        options = job["options"]
+        if options["bake"] and options["bake_backend"] == 'BAKELAB' and not bakelab_enabled:
+            import addon_utils
+            addon_utils.enable(options.get("bakelab_module", "BakeLab2"), default_set=False)
+            bakelab_enabled = True
+        path = job.get("path")
+        if job.get("model_url"):
+            fetch_start = time.perf_counter()
+            cache = addon.operators.get_download_cache(bpy.context.scene)
+            path = cache.fetch(job["model_url"], job["filename"])
+            result["download_seconds"] = round(time.perf_counter() - fetch_start, 3)
+        result["input"] = path
+        os.makedirs(os.path.dirname(job["out"]), exist_ok=True)
+        result.update(batch.process_model(addon.operators, path, job["out"], options))
+        result["status"] = "ok"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result, bakelab_enabled
+
+def worker_main():
+    import bpy
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    addon = batch.load_addon()
+    bakelab_enabled = False
+    print(READY_MARKER, flush=True)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        result, bakelab_enabled = run_worker_job(addon, json.loads(line), bakelab_enabled)
+        print(RESULT_MARKER + json.dumps(result), flush=True)
+
+# ------------------------------
+# Command line
+# ------------------------------
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Warm Blender job server for MeshTools remesh/bake jobs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Start the server and its workers")
+    serve_parser.add_argument("--out", required=True, help="Output directory, every job writes into OUT/<job id>/")
+    serve_parser.add_argument("--workers", type=int, default=1, help="Warm Blender processes")
+    serve_parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument("--queue", type=int, default=64, help="Queued jobs before submissions are refused")
+    serve_parser.add_argument("--timeout", type=float, default=None, help="Per job timeout in seconds, restarts the worker")
+
+    server = f"http://127.0.0.1:{DEFAULT_PORT}"
+    submit_parser = commands.add_parser("submit", help="Queue a job")
+    submit_parser.add_argument("--server", default=server)
+    submit_parser.add_argument("--url", help="model_url of the model_info contract")
+    submit_parser.add_argument("--filename", help="filename of the model_info contract")
+    submit_parser.add_argument("--path", help="Local model file instead of a URL")
+    submit_parser.add_argument("--options", default="{}", help="JSON option overrides, e.g. '{\"bake\": true}'")
+    submit_parser.add_argument("--wait", action="store_true", help="Wait for the result and print it")
+
+    status_parser = commands.add_parser("status", help="Show a job, or the server health without a job id")
+    status_parser.add_argument("job_id", nargs="?")
+    status_parser.add_argument("--server", default=server)
+
+    commands.add_parser("worker", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def main(argv):
+    args = parse_args(argv)
+    if args.command == "worker":
+        worker_main()
+        return 0
+    return {"serve": serve, "submit": submit, "status": status}[args.command](args)
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    sys.exit(main(argv))
@@ -0,0 +1,71 @@
+import collections
+import logging
+import logging.handlers
+import threading
+import time
+
+LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+
+class LogBuffer:
+    """
+    Fixed size in-memory log. Old entries fall off the front once `capacity`
+    is reached, nothing is stored in the .blend. Entries can optionally be
+    spilled to a rotating log file on disk.
+    """
+
+    def __init__(self, capacity=1000):
+        self._entries = collections.deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._file_logger = None
+        self._file_path = ""
+        # Bumped on every change so the UI can tell when it needs a redraw
+        self.version = 0
+
+    def append(self, message, level='INFO'):
+        if level not in LEVELS:
+            level = 'INFO'
+        with self._lock:
+            self._entries.append((time.time(), level, message))
+            self.version += 1
+            file_logger = self._file_logger
+        if file_logger:
+            file_logger.log(logging.getLevelName(level), message)
+
+    def extend(self, entries):
+        """Append many (message, level) pairs at once"""
+        for message, level in entries:
+            self.append(message, level)
+
+    def tail(self, count):
+        """The newest `count` entries as (timestamp, level, message), oldest first"""
+        with self._lock:
+            if count >= len(self._entries):
+                return list(self._entries)
+            return list(self._entries)[-count:]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.version += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def set_file(self, path, max_bytes=1024 * 1024, backups=3):
+        """Spill entries to `path` (rotated at max_bytes), an empty path turns spilling off"""
+        if path == self._file_path:
+            return
+        logger = logging.getLogger("meshtools")
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+            handler.close()
+        self._file_path = path
+        if not path:
+            self._file_logger = None
+            return
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        self._file_logger = logger
@@ -0,0 +1,126 @@
+import time
+
+import bpy
+
+from .mesh_ops import selected_mesh_objects, unique_meshes
+
+# ------------------------------
+# Principled BSDF lookup
+# ------------------------------
+class PrincipledCache:
+    """
+    Principled BSDF node name per material.
+
+    Looking a node up by name is a hash lookup, scanning every node of every
+    material on each slider step is what made dragging slow. Entries are
+    checked on use, so renamed or deleted nodes are found again.
+    """
+
+    def __init__(self):
+        self._names = {}
+
+    def get(self, material, create=True):
+        nodes = material.node_tree.nodes
+        key = material.as_pointer()
+        node = nodes.get(self._names.get(key, ""))
+        if node is not None and node.type == 'BSDF_PRINCIPLED':
+            return node
+        node = next((n for n in nodes if n.type == 'BSDF_PRINCIPLED'), None)
+        if node is None and create:
+            node = nodes.new('ShaderNodeBsdfPrincipled')
+            output = next((n for n in nodes if n.type == 'OUTPUT_MATERIAL'), None)
+            if output:
+                material.node_tree.links.new(node.outputs['BSDF'], output.inputs['Surface'])
+        if node is not None:
+            self._names[key] = node.name
+        return node
+
+    def clear(self):
+        self._names.clear()
+
+def _set_input(links, socket, value):
+    """Unlink `socket` and set its value, returns True when anything changed"""
+    changed = False
+    while socket.is_linked:
+        links.remove(socket.links[0])
+        changed = True
+    if abs(socket.default_value - value) > 1e-6:
+        socket.default_value = value
+        changed = True
+    return changed
+
+# ------------------------------
+# Update engine
+# ------------------------------
+class MaterialUpdater:
+    """
+    Applies the Metallic/Smoothness scene settings to the materials of all
+    selected meshes.
+
+    Slider drags call schedule(), which only records the time; a timer applies
+    the newest values once the slider has been still for DEBOUNCE seconds, so
+    a drag costs one update instead of one per step.
+    """
+
+    DEBOUNCE = 0.15
+
+    def __init__(self, on_applied=None):
+        self.principled = PrincipledCache()
+        # on_applied(touched, changed) after every update, for status and log
+        self.on_applied = on_applied
+        self._last_change = 0.0
+        # Timers are looked up by function identity, a fresh bound method would never match
+        self._timer = self._flush
+
+    def schedule(self, context):
+        if bpy.app.background:
+            # Timers don't run without a UI
+            self.apply_selected(context)
+            return
+        self._last_change = time.monotonic()
+        # Ask Blender rather than keeping a flag, loading a file drops non-persistent timers
+        if not bpy.app.timers.is_registered(self._timer):
+            bpy.app.timers.register(self._timer, first_interval=self.DEBOUNCE)
+
+    def cancel(self):
+        if bpy.app.timers.is_registered(self._timer):
+            bpy.app.timers.unregister(self._timer)
+
+    def _flush(self):
+        waited = time.monotonic() - self._last_change
+        if waited < self.DEBOUNCE:
+            return self.DEBOUNCE - waited
+        self.apply_selected(bpy.context)
+        return None
+
+    def apply_selected(self, context):
+        """Update every material of the selected meshes, returns (materials touched, materials changed)"""
+        scene = context.scene
+        result = self.apply(selected_mesh_objects(context), 1.0 if scene.material_metallic else 0.0, scene.material_roughness)
+        if self.on_applied:
+            self.on_applied(*result)
+        return result
+
+    def apply(self, objects, metallic, roughness):
+        materials = {}
+        for _, mesh in unique_meshes(objects):
+            # Create default material if none exists
+            if not mesh.materials:
+                mesh.materials.append(bpy.data.materials.new(name="Material"))
+            for material in mesh.materials:
+                if material and material.library is None:
+                    materials.setdefault(material.as_pointer(), material)
+
+        changed = 0
+        for material in materials.values():
+            if not material.use_nodes:
+                material.use_nodes = True
+            principled = self.principled.get(material)
+            links = material.node_tree.links
+            updated = False
+            for name, value in (('Metallic', metallic), ('Roughness', roughness)):
+                socket = principled.inputs.get(name)
+                if socket is not None:
+                    updated |= _set_input(links, socket, value)
+            changed += updated
+        return len(materials), changed
@@ -0,0 +1,198 @@
+import numpy as np
+
+# ------------------------------
+# Bulk mesh buffer access
+# ------------------------------
+# Attribute data types that can be copied through foreach_get/foreach_set:
+# data_type -> (property name, components, numpy dtype)
+ATTRIBUTE_LAYOUT = {
+    'FLOAT': ('value', 1, np.float32),
+    'INT': ('value', 1, np.int32),
+    'FLOAT_VECTOR': ('vector', 3, np.float32),
+    'FLOAT_COLOR': ('color', 4, np.float32),
+    'BYTE_COLOR': ('color', 4, np.float32),
+    'FLOAT2': ('vector', 2, np.float32),
+    'BOOLEAN': ('value', 1, bool),
+    'INT8': ('value', 1, np.int8),
+    'INT32_2D': ('value', 2, np.int32),
+    'QUATERNION': ('value', 4, np.float32),
+}
+
+# Attributes write_mesh recreates from the new buffers
+TOPOLOGY_ATTRIBUTES = {"position", ".edge_verts", ".corner_vert", ".corner_edge"}
+
+def read_coords(mesh):
+    """Vertex positions as an (n, 3) float32 array"""
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    return co.reshape(-1, 3)
+
+def read_topology(mesh):
+    """Corner vertex indices plus polygon loop starts and totals"""
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    loop_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    return loop_verts, loop_starts, loop_totals
+
+def read_edges(mesh):
+    """Edge vertex pairs as an (n, 2) int32 array"""
+    edge_verts = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edge_verts)
+    return edge_verts.reshape(-1, 2)
+
+def next_corner(loop_starts, loop_totals):
+    """Index of the following corner inside the same polygon for every corner"""
+    nxt = np.arange(1, int(loop_totals.sum()) + 1, dtype=np.int64)
+    nxt[loop_starts + loop_totals - 1] = loop_starts
+    return nxt
+
+def corner_faces(loop_totals):
+    """Polygon index for every corner"""
+    return np.repeat(np.arange(len(loop_totals)), loop_totals)
+
+def edge_keys(pairs, vertex_count):
+    """Order independent int64 key for every (a, b) vertex pair"""
+    pairs = np.sort(pairs, axis=1).astype(np.int64)
+    return pairs[:, 0] * vertex_count + pairs[:, 1]
+
+def uv_border_vertices(loop_verts, loop_starts, loop_totals, corner_uvs, vertex_count, seams=None):
+    """
+    Boolean mask of the vertices on UV island borders: edges whose two faces
+    disagree on the UVs, edges without exactly two faces and the (a, b)
+    vertex pairs in `seams`.
+    """
+    border = np.zeros(vertex_count, dtype=bool)
+    if seams is not None:
+        border[np.asarray(seams).ravel()] = True
+    if len(loop_verts) == 0:
+        return border
+    nxt = next_corner(loop_starts, loop_totals)
+    ends = loop_verts[nxt]
+    keys = edge_keys(np.column_stack((loop_verts, ends)), vertex_count)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    first = np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))
+    counts = np.diff(np.append(np.flatnonzero(first), len(keys)))
+
+    # Open and non-manifold edges always count as borders
+    open_corners = order[np.repeat(counts != 2, counts)]
+    starts = np.flatnonzero(first)[counts == 2]
+    c1, c2 = order[starts], order[starts + 1]
+    # The second face runs along the edge in either direction
+    same = loop_verts[c1] == loop_verts[c2]
+    other_start = np.where(same, c2, nxt[c2])
+    other_end = np.where(same, nxt[c2], c2)
+    split = ((corner_uvs[c1] != corner_uvs[other_start]).any(axis=1) |
+             (corner_uvs[nxt[c1]] != corner_uvs[other_end]).any(axis=1))
+    corners = np.concatenate((open_corners, c1[split]))
+    border[loop_verts[corners]] = True
+    border[ends[corners]] = True
+    return border
+
+def connected_components(count, a, b):
+    """Label every node with the smallest node index of its component"""
+    labels = np.arange(count)
+    if len(a) == 0:
+        return labels
+    while True:
+        low = np.minimum(labels[a], labels[b])
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, a, low)
+        np.minimum.at(new_labels, b, low)
+        # Pointer jumping keeps long chains from needing one pass per link
+        while True:
+            jumped = new_labels[new_labels]
+            if np.array_equal(jumped, new_labels):
+                break
+            new_labels = jumped
+        if np.array_equal(new_labels, labels):
+            return labels
+        labels = new_labels
+
+def _domain_size(mesh, domain):
+    return {
+        'POINT': len(mesh.vertices),
+        'EDGE': len(mesh.edges),
+        'FACE': len(mesh.polygons),
+        'CORNER': len(mesh.loops),
+    }.get(domain)
+
+def capture_attributes(mesh):
+    """
+    Copy every attribute except the topology into numpy arrays. Hidden
+    ".name" attributes (seams, selection, hiding, UV pins) come last, so the
+    UV maps they belong to exist again before they are restored.
+    """
+    captured = []
+    for attr in sorted(mesh.attributes, key=lambda attr: attr.name.startswith('.')):
+        if attr.name in TOPOLOGY_ATTRIBUTES:
+            continue
+        layout = ATTRIBUTE_LAYOUT.get(attr.data_type)
+        size = _domain_size(mesh, attr.domain)
+        if layout is None or size is None:
+            continue
+        prop, components, dtype = layout
+        values = np.empty(size * components, dtype=dtype)
+        attr.data.foreach_get(prop, values)
+        captured.append((attr.name, attr.data_type, attr.domain, values.reshape(size, components)))
+    return captured
+
+def write_mesh(mesh, coords, loop_verts, loop_starts):
+    """Replace all geometry of `mesh` with the given buffers, edges are recomputed"""
+    mesh.clear_geometry()
+    mesh.vertices.add(len(coords))
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(coords, dtype=np.float32).ravel())
+    mesh.loops.add(len(loop_verts))
+    mesh.loops.foreach_set("vertex_index", np.ascontiguousarray(loop_verts, dtype=np.int32))
+    mesh.polygons.add(len(loop_starts))
+    mesh.polygons.foreach_set("loop_start", np.ascontiguousarray(loop_starts, dtype=np.int32))
+    mesh.update(calc_edges=True)
+
+def rebuild_mesh(mesh, coords, loop_verts, loop_starts, point_src, corner_src, face_src, vert_remap):
+    """
+    Replace the geometry of `mesh` in bulk and carry its attributes over.
+
+    point_src/corner_src/face_src give the old element each new element copies
+    its attribute values from, vert_remap maps old vertices to new ones so edge
+    attributes (seams, sharp edges) can be matched by their vertex pair.
+    """
+    attributes = capture_attributes(mesh)
+    old_edge_keys = None
+    if any(domain == 'EDGE' for _, _, domain, _ in attributes):
+        old_edge_keys = edge_keys(vert_remap[read_edges(mesh)], len(coords))
+    active_uv = mesh.uv_layers.active.name if mesh.uv_layers.active else None
+
+    write_mesh(mesh, coords, loop_verts, loop_starts)
+
+    edge_src = None
+    if old_edge_keys is not None:
+        new_keys = edge_keys(read_edges(mesh), len(coords))
+        edge_src = np.full(len(new_keys), -1)
+        if len(old_edge_keys):
+            order = np.argsort(old_edge_keys, kind='stable')
+            sorted_keys = old_edge_keys[order]
+            pos = np.minimum(np.searchsorted(sorted_keys, new_keys), len(order) - 1)
+            hit = sorted_keys[pos] == new_keys
+            edge_src[hit] = order[pos[hit]]
+
+    for name, data_type, domain, values in attributes:
+        if domain == 'EDGE':
+            new_values = np.zeros((len(edge_src), values.shape[1]), dtype=values.dtype)
+            matched = edge_src >= 0
+            new_values[matched] = values[edge_src[matched]]
+        else:
+            src = {'POINT': point_src, 'CORNER': corner_src, 'FACE': face_src}[domain]
+            new_values = values[src]
+        attr = mesh.attributes.get(name)
+        if attr is None or attr.domain != domain or attr.data_type != data_type:
+            if attr is not None:
+                mesh.attributes.remove(attr)
+            attr = mesh.attributes.new(name, data_type, domain)
+        attr.data.foreach_set(ATTRIBUTE_LAYOUT[data_type][0], np.ascontiguousarray(new_values).ravel())
+
+    if active_uv and active_uv in mesh.uv_layers:
+        mesh.uv_layers.active = mesh.uv_layers[active_uv]
+    mesh.update()
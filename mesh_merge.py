@@ -0,0 +1,215 @@
+import numpy as np
+
+from .mesh_arrays import (
+    read_coords,
+    read_topology,
+    next_corner,
+    corner_faces,
+    rebuild_mesh,
+)
+
+# Large primes for the spatial hash used when the grid is too large for linear
+# cell keys. Hash collisions only add candidate pairs that the exact distance
+# test rejects again.
+_HASH_PRIMES = np.array([73856093, 19349663, 83492791], dtype=np.int64)
+
+# Own cell plus the 13 "forward" neighbours, so every pair of adjacent cells
+# is visited exactly once.
+_NEIGHBOR_OFFSETS = np.array(
+    [(0, 0, 0)] + [
+        (dx, dy, dz)
+        for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+        if (dx, dy, dz) > (0, 0, 0)
+    ],
+    dtype=np.int64,
+)
+
+# Upper bound for candidate pairs expanded at once, keeps memory flat on dense clusters
+_PAIR_CHUNK = 4_000_000
+
+# ------------------------------
+# Pure NumPy core
+# ------------------------------
+def _hash_cells(cells):
+    hashed = cells * _HASH_PRIMES
+    return hashed[:, 0] ^ hashed[:, 1] ^ hashed[:, 2]
+
+def find_close_pairs(coords, distance):
+    """All vertex pairs (a, b) with a != b closer than `distance`"""
+    coords = np.asarray(coords, dtype=np.float64)
+    count = len(coords)
+    if count < 2 or distance <= 0.0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    # Cells start at 1 so the -1/+1 neighbours of occupied cells never wrap around
+    cells = np.floor(coords / distance).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    extent = cells.max(axis=0) + 2
+    linear = float(extent[0]) * float(extent[1]) * float(extent[2]) < 2.0 ** 62
+    if linear:
+        strides = np.array([extent[1] * extent[2], extent[2], 1], dtype=np.int64)
+        keys = cells @ strides
+    else:
+        keys = _hash_cells(cells)
+
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    first = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+    cell_keys = sorted_keys[first]
+    cell_counts = np.diff(np.append(first, count))
+    # Occupied cell of every point, in sorted point order
+    point_cells = np.repeat(np.arange(len(first)), cell_counts)
+    limit = distance * distance
+
+    pairs_a, pairs_b = [], []
+    for offset in _NEIGHBOR_OFFSETS:
+        if linear:
+            # Shifting sorted linear keys keeps them sorted, so the lookup stays cache friendly
+            needles = cell_keys + offset @ strides
+        else:
+            needles = _hash_cells(cells[order[first]] + offset)
+        found = np.minimum(np.searchsorted(cell_keys, needles), len(cell_keys) - 1)
+        hit = cell_keys[found] == needles
+        neighbor_start = first[found]
+        neighbor_count = np.where(hit, cell_counts[found], 0)
+
+        counts = neighbor_count[point_cells]
+        lo = neighbor_start[point_cells]
+        ends = np.cumsum(counts)
+        start = 0
+        while start < count:
+            # Grow the chunk until it holds about _PAIR_CHUNK candidates
+            base = ends[start - 1] if start else 0
+            stop = max(int(np.searchsorted(ends, base + _PAIR_CHUNK, side='right')), start + 1)
+            stop = min(stop, count)
+            chunk_counts = counts[start:stop]
+            total = int(chunk_counts.sum())
+            if total:
+                a = order[np.repeat(np.arange(start, stop), chunk_counts)]
+                run = np.arange(total) - np.repeat(np.cumsum(chunk_counts) - chunk_counts, chunk_counts)
+                b = order[np.repeat(lo[start:stop], chunk_counts) + run]
+                keep = a < b if not offset.any() else a != b
+                a, b = a[keep], b[keep]
+                delta = coords[a] - coords[b]
+                close = np.einsum('ij,ij->i', delta, delta) <= limit
+                pairs_a.append(a[close])
+                pairs_b.append(b[close])
+            start = stop
+
+    if not pairs_a:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(pairs_a), np.concatenate(pairs_b)
+
+def anchor_labels(count, a, b, rounds=32):
+    """
+    Bind every vertex to an anchor it is paired with, greedily in index order:
+    a vertex that isn't paired with a lower anchor becomes an anchor itself,
+    every other vertex joins its lowest paired anchor. Unlike connected
+    components a chain of close vertices doesn't collapse into one point,
+    every vertex stays within the pair distance of its anchor.
+    """
+    labels = np.arange(count)
+    if len(a) == 0:
+        return labels
+    low, high = np.minimum(a, b), np.maximum(a, b)
+    # 0 undecided, 1 anchor, 2 bound to a lower anchor
+    state = np.where(np.bincount(high, minlength=count) == 0, 1, 0).astype(np.int8)
+
+    # Each round settles at least the lowest undecided vertex, clusters of
+    # duplicates take two or three rounds, only long chains need the loop below
+    for _ in range(rounds):
+        undecided = state == 0
+        if not undecided.any():
+            break
+        has_anchor = np.bincount(high, weights=state[low] == 1, minlength=count) > 0
+        open_low = np.bincount(high, weights=state[low] != 2, minlength=count)
+        state[undecided & has_anchor] = 2
+        state[undecided & ~has_anchor & (open_low == 0)] = 1
+    else:
+        order = np.argsort(high, kind='stable')
+        sorted_low = low[order]
+        starts = np.searchsorted(high[order], np.arange(count + 1))
+        for vertex in np.flatnonzero(state == 0):
+            lower = sorted_low[starts[vertex]:starts[vertex + 1]]
+            state[vertex] = 2 if (state[lower] == 1).any() else 1
+
+    anchored = state[low] == 1
+    bound = anchored & (state[high] == 2)
+    np.minimum.at(labels, high[bound], low[bound])
+    return labels
+
+def weld_map(coords, distance):
+    """
+    Weld vertices closer than `distance`. Vertices are bound to an anchor
+    vertex within `distance` in index order (see anchor_labels), so merging
+    isn't transitive.
+
+    Returns (remap, keep): remap gives the new index of every input vertex,
+    keep the input vertex that survives for every cluster. Clusters keep the
+    order of their lowest input index, like remove_doubles does.
+    """
+    coords = np.asarray(coords)
+    count = len(coords)
+    if count == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    if distance > 0.0:
+        a, b = find_close_pairs(coords, distance)
+        labels = anchor_labels(count, a, b)
+    else:
+        # Zero distance only welds exact duplicates
+        _, labels = np.unique(coords, axis=0, return_inverse=True)
+
+    clusters, remap = np.unique(labels.ravel(), return_inverse=True)
+    remap = remap.ravel()
+    keep = np.full(len(clusters), count, dtype=np.int64)
+    np.minimum.at(keep, remap, np.arange(count))
+
+    order = np.argsort(keep, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return rank[remap], keep[order]
+
+def weld_faces(remap, loop_verts, loop_starts, loop_totals):
+    """
+    Drop corners that collapsed onto their neighbour and polygons that
+    became degenerate. Returns (loop_verts, loop_starts, corner_src, face_src).
+    """
+    welded = remap[loop_verts]
+    keep_corner = welded != welded[next_corner(loop_starts, loop_totals)]
+    faces = corner_faces(loop_totals)
+    new_totals = np.bincount(faces[keep_corner], minlength=len(loop_totals))
+    keep_face = new_totals >= 3
+
+    # Polygons that still repeat a vertex (a-b-a-c) would be invalid, drop them too
+    corners = np.flatnonzero(keep_corner)
+    pair_order = np.lexsort((welded[corners], faces[corners]))
+    sorted_faces = faces[corners][pair_order]
+    sorted_verts = welded[corners][pair_order]
+    repeated = (sorted_faces[1:] == sorted_faces[:-1]) & (sorted_verts[1:] == sorted_verts[:-1])
+    keep_face[sorted_faces[1:][repeated]] = False
+
+    keep_corner &= keep_face[faces]
+    corner_src = np.flatnonzero(keep_corner)
+    face_src = np.flatnonzero(keep_face)
+    totals = new_totals[face_src]
+    new_starts = np.concatenate(([0], np.cumsum(totals)[:-1])) if len(totals) else totals
+    return welded[corner_src], new_starts, corner_src, face_src
+
+# ------------------------------
+# Mesh data-block entry point
+# ------------------------------
+def merge_mesh_by_distance(mesh, distance):
+    """Weld vertices of an Object mode mesh in place, returns the number of removed vertices"""
+    coords = read_coords(mesh)
+    remap, keep = weld_map(coords, distance)
+    removed = len(coords) - len(keep)
+    if removed == 0:
+        return 0
+
+    loop_verts, loop_starts, loop_totals = read_topology(mesh)
+    new_loop_verts, new_starts, corner_src, face_src = weld_faces(remap, loop_verts, loop_starts, loop_totals)
+    rebuild_mesh(mesh, coords[keep], new_loop_verts, new_starts, keep, corner_src, face_src, remap)
+    return removed
@@ -0,0 +1,215 @@
+import math
+import time
+
+import bmesh
+import bpy
+import numpy as np
+
+from .mesh_arrays import read_edges, read_topology, uv_border_vertices
+from .mesh_merge import merge_mesh_by_distance
+from .normals import set_smooth_normals
+from .profiling import record_span
+from .quads import tris_to_quads_mesh
+
+# Decimate vertex group strength (0-1000) that keeps UV border vertices in LOD copies
+BORDER_WEIGHT_FACTOR = 100.0
+
+# ------------------------------
+# Selection helpers
+# ------------------------------
+def selected_mesh_objects(context):
+    """Selected mesh objects, the active one included even when it isn't selected"""
+    objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+    active = context.active_object
+    if active and active.type == 'MESH' and active not in objects:
+        objects.append(active)
+    return objects
+
+def unique_meshes(objects):
+    """Editable mesh data-blocks of `objects`, each shared mesh only once"""
+    meshes = {}
+    for obj in objects:
+        if obj.data.library is None:
+            meshes.setdefault(obj.data.as_pointer(), (obj, obj.data))
+    return list(meshes.values())
+
+def weighted_meshes(objects):
+    """
+    Pointers of the meshes of `objects` that may carry vertex group weights.
+    A mesh is decided from its users in `objects`, only meshes that other
+    objects share as well need the one pass over the file.
+    """
+    users = {}
+    for obj in objects:
+        users.setdefault(obj.data.as_pointer(), []).append(obj)
+    weighted = {pointer for pointer, objs in users.items() if any(obj.vertex_groups for obj in objs)}
+    shared = {pointer for pointer, objs in users.items() if pointer not in weighted and objs[0].data.users > len(objs)}
+    if shared:
+        for obj in bpy.data.objects:
+            if obj.type == 'MESH' and obj.vertex_groups and obj.data.as_pointer() in shared:
+                weighted.add(obj.data.as_pointer())
+    return weighted
+
+def ensure_object_mode(context):
+    # One switch for the whole selection, edit mode changes are flushed for every object in it
+    if context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+def run_per_mesh(meshes, fn, label=None):
+    """
+    Call fn(mesh) for every (object, mesh) pair.
+    With a `label` every call is also traced as a "<label>.mesh" span.
+    Returns (results, total seconds, (slowest object name, seconds)).
+    """
+    results = []
+    slowest = ("", 0.0)
+    start = time.perf_counter()
+    for obj, mesh in meshes:
+        mesh_start = time.perf_counter()
+        results.append(fn(mesh))
+        seconds = time.perf_counter() - mesh_start
+        if label:
+            record_span(f"{label}.mesh", mesh_start, seconds, notify=False, object=obj.name)
+        if seconds > slowest[1]:
+            slowest = (obj.name, seconds)
+    return results, time.perf_counter() - start, slowest
+
+def timing_summary(count, seconds, slowest):
+    per_object = seconds / count if count else 0.0
+    return f"{count} meshes in {seconds:.2f}s ({per_object * 1000:.1f} ms/object, slowest {slowest[0]} {slowest[1] * 1000:.1f} ms)"
+
+# ------------------------------
+# Per mesh operations
+# ------------------------------
+def has_loose_edges(mesh):
+    """Edges no face uses, the bulk rebuild only recreates edges from faces"""
+    if not len(mesh.loops):
+        return len(mesh.edges) > 0
+    used = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("edge_index", used)
+    return np.count_nonzero(np.bincount(used, minlength=len(mesh.edges))) < len(mesh.edges)
+
+def needs_bmesh(mesh, weighted=None):
+    """
+    Shape keys, vertex group weights and custom split normals aren't mesh
+    attributes and loose edges aren't rebuilt, the bulk path would drop them.
+    `weighted` is the weighted_meshes() set of the selection, without it the
+    objects using the mesh are looked up in the whole file.
+    """
+    if mesh.shape_keys or mesh.has_custom_normals or has_loose_edges(mesh):
+        return True
+    if weighted is None:
+        return any(obj.vertex_groups for obj in bpy.data.objects if obj.data == mesh)
+    return mesh.as_pointer() in weighted
+
+def tris_to_quads(mesh, angle_limit, shape_threshold, weighted=None):
+    """Join triangle pairs within the face/shape angle limits (degrees), returns the removed face count"""
+    if not needs_bmesh(mesh, weighted):
+        return tris_to_quads_mesh(mesh, angle_limit, shape_threshold)
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    count = len(bm.faces)
+    bmesh.ops.join_triangles(
+        bm,
+        faces=bm.faces[:],
+        angle_face_threshold=math.radians(angle_limit),
+        angle_shape_threshold=math.radians(shape_threshold),
+    )
+    removed = count - len(bm.faces)
+    bm.to_mesh(mesh)
+    bm.free()
+    return removed
+
+def merge_vertices(mesh, distance, weighted=None):
+    """Merge by distance without Edit mode, bmesh only for meshes the bulk path can't rebuild"""
+    if needs_bmesh(mesh, weighted):
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
+        count = len(bm.verts)
+        bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=distance)
+        removed = count - len(bm.verts)
+        bm.to_mesh(mesh)
+        bm.free()
+        return removed
+    return merge_mesh_by_distance(mesh, distance)
+
+def shade_smooth(mesh):
+    mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
+    mesh.update()
+    return len(mesh.polygons)
+
+def smooth_by_angle(mesh, angle):
+    """Smooth shading with custom split normals split at `angle` (degrees), returns the vertices an Edge Split would add"""
+    mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
+    return set_smooth_normals(mesh, angle)
+
+def triangle_count(mesh):
+    totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", totals)
+    return int((totals - 2).sum())
+
+def decimate(obj, face_budget, vertex_group=None):
+    """
+    Replace the mesh of `obj` with a collapse-decimated one of at most
+    `face_budget` triangles, returns the new triangle count. Other
+    modifiers of `obj` are left in place and not applied. Vertices weighted
+    in `vertex_group` are kept from collapsing.
+    """
+    others = [(mod, mod.show_viewport) for mod in obj.modifiers]
+    for mod, _ in others:
+        mod.show_viewport = False
+    modifier = obj.modifiers.new("MeshTools Decimate", 'DECIMATE')
+    modifier.decimate_type = 'COLLAPSE'
+    modifier.ratio = min(1.0, face_budget / max(triangle_count(obj.data), 1))
+    if vertex_group:
+        # Collapse cost rises as the (inverted) weight falls, weighted vertices stay put
+        modifier.vertex_group = vertex_group
+        modifier.invert_vertex_group = True
+        modifier.vertex_group_factor = BORDER_WEIGHT_FACTOR
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph))
+    obj.modifiers.remove(modifier)
+    for mod, visible in others:
+        mod.show_viewport = visible
+
+    old_mesh = obj.data
+    name = old_mesh.name
+    obj.data = mesh
+    if old_mesh.users == 0:
+        bpy.data.meshes.remove(old_mesh)
+    mesh.name = name
+    return triangle_count(mesh)
+
+def uv_border_group(obj, name="MeshTools UV Borders"):
+    """Vertex group with weight 1 on the UV island borders and seams of `obj`, None without UVs"""
+    mesh = obj.data
+    if mesh.uv_layers.active is None:
+        return None
+    loop_verts, loop_starts, loop_totals = read_topology(mesh)
+    uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+    mesh.uv_layers.active.data.foreach_get("uv", uvs)
+    seam_flags = np.empty(len(mesh.edges), dtype=bool)
+    mesh.edges.foreach_get("use_seam", seam_flags)
+    border = uv_border_vertices(loop_verts, loop_starts, loop_totals, uvs.reshape(-1, 2),
+                                len(mesh.vertices), read_edges(mesh)[seam_flags])
+    group = obj.vertex_groups.new(name=name)
+    group.add(np.flatnonzero(border).tolist(), 1.0, 'REPLACE')
+    return group
+
+def decimated_copy(obj, face_budget, name):
+    """
+    New object next to `obj` with a collapse-decimated copy of its mesh of at
+    most `face_budget` triangles. UV island border and seam vertices are
+    weighted out of the collapse, so the copy keeps the UV layout of `obj`.
+    """
+    copy = obj.copy()
+    copy.data = obj.data.copy()
+    copy.name = name
+    copy.data.name = name
+    for collection in obj.users_collection:
+        collection.objects.link(copy)
+    group = uv_border_group(copy)
+    decimate(copy, face_budget, vertex_group=group.name if group else None)
+    if group:
+        copy.vertex_groups.remove(group)
+    return copy
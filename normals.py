@@ -0,0 +1,117 @@
+import numpy as np
+
+from .mesh_arrays import (
+    read_coords,
+    read_topology,
+    read_edges,
+    next_corner,
+    corner_faces,
+    edge_keys,
+    connected_components,
+)
+
+# ------------------------------
+# Pure NumPy core
+# ------------------------------
+def _normalize(vectors):
+    lengths = np.linalg.norm(vectors, axis=1)
+    return np.divide(vectors, lengths[:, None], out=np.zeros_like(vectors), where=lengths[:, None] > 0.0)
+
+def face_normals(coords, loop_verts, loop_starts, loop_totals):
+    """Unit polygon normals (Newell's method, also right for non-planar ngons)"""
+    coords = np.asarray(coords, dtype=np.float64)
+    coords = coords - coords.mean(axis=0) if len(coords) else coords
+    nxt = next_corner(loop_starts, loop_totals)
+    cross = np.cross(coords[loop_verts], coords[loop_verts[nxt]])
+    faces = corner_faces(loop_totals)
+    sums = np.column_stack([np.bincount(faces, cross[:, axis], minlength=len(loop_totals)) for axis in range(3)])
+    return _normalize(sums)
+
+def corner_angles(coords, loop_verts, loop_starts, loop_totals):
+    """Interior angle (radians) of every polygon corner"""
+    coords = np.asarray(coords, dtype=np.float64)
+    nxt = next_corner(loop_starts, loop_totals)
+    prev = np.empty_like(nxt)
+    prev[nxt] = np.arange(len(nxt))
+    here = coords[loop_verts]
+    u = _normalize(coords[loop_verts[nxt]] - here)
+    v = _normalize(coords[loop_verts[prev]] - here)
+    return np.arccos(np.clip(np.einsum('ij,ij->i', u, v), -1.0, 1.0))
+
+def smooth_fans(loop_verts, loop_starts, loop_totals, normals, angle, sharp_edges=None):
+    """
+    Label every corner with its smooth fan: the corners around a vertex that
+    are connected across smooth edges. An edge is smooth when exactly two
+    faces use it, the angle between their normals is at most `angle`
+    (radians) and it isn't one of the (a, b) vertex pairs in `sharp_edges`.
+    """
+    vertex_count = int(loop_verts.max()) + 1 if len(loop_verts) else 0
+    if sharp_edges is not None and len(sharp_edges):
+        vertex_count = max(vertex_count, int(sharp_edges.max()) + 1)
+    nxt = next_corner(loop_starts, loop_totals)
+    ends = loop_verts[nxt]
+    keys = edge_keys(np.column_stack((loop_verts, ends)), vertex_count)
+
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    first = np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])) if len(keys) else np.empty(0, dtype=bool)
+    counts = np.diff(np.append(np.flatnonzero(first), len(keys)))
+    # Manifold edges are the runs of exactly two corners
+    starts = np.flatnonzero(first)[counts == 2]
+    c1, c2 = order[starts], order[starts + 1]
+
+    faces = corner_faces(loop_totals)
+    cosine = np.einsum('ij,ij->i', normals[faces[c1]], normals[faces[c2]])
+    smooth = cosine >= np.cos(angle)
+    if sharp_edges is not None and len(sharp_edges):
+        smooth &= ~np.isin(keys[c1], edge_keys(sharp_edges, vertex_count))
+    c1, c2 = c1[smooth], c2[smooth]
+
+    # Join the corners sharing a vertex across the edge, for either winding
+    same = loop_verts[c1] == loop_verts[c2]
+    a = np.concatenate((c1, nxt[c1]))
+    b = np.concatenate((np.where(same, c2, nxt[c2]), np.where(same, nxt[c2], c2)))
+    return connected_components(len(loop_verts), a, b)
+
+def split_normals(coords, loop_verts, loop_starts, loop_totals, angle, sharp_edges=None):
+    """
+    Corner normals of an auto smooth by `angle` (radians): every smooth fan
+    gets the corner angle weighted average of its face normals.
+    Returns (normals (n, 3) float32, fan labels).
+    """
+    normals = face_normals(coords, loop_verts, loop_starts, loop_totals)
+    fans = smooth_fans(loop_verts, loop_starts, loop_totals, normals, angle, sharp_edges)
+    weighted = normals[corner_faces(loop_totals)] * corner_angles(coords, loop_verts, loop_starts, loop_totals)[:, None]
+    sums = np.column_stack([np.bincount(fans, weighted[:, axis], minlength=len(loop_verts)) for axis in range(3)])
+    return _normalize(sums)[fans].astype(np.float32), fans
+
+def edge_split_vertex_count(vertex_count, loop_verts, fans):
+    """Vertex count after an Edge Split modifier with the same sharp edges: one vertex per fan"""
+    used = len(np.unique(loop_verts))
+    return len(np.unique(fans)) + vertex_count - used
+
+# ------------------------------
+# Mesh data-block entry point
+# ------------------------------
+def set_smooth_normals(mesh, angle):
+    """
+    Write custom split normals smoothed by `angle` (degrees) to an Object
+    mode mesh, marked sharp edges stay sharp. Topology is not changed.
+    Returns the number of vertices an Edge Split modifier would have added.
+    """
+    coords = read_coords(mesh)
+    loop_verts, loop_starts, loop_totals = read_topology(mesh)
+    if len(loop_verts) == 0:
+        return 0
+
+    sharp_edges = None
+    sharp = mesh.attributes.get("sharp_edge")
+    if sharp is not None and sharp.domain == 'EDGE':
+        flags = np.empty(len(mesh.edges), dtype=bool)
+        sharp.data.foreach_get("value", flags)
+        sharp_edges = read_edges(mesh)[flags]
+
+    normals, fans = split_normals(coords, loop_verts, loop_starts, loop_totals, np.radians(angle), sharp_edges)
+    mesh.normals_split_custom_set(normals)
+    mesh.update()
+    return edge_split_vertex_count(len(coords), loop_verts, fans) - len(coords)
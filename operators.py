@@ -1,59 +1,55 @@
 import bpy
+import functools
 import math
 import threading
 import json
-import requests
 import os
 import time
 import queue
+from contextlib import contextmanager
+from urllib.parse import urlsplit
 from bpy_extras.io_utils import ImportHelper
+from . import analysis, bake_native, export_manifest, gltf_fast, mesh_ops
+from .profiling import (
+    peak_rss_bytes, profile_summary, record_span, recording, reset_peak_rss, rss_bytes, set_stage_listener, stage, trace_session,
+)
+from .download import DownloadCache, DownloadCancelled, DownloadQueue
+from .logbuffer import LogBuffer
+from .materials import MaterialUpdater
+from .remesh_cache import RemeshCache
 
 _status_queue = queue.Queue()
 _model_info_queue = queue.Queue()
 _log_queue = queue.Queue()
+_import_queue = queue.Queue()
+_queues = (_status_queue, _model_info_queue, _log_queue, _import_queue)
+
+# Background jobs whose threads may still post to the queues, the queue timer runs while any are active
+_active_jobs = 0
+_active_lock = threading.Lock()
+
+# Ring buffer behind the log panel, kept in memory instead of a scene property
+log_buffer = LogBuffer(capacity=1000)
+
+def report_material_update(touched, changed):
+    set_status("Material updated", f"{changed}/{touched} materials changed")
+    log(f"Material settings applied to {touched} materials ({changed} changed)")
+
+material_updater = MaterialUpdater(on_applied=report_material_update)
 
 # ------------------------------
 # Scene property update functions
 # ------------------------------
 def update_material(self, context):
-    obj = context.active_object
-    if not obj or obj.type != 'MESH':
-        return
+    # Slider drags are coalesced, the updater applies the newest values once the slider rests
+    material_updater.schedule(context)
 
-    # Create default material if none exists
-    if not obj.data.materials:
-        mat = bpy.data.materials.new(name="Material")
-        obj.data.materials.append(mat)
-
-    for mat in obj.data.materials:
-        if not mat:
-            continue
-
-        if not mat.use_nodes:
-            mat.use_nodes = True
-
-        nodes = mat.node_tree.nodes
-        links = mat.node_tree.links
-
-        # Get or create Principled BSDF
-        principled = next((n for n in nodes if n.type == 'BSDF_PRINCIPLED'), None)
-        if not principled:
-            principled = nodes.new('ShaderNodeBsdfPrincipled')
-            output = next((n for n in nodes if n.type == 'OUTPUT_MATERIAL'), None)
-            if output:
-                links.new(principled.outputs['BSDF'], output.inputs['Surface'])
-
-        # Ensure links to Metallic are removed
-        metallic_input = principled.inputs.get('Metallic')
-        if metallic_input and metallic_input.is_linked:
-            links.remove(metallic_input.links[0])
-        metallic_input.default_value = 1.0 if context.scene.material_metallic else 0.0
-
-        # Ensure links to Roughness are removed
-        roughness_input = principled.inputs.get('Roughness')
-        if roughness_input and roughness_input.is_linked:
-            links.remove(roughness_input.links[0])
-        roughness_input.default_value = context.scene.material_roughness
+def update_log_file(self, context):
+    path = bpy.path.abspath(context.scene.meshtools_log_file) if context.scene.meshtools_log_file else ""
+    try:
+        log_buffer.set_file(path)
+    except OSError as e:
+        log(f"Can't write log file {path}: {e}", 'ERROR')
 
 # ------------------------------
 # Scene properties registration
@@ -62,14 +58,24 @@ def register_scene_props():
     bpy.types.Scene.meshtools_exp_mesh_tools = bpy.props.BoolProperty(name="Expand Mesh Tools", default=True)
     bpy.types.Scene.meshtools_exp_warning = bpy.props.BoolProperty(name="Expand Warning", default=True)
     bpy.types.Scene.meshtools_exp_log = bpy.props.BoolProperty(name="Expand Log", default=True)
+    bpy.types.Scene.meshtools_exp_analysis = bpy.props.BoolProperty(name="Expand Analysis", default=False)
     bpy.types.Scene.meshtools_status = bpy.props.StringProperty(default="Ready")
     bpy.types.Scene.meshtools_progress = bpy.props.StringProperty(default="")
     bpy.types.Scene.meshtools_model_info = bpy.props.StringProperty(default="")
-    bpy.types.Scene.meshtools_log = bpy.props.StringProperty(default="")
+    bpy.types.Scene.meshtools_log_lines = bpy.props.IntProperty(name="Log Lines", default=10, min=1, max=200)
+    bpy.types.Scene.meshtools_log_file = bpy.props.StringProperty(name="Log File", subtype='FILE_PATH', default="", update=update_log_file)
     bpy.types.Scene.merge_distance = bpy.props.FloatProperty(name="Merge Distance", default=0.0001, min=0.0)
     bpy.types.Scene.quads_angle_limit = bpy.props.FloatProperty(name="Max Face Angle", default=40.0, min=0.0, max=180.0)
     bpy.types.Scene.quads_shape_threshold = bpy.props.FloatProperty(name="Max Shape Angle", default=40.0, min=0.0, max=180.0)
     bpy.types.Scene.smooth_angle = bpy.props.FloatProperty(name="Smooth Angle", default=30.0, min=0.0, max=180.0)
+    bpy.types.Scene.meshtools_smooth_mode = bpy.props.EnumProperty(
+        name="Smooth Mode",
+        items=[
+            ('EDGE_SPLIT', "Edge Split", "Edge Split modifier, duplicates the vertices along sharp edges"),
+            ('CUSTOM_NORMALS', "Custom Normals", "Write custom split normals, the topology stays unchanged"),
+        ],
+        default='EDGE_SPLIT',
+    )
     bpy.types.Scene.material_metallic = bpy.props.BoolProperty(name="Metallic", default=False, update=update_material)
     bpy.types.Scene.material_roughness = bpy.props.FloatProperty(name="Smoothness", default=0.5, min=0.0, max=1.0, update=update_material)
     bpy.types.Scene.use_mesh_symmetry = bpy.props.BoolProperty(name="Mesh Symmetry", default=True)
@@ -77,111 +83,266 @@ def register_scene_props():
     bpy.types.Scene.use_preserve_boundary = bpy.props.BoolProperty(name="Preserve Boundary", default=False)
     bpy.types.Scene.smooth_normals = bpy.props.BoolProperty(name="Smooth Normals", default=True)
     bpy.types.Scene.target_faces = bpy.props.IntProperty(name="Target Faces", default=10000, min=1)
+    bpy.types.Scene.meshtools_remesh_memory_budget = bpy.props.IntProperty(
+        name="Remesh Memory (MB)", default=8192, min=0,
+        description="Remesh a decimated proxy when QuadriFlow's estimated peak memory exceeds this, the bake still uses the full mesh. 0 disables")
+    bpy.types.Scene.meshtools_lod_budgets = bpy.props.StringProperty(name="LOD Faces", default="10000, 5000, 2500, 1250",
+                                                                     description="Comma separated face budgets, LOD0 first")
     bpy.types.Scene.meshtools_export_fbx_path = bpy.props.StringProperty(name="Export Path", subtype='FILE_PATH', default="")
+    bpy.types.Scene.meshtools_export_dir = bpy.props.StringProperty(name="Export Folder", subtype='DIR_PATH', default="",
+                                                                     description="One FBX per selected object, unchanged objects are skipped")
+    bpy.types.Scene.meshtools_texture_store = bpy.props.BoolProperty(
+        name="Texture Store", default=True,
+        description="Deduplicate exported textures by content into a 'textures' folder next to the FBX instead of copying them per export")
+    bpy.types.Scene.meshtools_export_texture_size = bpy.props.EnumProperty(
+        name="Texture Size",
+        items=[('0', "Original", "Keep the texture resolution")] +
+              [(str(size), str(size), f"Downscale larger textures to {size} px") for size in (4096, 2048, 1024, 512, 256)],
+        default='0',
+    )
+    bpy.types.Scene.meshtools_texture_variants = bpy.props.StringProperty(
+        name="Texture Variants", default="",
+        description="Comma separated extra resolutions (e.g. 1024, 512) stored as downscaled mip levels next to every exported texture")
+    bpy.types.Scene.meshtools_export_workers = bpy.props.IntProperty(name="Export Workers", default=1, min=1, max=64,
+                                                                     description="Background Blender processes for exporting, 1 exports in this session")
+    bpy.types.Scene.meshtools_cache_size = bpy.props.IntProperty(name="Download Cache (MB)", default=4096, min=64)
+    bpy.types.Scene.meshtools_download_workers = bpy.props.IntProperty(name="Parallel Downloads", default=4, min=1, max=32)
+    bpy.types.Scene.meshtools_downloads_per_host = bpy.props.IntProperty(name="Downloads per Host", default=2, min=1, max=16)
+    bpy.types.Scene.meshtools_fast_glb = bpy.props.BoolProperty(name="Fast GLB Import", default=False,
+                                                                description="Import GLB geometry directly (no textures, animation or skinning), falls back to the glTF importer when needed")
+    bpy.types.Scene.meshtools_bake_timeout = bpy.props.IntProperty(name="Bake Timeout (s)", default=900, min=10)
+    bpy.types.Scene.meshtools_bake_backend = bpy.props.EnumProperty(
+        name="Bake Backend",
+        items=[
+            ('BAKELAB', "BakeLab2", "Bake with the BakeLab2 add-on (Cycles)"),
+            ('NATIVE', "Built-in", "Bake base color and normal maps with the built-in CPU baker, no add-on needed"),
+        ],
+        default='BAKELAB',
+    )
+    bpy.types.Scene.meshtools_bake_size = bpy.props.IntProperty(name="Bake Size", default=2048, min=64, max=8192)
+    bpy.types.Scene.meshtools_bake_workers = bpy.props.IntProperty(
+        name="Bake Workers", default=0, min=0, max=64,
+        description="Background Blender processes casting the built-in baker's rays, 0 uses all cores")
+    bpy.types.Scene.meshtools_use_remesh_cache = bpy.props.BoolProperty(name="Cache Remesh Results", default=True)
+    bpy.types.Scene.meshtools_remesh_cache_size = bpy.props.IntProperty(name="Remesh Cache (MB)", default=2048, min=64)
+    bpy.types.Scene.meshtools_trace_dir = bpy.props.StringProperty(name="Trace Folder", subtype='DIR_PATH', default="",
+                                                                    description="Write a Chrome trace of every operator run into this folder")
+    bpy.types.Scene.meshtools_profile = bpy.props.BoolProperty(name="cProfile Operators", default=False,
+                                                               description="Also write a cProfile dump per operator run (temp folder when no trace folder is set)")
+    analysis.register_handlers()
 
 def unregister_scene_props():
+    material_updater.cancel()
+    analysis.unregister_handlers()
     del bpy.types.Scene.meshtools_exp_mesh_tools
     del bpy.types.Scene.meshtools_exp_warning
     del bpy.types.Scene.meshtools_exp_log
+    del bpy.types.Scene.meshtools_exp_analysis
     del bpy.types.Scene.meshtools_status
     del bpy.types.Scene.meshtools_progress
     del bpy.types.Scene.meshtools_model_info
-    del bpy.types.Scene.meshtools_log
+    del bpy.types.Scene.meshtools_log_lines
+    del bpy.types.Scene.meshtools_log_file
     del bpy.types.Scene.merge_distance
     del bpy.types.Scene.quads_angle_limit
     del bpy.types.Scene.quads_shape_threshold
     del bpy.types.Scene.smooth_angle
+    del bpy.types.Scene.meshtools_smooth_mode
     del bpy.types.Scene.material_metallic
     del bpy.types.Scene.material_roughness
     del bpy.types.Scene.target_faces
+    del bpy.types.Scene.meshtools_remesh_memory_budget
+    del bpy.types.Scene.meshtools_lod_budgets
     del bpy.types.Scene.use_mesh_symmetry
     del bpy.types.Scene.use_preserve_sharp
     del bpy.types.Scene.use_preserve_boundary
     del bpy.types.Scene.smooth_normals
     del bpy.types.Scene.meshtools_export_fbx_path
+    del bpy.types.Scene.meshtools_export_dir
+    del bpy.types.Scene.meshtools_export_workers
+    del bpy.types.Scene.meshtools_texture_store
+    del bpy.types.Scene.meshtools_export_texture_size
+    del bpy.types.Scene.meshtools_texture_variants
+    del bpy.types.Scene.meshtools_cache_size
+    del bpy.types.Scene.meshtools_download_workers
+    del bpy.types.Scene.meshtools_downloads_per_host
+    del bpy.types.Scene.meshtools_fast_glb
+    del bpy.types.Scene.meshtools_bake_timeout
+    del bpy.types.Scene.meshtools_bake_backend
+    del bpy.types.Scene.meshtools_bake_workers
+    del bpy.types.Scene.meshtools_bake_size
+    del bpy.types.Scene.meshtools_use_remesh_cache
+    del bpy.types.Scene.meshtools_remesh_cache_size
+    del bpy.types.Scene.meshtools_trace_dir
+    del bpy.types.Scene.meshtools_profile
 
 # ------------------------------
 # Model import
 # ------------------------------
+EXTENSION_FORMATS = {"glb": 'GLB', "gltf": 'GLTF', "obj": 'OBJ', "fbx": 'FBX'}
+
 def import_model_file(filepath):
+    """Import a model by its magic bytes (extension as fallback), returns False when the importer failed"""
     try:
         ext = filepath.split('.')[-1].lower()
-        if ext == "glb":
-            bpy.ops.import_scene.gltf(filepath=filepath)
-        elif ext == "obj":
-            bpy.ops.import_scene.obj(filepath=filepath)
-        elif ext == "fbx":
-            bpy.ops.import_scene.fbx(filepath=filepath)
-        else:
-            bpy.ops.import_scene.gltf(filepath=filepath)
+        file_format = gltf_fast.detect_format(filepath) or EXTENSION_FORMATS.get(ext, 'GLTF')
+        with stage("import", file=os.path.basename(filepath), format=file_format):
+            if file_format == 'GLB' and bpy.context.scene.meshtools_fast_glb and import_glb_fast(filepath):
+                pass
+            elif file_format == 'OBJ':
+                bpy.ops.import_scene.obj(filepath=filepath)
+            elif file_format == 'FBX':
+                bpy.ops.import_scene.fbx(filepath=filepath)
+            else:
+                bpy.ops.import_scene.gltf(filepath=filepath)
         set_status("Imported successfully", os.path.basename(filepath))
         log(f"Imported {os.path.basename(filepath)} successfully")
+        return True
     except Exception as e:
         set_status("Import Error", str(e))
-        log(f"Import failed: {e}")
+        log(f"Import failed: {e}", 'ERROR')
+        return False
+
+def import_glb_fast(filepath):
+    """Geometry-only GLB import, returns False when the file needs the glTF importer"""
+    try:
+        objects = gltf_fast.import_glb(filepath, bpy.context.collection)
+    except gltf_fast.UnsupportedGLB as e:
+        log(f"Fast GLB import not possible ({e}), using the glTF importer")
+        return False
+    for obj in bpy.context.selected_objects:
+        obj.select_set(False)
+    for obj in objects:
+        obj.select_set(True)
+    if objects:
+        bpy.context.view_layer.objects.active = objects[0]
+    log(f"Fast GLB import: {len(objects)} objects from {os.path.basename(filepath)}", 'DEBUG')
+    return True
 
 def duplicate_and_quadriflow_remesh(self, context):
     original_obj = context.active_object
     """
-    Complete workflow: duplicate, remesh, and bake using BakeLab2 operators
+    Complete workflow: duplicate, remesh, and bake with BakeLab2 or the built-in baker
     """
     if not original_obj or original_obj.type != 'MESH':
-        print("No mesh object selected or not a mesh.")
+        log("No mesh object selected or not a mesh", 'WARNING')
         return
 
-    print(f"Processing object: {original_obj.name}")
+    duplicate_obj = quadriflow_remesh_duplicate(context, original_obj)
+    return bake_remeshed(context, original_obj, duplicate_obj)
+
+def bake_remeshed(context, original_obj, duplicate_obj):
+    # Step 5: Set up selection for BakeLab2 baking
+    bpy.ops.object.select_all(action='DESELECT')
+    original_obj.select_set(True)      # Source object
+    duplicate_obj.select_set(True)     # Target object  
+    bpy.context.view_layer.objects.active = duplicate_obj  # Make target active
+
+    log(f"Prepared for baking: {original_obj.name} -> {duplicate_obj.name}")
+
+    # Step 6: Bake with the selected backend
+    with stage("bake"):
+        return bake_selected_to_active(context, original_obj, duplicate_obj)
+
+# QuadriFlow needs a denser input than its output, proxies never go below this many triangles per target face
+PROXY_MIN_RATIO = 4
+
+def remesh_proxy_triangles(scene, mesh, target_faces):
+    """Triangle count to decimate to before QuadriFlow, None when the full mesh fits the memory budget"""
+    budget = scene.meshtools_remesh_memory_budget * 1024 * 1024
+    triangles = mesh_ops.triangle_count(mesh)
+    _, estimate = analysis.remesh_costs.estimate(triangles, target_faces)
+    if not budget or estimate <= budget:
+        log(f"Remesh memory estimate {estimate / (1 << 20):.0f} MB for {triangles} triangles", 'DEBUG')
+        return None
+    proxy = analysis.remesh_costs.max_triangles(target_faces, budget)
+    if proxy < target_faces * PROXY_MIN_RATIO:
+        proxy = target_faces * PROXY_MIN_RATIO
+        log(f"Remesh memory budget {scene.meshtools_remesh_memory_budget} MB is too small for {target_faces} target faces", 'WARNING')
+    if proxy >= triangles:
+        return None
+    log(f"Remesh memory estimate {estimate / (1 << 20):.0f} MB exceeds the {scene.meshtools_remesh_memory_budget} MB budget, "
+        f"remeshing a {proxy} triangle proxy of {triangles}", 'WARNING')
+    return proxy
+
+def quadriflow_remesh_duplicate(context, original_obj, target_faces=None):
+    """Duplicate, remesh and unwrap `original_obj`, returns the remeshed duplicate"""
+    with recording() as recorder:
+        duplicate_obj = _remesh_duplicate(context, original_obj, target_faces)
+    log_stage_memory(recorder)
+    return duplicate_obj
+
+def _remesh_duplicate(context, original_obj, target_faces):
+    log(f"Remeshing {original_obj.name}")
 
     # Ensure we're in Object mode
     if bpy.context.object.mode != 'OBJECT':
         bpy.ops.object.mode_set(mode='OBJECT')
 
     # Step 1: Duplicate the object
-    bpy.ops.object.duplicate()
+    with stage("remesh.duplicate"):
+        bpy.ops.object.duplicate()
     duplicate_obj = bpy.context.active_object
     duplicate_obj.name = original_obj.name + "_QuadRemesh"
-    print(f"Created duplicate: {duplicate_obj.name}")
+    log(f"Created duplicate {duplicate_obj.name}", 'DEBUG')
 
     # Select the object explicitly
     bpy.context.view_layer.objects.active = duplicate_obj
     duplicate_obj.select_set(True)
         
     # Step 2: Apply transforms before remeshing
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
+    with stage("remesh.transform_apply"):
+        bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
 
-    # Step 3: QuadriFlow remesh
-    bpy.ops.object.quadriflow_remesh(
+    # Step 3: QuadriFlow remesh, restored from the cache when this exact input was remeshed before
+    settings = dict(
         mode='FACES',
         target_ratio=1.0,
-        target_faces=context.scene.target_faces,
+        target_faces=target_faces or context.scene.target_faces,
         use_mesh_symmetry=context.scene.use_mesh_symmetry,
         use_preserve_sharp=context.scene.use_preserve_sharp,
         use_preserve_boundary=context.scene.use_preserve_boundary,
         smooth_normals=context.scene.smooth_normals,
         seed=0
     )
+    # Memory guard: scans too large for QuadriFlow are remeshed from a decimated proxy
+    with stage("remesh.memory_guard"):
+        proxy_triangles = remesh_proxy_triangles(context.scene, duplicate_obj.data, settings["target_faces"])
+    key_settings = dict(settings, blender=bpy.app.version_string)
+    if proxy_triangles:
+        key_settings["proxy_triangles"] = proxy_triangles
 
-    # Step 4: Create proper UV unwrap to prevent texture mixing
-    create_bake_optimized_uvs(duplicate_obj)
-
-    # Step 5: Set up selection for BakeLab2 baking
-    bpy.ops.object.select_all(action='DESELECT')
-    original_obj.select_set(True)      # Source object
-    duplicate_obj.select_set(True)     # Target object  
-    bpy.context.view_layer.objects.active = duplicate_obj  # Make target active
+    cache = get_remesh_cache(context.scene) if context.scene.meshtools_use_remesh_cache else None
+    key = cache.mesh_key(duplicate_obj.data, key_settings) if cache else None
+    if cache and cache.restore_mesh(key, duplicate_obj.data):
+        log(f"Remesh cache hit for {original_obj.name} (hit rate {cache.hits}/{cache.hits + cache.misses}, {cache.hit_rate():.0%})")
+    else:
+        if proxy_triangles:
+            with stage("remesh.proxy", triangles=proxy_triangles):
+                mesh_ops.decimate(duplicate_obj, proxy_triangles)
+        triangles = mesh_ops.triangle_count(duplicate_obj.data)
+        rss_before = rss_bytes()
+        peak_known = reset_peak_rss()
+        start = time.perf_counter()
+        with stage("remesh.quadriflow"):
+            result = bpy.ops.object.quadriflow_remesh(**settings)
+        if 'FINISHED' in result:
+            # Calibrates the estimates shown by the analysis panel
+            analysis.remesh_costs.observe(triangles, settings["target_faces"], time.perf_counter() - start,
+                                          peak_rss_bytes() - rss_before if peak_known and rss_before else None)
+        if cache:
+            log(f"Remesh cache miss for {original_obj.name} (hit rate {cache.hits}/{cache.hits + cache.misses}, {cache.hit_rate():.0%})")
+            if 'FINISHED' in result:
+                cache.store_mesh(key, duplicate_obj.data)
 
-    print("Objects prepared for baking:")
-    print(f"  Source: {original_obj.name}")
-    print(f"  Target: {duplicate_obj.name} (active)")
-
-    # Step 6: Try to call BakeLab2
-    print("\nAttempting to call BakeLab2...")
-    
-    # Method 1: Try common BakeLab2 operator patterns
-    bake_with_bakelab2()
+    # Step 4: Create proper UV unwrap to prevent texture mixing
+    with stage("remesh.uv_unwrap"):
+        create_bake_optimized_uvs(duplicate_obj)
+    return duplicate_obj
 
 def create_bake_optimized_uvs(obj):
     """Create Smart UV Project unwrap for baking"""
-    print("Creating Smart UV Project unwrap...")
+    log(f"Creating Smart UV Project unwrap for {obj.name}", 'DEBUG')
     
     # Store selection
     original_selection = bpy.context.selected_objects[:]
@@ -204,7 +365,6 @@ def create_bake_optimized_uvs(obj):
     obj.data.uv_layers.new(name="BakeUV")
     
     # Smart UV Project (as you preferred)
-    print("  Using Smart UV Project...")
     bpy.ops.uv.smart_project(
         angle_limit=1.15,  # ~66 degrees
         island_margin=0.001,
@@ -223,65 +383,592 @@ def create_bake_optimized_uvs(obj):
             o.select_set(True)
     if original_active and original_active.name in bpy.data.objects:
         bpy.context.view_layer.objects.active = original_active
-        
-    print("  Smart UV Project completed!")
+
+# ------------------------------
+# LOD chain
+# ------------------------------
+def parse_lod_budgets(text):
+    """Face budgets from a comma separated list, largest (LOD0) first"""
+    budgets = sorted({int(value) for value in text.replace(";", ",").split(",") if value.strip()}, reverse=True)
+    if not budgets or budgets[-1] < 1:
+        raise ValueError(f"Invalid LOD face budgets: {text!r}")
+    return budgets
+
+def build_lod_chain(context, original_obj, budgets, export_path=None):
+    """
+    Remesh once at the largest budget (LOD0), derive the other levels by
+    decimating LOD0 and bake LOD0 only. Decimation keeps UV island borders,
+    so lower levels reuse LOD0's UV layout and baked material. The chain is
+    exported to `export_path` once the bake is done. Returns (lods, bake job).
+    """
+    lod0 = quadriflow_remesh_duplicate(context, original_obj, target_faces=budgets[0])
+    lod0.name = f"{original_obj.name}_LOD0"
+    lods = [lod0]
+    with stage("lod.decimate", levels=len(budgets) - 1):
+        for level, budget in enumerate(budgets[1:], 1):
+            lods.append(mesh_ops.decimated_copy(lod0, budget, f"{original_obj.name}_LOD{level}"))
+    log("LOD chain " + ", ".join(f"{lod.name} {len(lod.data.polygons)} faces" for lod in lods))
+
+    def finish(job):
+        if job.state != 'DONE':
+            log(f"LOD chain of {original_obj.name} not exported, bake failed", 'WARNING')
+            return
+        for lod in lods[1:]:
+            lod.data.materials.clear()
+            for material in lod0.data.materials:
+                lod.data.materials.append(material)
+        if export_path:
+            export_lod_chain(lods, export_path)
+
+    job = bake_remeshed(context, original_obj, lod0)
+    job.add_done_callback(finish)
+    return lods, job
+
+def export_lod_chain(lods, export_path):
+    """All levels in one FBX, the _LOD<n> suffixes let engines group them"""
+    for obj in bpy.context.selected_objects:
+        obj.select_set(False)
+    for lod in lods:
+        lod.select_set(True)
+    bpy.context.view_layer.objects.active = lods[0]
+    with stage("export.fbx", file=os.path.basename(export_path), objects=len(lods)):
+        log_texture_stats(export_manifest.export_fbx(export_path, lods))
+    set_status("LOD chain exported", os.path.basename(export_path))
+    log(f"Exported {len(lods)} LODs to {export_path}")
+
+def log_texture_stats(stats):
+    if stats:
+        log(f"Texture store: {stats['images']} images, {stats['written']} written, {stats['reused']} reused, "
+            f"{stats['bytes'] / (1024 * 1024):.1f} MB referenced")
+
+_download_cache = None
+_remesh_cache = None
+
+def cache_root():
+    """Parent directory of the MeshTools caches, MESHTOOLS_CACHE_DIR overrides the default location"""
+    return os.environ.get("MESHTOOLS_CACHE_DIR") or bpy.utils.user_resource('DATAFILES', path="meshtools", create=True)
+
+def get_download_cache(scene):
+    """Shared download cache"""
+    global _download_cache
+    if _download_cache is None:
+        _download_cache = DownloadCache(os.path.join(cache_root(), "downloads"))
+    _download_cache.max_bytes = scene.meshtools_cache_size * 1024 * 1024
+    return _download_cache
+
+def get_remesh_cache(scene):
+    """Shared QuadriFlow result cache"""
+    global _remesh_cache
+    if _remesh_cache is None:
+        _remesh_cache = RemeshCache(os.path.join(cache_root(), "remesh"))
+    _remesh_cache.max_bytes = scene.meshtools_remesh_cache_size * 1024 * 1024
+    return _remesh_cache
+
+class DownloadJob:
+    """
+    Downloads the models of a model_info list concurrently on worker threads.
+    Finished files are imported on the main thread one after another, in
+    list order, by the queue timer.
+    """
+
+    # Seconds between progress updates, the queues don't need one message per chunk
+    PROGRESS_INTERVAL = 0.2
+
+    def __init__(self, cache, entries, workers=4, per_host=2):
+        self.cache = cache
+        self.entries = entries
+        self.downloads = DownloadQueue(cache, workers=workers, per_host=per_host)
+        # Local path, or the exception of a failed download, per entry
+        self.results = [None] * len(entries)
+        self.next_import = 0
+        self.imported = 0
+        self.finished = 0
+        self.closed = False
+        self._last_progress = 0.0
+        self._lock = threading.Lock()
+
+    def start(self):
+        # Keeps the queue timer running until the last model is imported, and
+        # the downloaded files in the cache until they are imported as well
+        job_started()
+        self.cache.pin(self._urls())
+        try:
+            self._submit()
+        except Exception:
+            self.cancel()
+            self._close()
+            raise
+
+    def _submit(self):
+        set_status("Downloading", f"{len(self.entries)} models")
+        futures = {}
+        for index, entry in enumerate(self.entries):
+            url = entry["model_url"]
+            path = self.cache.lookup(url)
+            if path:
+                log(f"Using cached download for {entry['filename']}")
+                self._finish(index, path)
+                continue
+            # The same URL listed twice is downloaded once
+            future = futures.get(url)
+            if future is None:
+                log(f"Downloading {entry['filename']}")
+                future = futures[url] = self.downloads.submit(url, entry["filename"], progress=self._progress)
+            future.add_done_callback(functools.partial(self._on_done, index))
+
+    def cancel(self):
+        self.downloads.cancel()
+
+    def _urls(self):
+        return [entry["model_url"] for entry in self.entries]
+
+    def is_running(self):
+        return self.next_import < len(self.entries)
+
+    def _on_done(self, index, future):
+        try:
+            result = future.result()
+        except Exception as e:
+            result = e
+        self._finish(index, result)
+
+    def _finish(self, index, result):
+        with self._lock:
+            self.results[index] = result
+            self.finished += 1
+        _import_queue.put(self)
+
+    def _progress(self, done, total):
+        now = time.monotonic()
+        if now - self._last_progress < self.PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        mb_done = self.downloads.bytes_done / (1024 * 1024)
+        rate = self.downloads.throughput() / (1024 * 1024)
+        set_status("Downloading", f"{self.finished}/{len(self.entries)} models, {mb_done:.1f} MB at {rate:.1f} MB/s")
+
+    def import_ready(self):
+        """Import the finished models that are next in list order (main thread only)"""
+        while self.next_import < len(self.entries):
+            with self._lock:
+                result = self.results[self.next_import]
+            if result is None:
+                return
+            filename = self.entries[self.next_import]["filename"]
+            self.next_import += 1
+            if isinstance(result, DownloadCancelled):
+                log(f"Download of {filename} cancelled", 'WARNING')
+            elif isinstance(result, Exception):
+                log(f"Download of {filename} failed: {result}", 'ERROR')
+            else:
+                set_status("Importing", f"{filename} ({self.next_import}/{len(self.entries)})")
+                self.imported += import_model_file(result)
+
+        if not self._close():
+            return
+        mb_done = self.downloads.bytes_done / (1024 * 1024)
+        summary = f"{self.imported}/{len(self.entries)} models, {mb_done:.1f} MB downloaded at {self.downloads.throughput() / (1024 * 1024):.1f} MB/s"
+        set_status("Import complete" if self.imported == len(self.entries) else "Import finished with errors", summary)
+        log(f"Imported {summary}")
+
+    def _close(self):
+        """Release the download threads once, False when the job was already closed"""
+        if self.closed:
+            return False
+        self.closed = True
+        self.downloads.shutdown()
+        self.cache.unpin(self._urls())
+        job_finished()
+        return True
+
+def parse_model_info(text):
+    """model_info JSON, a single {"model_url", "filename"} object or a list of them, as a list"""
+    entries = json.loads(text)
+    if isinstance(entries, dict):
+        entries = [entries]
+    if not entries:
+        raise ValueError("model_info lists no models")
+    for entry in entries:
+        if not entry.get("model_url"):
+            raise ValueError("model_info entry without a model_url")
+        entry.setdefault("filename", os.path.basename(urlsplit(entry["model_url"]).path) or "model.glb")
+    return entries
+
+_download_job = None
+
+def download_running():
+    return _download_job is not None and _download_job.is_running()
+
+def _apply_status(scene, status, progress):
+    if status is not None:
+        scene.meshtools_status = status
+    scene.meshtools_progress = progress
+
+def on_main_thread():
+    return threading.current_thread() is threading.main_thread()
 
 def set_status(status, progress=""):
+    if bpy.app.background:
+        # No queue timer runs in background mode, write straight through. Other
+        # threads are dropped there, no panel shows the status anyway
+        if on_main_thread():
+            _apply_status(bpy.context.scene, status, progress)
+        return
     _status_queue.put((status, progress))
+    wake_queue_timer()
+
+def set_progress(progress):
+    """Update only the progress line and keep the current status"""
+    set_status(None, progress)
 
 def set_model_info(model_info):
+    """Callers on other threads need a job_started() job running, or the value waits for the next wake"""
+    if bpy.app.background:
+        if on_main_thread():
+            bpy.context.scene.meshtools_model_info = model_info
+        return
     _model_info_queue.put(model_info)
+    wake_queue_timer()
 
-def log(message):
-    _log_queue.put(message)
+def log(message, level='INFO'):
+    if bpy.app.background:
+        # No queue timer runs in background mode, write straight through
+        print(f"[MeshTools] {level}: {message}")
+        log_buffer.append(message, level)
+    else:
+        _log_queue.put((message, level))
+        wake_queue_timer()
 
-def start_queue_timer():
-    def queue_timer():
-        # Process status updates
-        try:
-            status, progress = _status_queue.get_nowait()
-            bpy.context.scene.meshtools_status = status
-            bpy.context.scene.meshtools_progress = progress
-        except queue.Empty:
-            pass
-            
-        # Process model info updates
-        try:
-            model_info = _model_info_queue.get_nowait()
-            bpy.context.scene.meshtools_model_info = model_info
-        except queue.Empty:
-            pass
-            
-        # Process log updates
+def redraw_panels():
+    wm = bpy.context.window_manager
+    for window in (wm.windows if wm else []):
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+def drain_queue(q):
+    """Everything currently waiting in `q`, without blocking"""
+    items = []
+    while True:
         try:
-            message = _log_queue.get_nowait()
-            bpy.context.scene.meshtools_log = bpy.context.scene.meshtools_log + "\n" + message
+            items.append(q.get_nowait())
         except queue.Empty:
-            pass
-            
+            return items
+
+def queue_timer():
+    scene = bpy.context.scene
+    changed = False
+
+    # Process status updates, progress-only updates keep the last status
+    statuses = drain_queue(_status_queue)
+    if statuses:
+        for status, progress in statuses:
+            _apply_status(scene, status, progress)
+        changed = True
+
+    # Process model info updates
+    model_infos = drain_queue(_model_info_queue)
+    if model_infos:
+        scene.meshtools_model_info = model_infos[-1]
+        changed = True
+
+    # Process log updates, a burst of messages lands in a single tick
+    messages = drain_queue(_log_queue)
+    if messages:
+        log_buffer.extend(messages)
+        changed = True
+
+    # Finished downloads are imported here, bpy.ops must run on the main thread
+    for job in dict.fromkeys(drain_queue(_import_queue)):
+        job.import_ready()
+        changed = True
+
+    if changed:
+        redraw_panels()
+    if _active_jobs or not all(q.empty() for q in _queues):
         return 0.1  # Return interval for next check
-    
-    bpy.app.timers.register(queue_timer, first_interval=0.1)
+    # Idle: unregister, the next message or job from the main thread starts the timer again
+    return None
+
+def wake_queue_timer():
+    """Start the queue timer unless it is running (main thread only, other threads keep it alive with job_started)"""
+    if bpy.app.background or not on_main_thread():
+        return
+    if not bpy.app.timers.is_registered(queue_timer):
+        bpy.app.timers.register(queue_timer, first_interval=0.1)
+
+def job_started():
+    """A background job that posts to the queues from other threads began (main thread)"""
+    global _active_jobs
+    with _active_lock:
+        _active_jobs += 1
+    wake_queue_timer()
+
+def job_finished():
+    global _active_jobs
+    with _active_lock:
+        _active_jobs = max(_active_jobs - 1, 0)
+
+def start_queue_timer():
+    # Flushes whatever was queued while registering, then stops again until there is work
+    wake_queue_timer()
+
+def stop_queue_timer():
+    if bpy.app.timers.is_registered(queue_timer):
+        bpy.app.timers.unregister(queue_timer)
+
+# ------------------------------
+# Tracing
+# ------------------------------
+def report_stage(name, seconds):
+    """Stage listener: the running stage, then its duration, in the progress line"""
+    set_progress(name if seconds is None else f"{name} {seconds:.2f}s")
+
+set_stage_listener(report_stage)
+
+def log_stage_memory(recorder):
+    """One log line per recorded stage with its wall time and peak RSS"""
+    for name, entry in recorder.stages.items():
+        log(f"{name}: {entry['seconds']:.2f}s, peak RSS {entry['peak_rss'] / (1 << 20):.0f} MB")
+
+@contextmanager
+def operator_trace(name, scene):
+    """
+    Span for one operator run, written as a trace (plus cProfile dump) when
+    enabled in the scene. The span isn't reported to the progress line, it
+    closes after execute and would overwrite the operator's own progress.
+    """
+    directory = bpy.path.abspath(scene.meshtools_trace_dir) if scene.meshtools_trace_dir else ""
+    if not directory and scene.meshtools_profile:
+        directory = os.path.join(bpy.app.tempdir, "meshtools_traces")
+    if not directory:
+        with stage(name, notify=False):
+            yield
+        return
+    with trace_session(directory, name.replace(".", "_"), profile=scene.meshtools_profile) as paths:
+        with stage(name, notify=False):
+            yield
+    for kind, path in sorted(paths.items()):
+        log(f"Wrote {kind} of {name} to {path}")
+    if "profile" in paths:
+        for line in profile_summary(paths["profile"], limit=5):
+            log(line, 'DEBUG')
+
+def traced(execute):
+    """Run an operator's execute inside operator_trace()"""
+    @functools.wraps(execute)
+    def wrapper(self, context):
+        with operator_trace(self.bl_idname, context.scene):
+            return execute(self, context)
+    return wrapper
+
+def bake_selected_to_active(context, source, target):
+    """Bake `source` onto `target` with the scene's bake backend, returns the finished or running job"""
+    if context.scene.meshtools_bake_backend == 'NATIVE':
+        job = NativeBakeJob(source, target, context.scene.meshtools_bake_size, context.scene.meshtools_bake_workers)
+        job.start()
+        return job
+    return bake_with_bakelab2()
 
 def bake_with_bakelab2():
+    size = bpy.context.scene.meshtools_bake_size
     while len(bpy.context.scene.BakeLabMaps) > 0:
         bpy.ops.bakelab.removemapitem()
     bpy.context.scene.BakeLabProps.bake_mode = 'TO_ACTIVE'
     bpy.context.scene.BakeLabProps.bake_margin = 2
     bpy.context.scene.BakeLabProps.anti_alias = 2
-    bpy.ops.bakelab.newmapitem(width=2048, height=2048)
+    bpy.ops.bakelab.newmapitem(width=size, height=size)
     bpy.context.scene.BakeLabMaps[0].samples = 4
 
-    bpy.ops.bakelab.newmapitem(type='Normal', width=2048, height=2048)
+    bpy.ops.bakelab.newmapitem(type='Normal', width=size, height=size)
+
+    job = BakeJob(map_count=len(bpy.context.scene.BakeLabMaps), timeout=bpy.context.scene.meshtools_bake_timeout)
+    job.start()
+    return job
+
+class DoneCallbacks:
+    """fn(job) callbacks run once a bake job is DONE or FAILED"""
+
+    def add_done_callback(self, fn):
+        callbacks = self.__dict__.setdefault("_callbacks", [])
+        if self.state in ('DONE', 'FAILED'):
+            self._call(fn)
+        else:
+            callbacks.append(fn)
+
+    def _run_callbacks(self):
+        for fn in self.__dict__.pop("_callbacks", []):
+            self._call(fn)
+
+    def _call(self, fn):
+        try:
+            fn(self)
+        except Exception as e:
+            log(f"Bake follow-up failed: {e}", 'ERROR')
+
+class BakeJob(DoneCallbacks):
+    """
+    Waits for a BakeLab2 bake to really finish before generating materials.
+
+    BAKING -> GENERATING -> DONE, or FAILED on cancel, error or timeout.
+    Completion is taken from BakeLab2's own bake state when it exposes one,
+    otherwise from the object_bake_complete handler count plus Blender's
+    OBJECT_BAKE job status.
+    """
+
+    POLL_INTERVAL = 0.25
+
+    def __init__(self, map_count, timeout):
+        self.map_count = map_count
+        self.timeout = timeout
+        self.state = 'IDLE'
+        self.error = None
+        self.timings = {}
+        self._completed_maps = 0
+        self._cancelled = False
+        self._started = 0.0
+
+    # ------------------------------
+    # Bake handlers
+    # ------------------------------
+    def _on_bake_complete(self, *args):
+        self._completed_maps += 1
+
+    def _on_bake_cancel(self, *args):
+        self._cancelled = True
+
+    def _add_handlers(self):
+        bpy.app.handlers.object_bake_complete.append(self._on_bake_complete)
+        bpy.app.handlers.object_bake_cancel.append(self._on_bake_cancel)
+
+    def _remove_handlers(self):
+        for handlers, fn in ((bpy.app.handlers.object_bake_complete, self._on_bake_complete),
+                             (bpy.app.handlers.object_bake_cancel, self._on_bake_cancel)):
+            if fn in handlers:
+                handlers.remove(fn)
+
+    # ------------------------------
+    # State machine
+    # ------------------------------
+    def start(self):
+        self.state = 'BAKING'
+        self._started = time.perf_counter()
+        self._add_handlers()
+        set_status("Baking", f"{self.map_count} maps")
+        log(f"Baking {self.map_count} maps with BakeLab2")
+        try:
+            result = bpy.ops.bakelab.bake()
+        except Exception as e:
+            self._fail(f"Bake failed: {e}")
+            return
+        if 'CANCELLED' in result:
+            self._fail("Bake was cancelled by BakeLab2")
+            return
+
+        if bpy.app.background:
+            # Bakes run synchronously without a UI and timers never fire in scripts
+            if not self._poll_once():
+                self._fail("Bake did not finish in background mode")
+        else:
+            bpy.app.timers.register(self._poll, first_interval=self.POLL_INTERVAL)
+
+    def _bake_finished(self):
+        props = bpy.context.scene.BakeLabProps
+        bake_state = getattr(props, "bake_state", None)
+        if bake_state is not None:
+            return bake_state == 'BAKED'
+        return self._completed_maps >= self.map_count and not bpy.app.is_job_running('OBJECT_BAKE')
+
+    def _poll_once(self):
+        """Advance the state machine, returns True once the job has ended"""
+        elapsed = time.perf_counter() - self._started
+        if self._cancelled:
+            self._fail("Bake cancelled")
+        elif self._bake_finished():
+            self.timings["bake"] = elapsed
+            record_span("bake.render", self._started, elapsed, maps=self.map_count)
+            log(f"Bake finished in {elapsed:.1f}s")
+            self._generate_materials()
+        elif elapsed > self.timeout:
+            self._fail(f"Bake timed out after {self.timeout}s")
+        else:
+            set_status("Baking", f"{self._completed_maps}/{self.map_count} maps, {elapsed:.0f}s")
+            return False
+        return True
+
+    def _poll(self):
+        return None if self._poll_once() else self.POLL_INTERVAL
+
+    def _generate_materials(self):
+        self.state = 'GENERATING'
+        set_status("Generating materials")
+        start = time.perf_counter()
+        try:
+            with stage("bake.materials"):
+                applyBakelabMaterials()
+        except Exception as e:
+            self._fail(f"Material generation failed: {e}")
+            return
+        self.timings["materials"] = time.perf_counter() - start
+        self.state = 'DONE'
+        self._remove_handlers()
+        total = time.perf_counter() - self._started
+        set_status("Bake complete", f"{total:.1f}s")
+        log(f"Materials generated in {self.timings['materials']:.1f}s, bake total {total:.1f}s")
+        self._run_callbacks()
+
+    def _fail(self, message):
+        self.state = 'FAILED'
+        self.error = message
+        self._remove_handlers()
+        set_status("Bake Error", message)
+        log(message, 'ERROR')
+        self._run_callbacks()
+
+class NativeBakeJob(DoneCallbacks):
+    """
+    Bake with the built-in CPU baker (bake_native).
+
+    Runs synchronously, but exposes the same state/error/timings as BakeJob
+    so callers don't need to know which backend baked.
+    """
+
+    def __init__(self, source, target, size, workers=0):
+        self.source = source
+        self.target = target
+        self.size = size
+        self.workers = workers
+        self.state = 'IDLE'
+        self.error = None
+        self.timings = {}
+
+    def start(self):
+        self.state = 'BAKING'
+        set_status("Baking", f"built-in, {self.size}px")
+        log(f"Baking {self.source.name} onto {self.target.name} with the built-in baker ({self.size}px)")
+        start = time.perf_counter()
+        try:
+            with stage("bake.native", size=self.size):
+                color_image, normal_image, self.timings = bake_native.bake_maps(
+                    self.source, self.target, size=self.size, workers=self.workers)
+            with stage("bake.materials"):
+                material_start = time.perf_counter()
+                bake_native.create_baked_material(self.target, color_image, normal_image)
+                self.timings["materials"] = time.perf_counter() - material_start
+        except Exception as e:
+            self.state = 'FAILED'
+            self.error = f"Bake failed: {e}"
+            set_status("Bake Error", self.error)
+            log(self.error, 'ERROR')
+            self._run_callbacks()
+            return
+        self.state = 'DONE'
+        total = time.perf_counter() - start
+        set_status("Bake complete", f"{total:.1f}s")
+        stages = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in self.timings.items())
+        log(f"Built-in bake finished in {total:.1f}s ({stages})")
+        self._run_callbacks()
 
-    bpy.ops.bakelab.bake()
-    
-    def timer_function():
-        applyBakelabMaterials()
-        return None
-    
-    bpy.app.timers.register(timer_function, first_interval=15)
-    
 def applyBakelabMaterials():
     bpy.ops.bakelab.generate_mats()
     #bpy.app.timers.register(applyBakelabNormalMaterial, first_interval=5)
@@ -296,24 +983,48 @@ class MeshToolsImportOperator(bpy.types.Operator, ImportHelper):
     bl_idname = "wm.meshtools_import_model"
     bl_label = "Import Model"
 
+    @traced
     def execute(self, context):
         scene = context.scene
         if not scene.meshtools_model_info:
             self.report({'ERROR'}, "No model info to import")
             return {'CANCELLED'}
-        model_info = json.loads(scene.meshtools_model_info)
-        download_url = model_info["model_url"]
-        temp_file = os.path.join(bpy.app.tempdir, model_info['filename'])
+        if download_running():
+            self.report({'WARNING'}, "A download is already running")
+            return {'CANCELLED'}
+        global _download_job
         try:
-            r = requests.get(download_url)
-            if r.status_code != 200:
-                raise Exception(f"Download failed: {r.status_code}")
-            with open(temp_file, "wb") as f:
-                f.write(r.content)
-            import_model_file(temp_file)
+            entries = parse_model_info(scene.meshtools_model_info)
+            # Download in the background, queue_timer imports the files in order as they complete
+            _download_job = DownloadJob(get_download_cache(scene), entries,
+                                        workers=scene.meshtools_download_workers, per_host=scene.meshtools_downloads_per_host)
+            _download_job.start()
         except Exception as e:
             set_status("Import Error", str(e))
-            log(f"Import failed: {e}")
+            log(f"Import failed: {e}", 'ERROR')
+        return {'FINISHED'}
+
+class MeshToolsCancelImportOperator(bpy.types.Operator):
+    bl_idname = "wm.meshtools_cancel_import"
+    bl_label = "Cancel Download"
+
+    @classmethod
+    def poll(cls, context):
+        return download_running()
+
+    @traced
+    def execute(self, context):
+        _download_job.cancel()
+        self.report({'INFO'}, "Cancelling download")
+        return {'FINISHED'}
+
+class MeshToolsClearLogOperator(bpy.types.Operator):
+    bl_idname = "wm.meshtools_clear_log"
+    bl_label = "Clear Log"
+
+    @traced
+    def execute(self, context):
+        log_buffer.clear()
         return {'FINISHED'}
 
 class MeshToolsImportLocalOperator(bpy.types.Operator, ImportHelper):
@@ -321,6 +1032,7 @@ class MeshToolsImportLocalOperator(bpy.types.Operator, ImportHelper):
     bl_label = "Import Local Model"
     filename_ext = ".glb;.obj;.fbx"
 
+    @traced
     def execute(self, context):
         filepath = self.filepath
         if not os.path.exists(filepath):
@@ -333,6 +1045,7 @@ class MeshToolsDuplicateOperator(bpy.types.Operator):
     bl_idname = "wm.meshtools_duplicate_object"
     bl_label = "Duplicate Selected Object"
 
+    @traced
     def execute(self, context):
         obj = context.active_object
         if not obj:
@@ -345,32 +1058,82 @@ class MeshToolsTrisToQuadsOperator(bpy.types.Operator):
     bl_idname = "wm.meshtools_tris_to_quads"
     bl_label = "Tris to Quads"
 
+    @traced
     def execute(self, context):
-        obj = context.active_object
-        if obj and obj.type == 'MESH':
-            bpy.ops.object.mode_set(mode='EDIT')
-            bpy.ops.mesh.select_all(action='SELECT')
-            bpy.ops.mesh.tris_convert_to_quads()
-            bpy.ops.object.mode_set(mode='OBJECT')
-            self.report({'INFO'}, "Converted tris to quads")
-        else:
+        scene = context.scene
+        objects = mesh_ops.selected_mesh_objects(context)
+        meshes = mesh_ops.unique_meshes(objects)
+        if not meshes:
             self.report({'WARNING'}, "No mesh object selected")
+            return {'FINISHED'}
+        mesh_ops.ensure_object_mode(context)
+        weighted = mesh_ops.weighted_meshes(objects)
+        results, seconds, slowest = mesh_ops.run_per_mesh(
+            meshes, lambda mesh: mesh_ops.tris_to_quads(mesh, scene.quads_angle_limit, scene.quads_shape_threshold, weighted),
+            label="tris_to_quads",
+        )
+        summary = mesh_ops.timing_summary(len(meshes), seconds, slowest)
+        log(f"Tris to quads: {sum(results)} faces joined, {summary}")
+        self.report({'INFO'}, f"Converted tris to quads on {summary}")
         return {'FINISHED'}
 
 class MeshToolsMergeVerticesOperator(bpy.types.Operator):
     bl_idname = "wm.meshtools_merge_vertices"
     bl_label = "Merge Vertices by Distance"
 
+    @traced
     def execute(self, context):
-        obj = context.active_object
-        if not obj or obj.type != 'MESH':
+        distance = context.scene.merge_distance
+        objects = mesh_ops.selected_mesh_objects(context)
+        meshes = mesh_ops.unique_meshes(objects)
+        if not meshes:
             self.report({'ERROR'}, "Select a mesh object")
             return {'CANCELLED'}
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.remove_doubles(threshold=context.scene.merge_distance)
-        bpy.ops.object.mode_set(mode='OBJECT')
-        self.report({'INFO'}, f"Merged vertices with distance {context.scene.merge_distance}")
+        mesh_ops.ensure_object_mode(context)
+        weighted = mesh_ops.weighted_meshes(objects)
+        results, seconds, slowest = mesh_ops.run_per_mesh(
+            meshes, lambda mesh: mesh_ops.merge_vertices(mesh, distance, weighted), label="merge"
+        )
+        summary = mesh_ops.timing_summary(len(meshes), seconds, slowest)
+        log(f"Merge by distance {distance}: {sum(results)} vertices removed, {summary}")
+        self.report({'INFO'}, f"Merged {sum(results)} vertices with distance {distance} on {summary}")
+        return {'FINISHED'}
+
+class MeshToolsAnalyzeOperator(bpy.types.Operator):
+    bl_idname = "wm.meshtools_analyze"
+    bl_label = "Analyze Mesh"
+    bl_description = "Face mix, non-manifold edges, duplicate vertices and remesh cost of the selected meshes"
+
+    @traced
+    def execute(self, context):
+        meshes = mesh_ops.unique_meshes(mesh_ops.selected_mesh_objects(context))
+        if not meshes:
+            self.report({'ERROR'}, "Select a mesh object")
+            return {'CANCELLED'}
+        mesh_ops.ensure_object_mode(context)
+        for _, mesh in meshes:
+            with stage("analysis.mesh", vertices=len(mesh.vertices)):
+                result = analysis.analysis_cache.analyze(mesh)
+            log(f"Analyzed {mesh.name} in {result['seconds']:.2f}s: {result['faces']} faces, "
+                f"{result['non_manifold_edges']} non-manifold edges, {result['duplicates']} near-duplicate vertices")
+        self.report({'INFO'}, f"Analyzed {len(meshes)} meshes")
+        return {'FINISHED'}
+
+class MeshToolsUseMergeSuggestionOperator(bpy.types.Operator):
+    bl_idname = "wm.meshtools_use_merge_suggestion"
+    bl_label = "Use Suggested Merge Distance"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.active_object
+        result = analysis.analysis_cache.get(obj.data) if obj and obj.type == 'MESH' else None
+        return bool(result and result["merge_distance"])
+
+    def execute(self, context):
+        distance = analysis.analysis_cache.get(context.active_object.data)["merge_distance"]
+        context.scene.merge_distance = distance
+        self.report({'INFO'}, f"Merge distance set to {distance:.6g}")
         return {'FINISHED'}
 
 class MeshToolsSmoothShadingOperator(bpy.types.Operator):
@@ -378,35 +1141,60 @@ class MeshToolsSmoothShadingOperator(bpy.types.Operator):
     bl_label = "Apply Smooth Shading"
     bl_options = {'REGISTER', 'UNDO'}
 
+    @traced
     def execute(self, context):
-        import math
-        obj = context.active_object
         scene = context.scene
-        if not obj or obj.type != 'MESH':
+        objects = mesh_ops.selected_mesh_objects(context)
+        if not objects:
             self.report({'ERROR'}, "Select a mesh object")
             return {'CANCELLED'}
+        mesh_ops.ensure_object_mode(context)
 
-        # Apply smooth shading to mesh
-        bpy.ops.object.shade_smooth()
+        # Apply smooth shading to every mesh once
+        meshes = mesh_ops.unique_meshes(objects)
+        if scene.meshtools_smooth_mode == 'CUSTOM_NORMALS':
+            saved, seconds, slowest = mesh_ops.run_per_mesh(
+                meshes, lambda mesh: mesh_ops.smooth_by_angle(mesh, scene.smooth_angle), label="shade_smooth"
+            )
+            # The normals replace the modifier, drop it where an earlier run added one
+            for obj in objects:
+                mod = obj.modifiers.get("Smooth by Angle")
+                if mod and mod.type == 'EDGE_SPLIT':
+                    obj.modifiers.remove(mod)
+            summary = mesh_ops.timing_summary(len(meshes), seconds, slowest)
+            log(f"Custom normals {scene.smooth_angle}° on {len(objects)} objects, {sum(saved)} vertices saved over Edge Split, {summary}")
+            self.report({'INFO'}, f"Applied custom normals with angle {scene.smooth_angle}°, {sum(saved)} vertices saved over Edge Split")
+            return {'FINISHED'}
 
-        # Check if Edge Split modifier already exists
-        mod = next((m for m in obj.modifiers if m.name == "Smooth by Angle"), None)
-        if not mod:
-            mod = obj.modifiers.new(name="Smooth by Angle", type='EDGE_SPLIT')
+        _, seconds, slowest = mesh_ops.run_per_mesh(meshes, mesh_ops.shade_smooth, label="shade_smooth")
 
-        # Update split angle
-        mod.split_angle = math.radians(scene.smooth_angle)
+        # Modifiers live on the objects, so every object gets its own
+        for obj in objects:
+            # Check if Edge Split modifier already exists
+            mod = next((m for m in obj.modifiers if m.name == "Smooth by Angle"), None)
+            if not mod:
+                mod = obj.modifiers.new(name="Smooth by Angle", type='EDGE_SPLIT')
 
-        self.report({'INFO'}, f"Applied smooth shading with angle {scene.smooth_angle}°")
+            # Update split angle
+            mod.split_angle = math.radians(scene.smooth_angle)
+
+        summary = mesh_ops.timing_summary(len(meshes), seconds, slowest)
+        log(f"Smooth shading {scene.smooth_angle}° on {len(objects)} objects, {summary}")
+        self.report({'INFO'}, f"Applied smooth shading with angle {scene.smooth_angle}° on {summary}")
         return {'FINISHED'}
 
 class MeshToolsMaterialOperator(bpy.types.Operator):
     bl_idname = "wm.meshtools_adjust_material"
     bl_label = "Adjust Material"
 
+    @traced
     def execute(self, context):
-        update_material(self, context)
-        self.report({'INFO'}, "Material updated")
+        if not mesh_ops.selected_mesh_objects(context):
+            self.report({'WARNING'}, "No mesh object selected")
+            return {'CANCELLED'}
+        material_updater.cancel()
+        touched, changed = material_updater.apply_selected(context)
+        self.report({'INFO'}, f"Updated {touched} materials ({changed} changed)")
         return {'FINISHED'}
 
 class MeshToolsBakeOperator(bpy.types.Operator):
@@ -414,16 +1202,47 @@ class MeshToolsBakeOperator(bpy.types.Operator):
     bl_label = "Remesh + Bake"
     bl_options = {'REGISTER', 'UNDO'}
 
+    @traced
     def execute(self, context):
         duplicate_and_quadriflow_remesh(self, context)
         self.report({'INFO'}, "Material updated")
         return {'FINISHED'}
 
+class MeshToolsLODChainOperator(bpy.types.Operator):
+    bl_idname = "wm.meshtools_lod_chain"
+    bl_label = "Remesh + Bake LOD Chain"
+    bl_description = "Remesh once at the largest LOD budget, decimate the lower LODs from it, bake LOD0 and export all levels"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    export: bpy.props.BoolProperty(name="Export FBX", default=True)
+
+    @traced
+    def execute(self, context):
+        scene = context.scene
+        original_obj = context.active_object
+        if not original_obj or original_obj.type != 'MESH':
+            self.report({'WARNING'}, "No mesh object selected")
+            return {'CANCELLED'}
+        try:
+            budgets = parse_lod_budgets(scene.meshtools_lod_budgets)
+            export_manifest.texture_variants(scene)
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        export_path = None
+        if self.export:
+            export_path = bpy.path.abspath(scene.meshtools_export_fbx_path) if scene.meshtools_export_fbx_path \
+                else os.path.join(bpy.app.tempdir, f"{original_obj.name}_LODs.fbx")
+        lods, _ = build_lod_chain(context, original_obj, budgets, export_path)
+        self.report({'INFO'}, f"Built {len(lods)} LODs from one remesh")
+        return {'FINISHED'}
+
 class MeshToolsExportFBXOperator(bpy.types.Operator):
     bl_idname = "wm.meshtools_export_fbx"
     bl_label = "Export as FBX"
     bl_options = {'REGISTER', 'UNDO'}
 
+    @traced
     def execute(self, context):
         obj = context.active_object
         if not obj:
@@ -439,6 +1258,7 @@ class MeshToolsQuickExportFBXOperator(bpy.types.Operator):
     bl_label = "Quick Export FBX"
     bl_options = {'REGISTER', 'UNDO'}
 
+    @traced
     def execute(self, context):
         obj = context.active_object
         if not obj:
@@ -448,6 +1268,11 @@ class MeshToolsQuickExportFBXOperator(bpy.types.Operator):
         # Get the export path from scene properties or use default
         scene = context.scene
         export_path = scene.meshtools_export_fbx_path
+        try:
+            export_manifest.texture_variants(scene)
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
         
         # If no export path is set, use a default location
         if not export_path:
@@ -455,31 +1280,67 @@ class MeshToolsQuickExportFBXOperator(bpy.types.Operator):
             export_path = os.path.join(bpy.app.tempdir, f"{obj.name}.fbx")
         
         # Export the object to FBX
-        bpy.ops.export_scene.fbx(
-            filepath=export_path,
-            use_selection=True,
-            apply_scale_options='FBX_SCALE_ALL',
-            bake_space_transform=False,
-            use_mesh_modifiers=True,
-            add_leaf_bones=False,
-            path_mode='COPY'
-        )
+        with stage("export.fbx", file=os.path.basename(export_path)):
+            log_texture_stats(export_manifest.export_fbx(export_path, list(context.selected_objects)))
         
         self.report({'INFO'}, f"Exported {obj.name} to {export_path}")
         return {'FINISHED'}
 
+class MeshToolsExportChangedOperator(bpy.types.Operator):
+    bl_idname = "wm.meshtools_export_changed"
+    bl_label = "Export Changed Objects"
+    bl_description = "Export every selected object to its own FBX, skipping objects unchanged since the last export"
+
+    force: bpy.props.BoolProperty(name="Export All", default=False, description="Ignore the manifest and export everything")
+
+    @traced
+    def execute(self, context):
+        scene = context.scene
+        objects = list(context.selected_objects)
+        if not objects:
+            self.report({'WARNING'}, "No object selected")
+            return {'CANCELLED'}
+        if not scene.meshtools_export_dir:
+            self.report({'ERROR'}, "Set an export folder first")
+            return {'CANCELLED'}
+        try:
+            export_manifest.texture_variants(scene)
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        directory = bpy.path.abspath(scene.meshtools_export_dir)
+        mesh_ops.ensure_object_mode(context)
+
+        with stage("export.changed", objects=len(objects)):
+            exported, skipped, failed = export_manifest.export_changed(
+                objects, directory, workers=scene.meshtools_export_workers, force=self.force
+            )
+        for name, error in failed.items():
+            log(f"Export of {name} failed: {error}", 'ERROR')
+        summary = f"{len(exported)} exported, {len(skipped)} unchanged, {len(failed)} failed"
+        set_status("Export complete" if not failed else "Export Error", summary)
+        log(f"Export to {directory}: {summary}")
+        self.report({'WARNING'} if failed else {'INFO'}, summary)
+        return {'FINISHED'}
+
 # ------------------------------
 # Operator classes list
 # ------------------------------
 classes = [
     MeshToolsImportOperator,
+    MeshToolsCancelImportOperator,
     MeshToolsImportLocalOperator,
     MeshToolsDuplicateOperator,
     MeshToolsTrisToQuadsOperator,
     MeshToolsMergeVerticesOperator,
+    MeshToolsAnalyzeOperator,
+    MeshToolsUseMergeSuggestionOperator,
     MeshToolsSmoothShadingOperator,
     MeshToolsMaterialOperator,
     MeshToolsBakeOperator,
+    MeshToolsLODChainOperator,
     MeshToolsExportFBXOperator,
-    MeshToolsQuickExportFBXOperator
+    MeshToolsQuickExportFBXOperator,
+    MeshToolsExportChangedOperator,
+    MeshToolsClearLogOperator
 ]
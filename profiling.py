@@ -0,0 +1,234 @@
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# ------------------------------
+# Peak memory
+# ------------------------------
+def _read_proc_status(field):
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+def peak_rss_bytes():
+    """Peak resident set size of this process since the last reset_peak_rss()"""
+    peak = _read_proc_status("VmHWM")
+    if peak is not None:
+        return peak
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+def rss_bytes():
+    """Current resident set size, 0 where it can't be read"""
+    return _read_proc_status("VmRSS") or 0
+
+def reset_peak_rss():
+    """
+    Reset the peak so the next reading only covers what follows.
+    Only Linux supports this, elsewhere the peak stays process wide.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+# ------------------------------
+# Stage recording
+# ------------------------------
+class StageRecorder:
+    """Collects wall time and peak RSS of every stage() entered while it is installed"""
+
+    def __init__(self):
+        self.stages = {}
+        # Peak seen by each open stage before its children reset the counter
+        self._open = []
+
+    def add(self, name, seconds, peak_rss):
+        entry = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0, "peak_rss": 0})
+        entry["seconds"] += seconds
+        entry["calls"] += 1
+        entry["peak_rss"] = max(entry["peak_rss"], peak_rss)
+
+    def merge(self, other):
+        """Fold the stages of `other`, recorded while this one was set aside, into this one"""
+        for name, entry in other.stages.items():
+            mine = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0, "peak_rss": 0})
+            mine["seconds"] += entry["seconds"]
+            mine["calls"] += entry["calls"]
+            mine["peak_rss"] = max(mine["peak_rss"], entry["peak_rss"])
+        if self._open and other.stages:
+            self._open[-1] = max(self._open[-1], max(entry["peak_rss"] for entry in other.stages.values()))
+
+class Tracer:
+    """Stages as Chrome trace complete events, viewable in chrome://tracing or ui.perfetto.dev"""
+
+    def __init__(self):
+        self.events = []
+        self.pid = os.getpid()
+        self._origin = time.perf_counter()
+
+    def add(self, name, start, seconds, args=None):
+        event = {
+            "name": name,
+            "cat": name.split(".", 1)[0],
+            "ph": "X",
+            "ts": round((start - self._origin) * 1e6, 1),
+            "dur": round(seconds * 1e6, 1),
+            "pid": self.pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+_recorder = None
+_tracer = None
+_listener = None
+
+def install_recorder(recorder):
+    """Start recording stages into `recorder`, None stops recording. Returns the previous one."""
+    global _recorder
+    previous = _recorder
+    _recorder = recorder
+    return previous
+
+def install_tracer(tracer):
+    """Start tracing stages into `tracer`, None stops tracing. Returns the previous one."""
+    global _tracer
+    previous = _tracer
+    _tracer = tracer
+    return previous
+
+@contextmanager
+def recording():
+    """Record the stages inside the block into a new StageRecorder (yielded), an installed recorder still gets them"""
+    recorder = StageRecorder()
+    previous = install_recorder(recorder)
+    try:
+        yield recorder
+    finally:
+        install_recorder(previous)
+        if previous is not None:
+            previous.merge(recorder)
+
+def set_stage_listener(listener):
+    """
+    listener(name, seconds) is called when a stage starts (seconds is None)
+    and when it ends, e.g. to show progress in the UI.
+    """
+    global _listener
+    _listener = listener
+
+@contextmanager
+def stage(name, notify=True, **args):
+    """
+    Time a named stage of a workflow, costs next to nothing while nothing is recording.
+    notify=False keeps the stage away from the listener, like record_span.
+    """
+    recorder, tracer, listener = _recorder, _tracer, _listener if notify else None
+    if listener is not None:
+        listener(name, None)
+    if recorder is None and tracer is None:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if listener is not None:
+                listener(name, time.perf_counter() - start)
+        return
+    if recorder is not None:
+        if recorder._open:
+            recorder._open[-1] = max(recorder._open[-1], peak_rss_bytes())
+        reset_peak_rss()
+        recorder._open.append(0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        if recorder is not None:
+            peak = max(peak_rss_bytes(), recorder._open.pop())
+            if recorder._open:
+                recorder._open[-1] = max(recorder._open[-1], peak)
+            recorder.add(name, seconds, peak)
+            args["peak_rss_mb"] = round(peak / (1 << 20), 1)
+        if tracer is not None:
+            tracer.add(name, start, seconds, args)
+        if listener is not None:
+            listener(name, seconds)
+
+def record_span(name, start, seconds, notify=True, **args):
+    """
+    Add a stage that was timed elsewhere, e.g. work finished by a timer callback.
+    notify=False keeps high frequency spans (one per mesh) away from the listener.
+    """
+    if _recorder is not None:
+        _recorder.add(name, seconds, 0)
+    if _tracer is not None:
+        _tracer.add(name, start, seconds, args)
+    if notify and _listener is not None:
+        _listener(name, seconds)
+
+# ------------------------------
+# Trace sessions
+# ------------------------------
+@contextmanager
+def trace_session(directory, name, profile=False):
+    """
+    Trace every stage inside the block to `directory`/<name>-<time>.trace.json
+    and with `profile` also write a cProfile dump next to it. Nested sessions
+    fold into the outer one. Yields a dict that receives the written paths.
+    """
+    paths = {}
+    if _tracer is not None and not profile:
+        yield paths
+        return
+    tracer = Tracer() if _tracer is None else None
+    previous = install_tracer(tracer) if tracer else None
+    profiler = cProfile.Profile() if profile else None
+    base = os.path.join(directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}")
+    if profiler:
+        profiler.enable()
+    try:
+        yield paths
+    finally:
+        if profiler:
+            profiler.disable()
+            paths["profile"] = base + ".prof"
+            os.makedirs(directory, exist_ok=True)
+            profiler.dump_stats(paths["profile"])
+        if tracer:
+            install_tracer(previous)
+            paths["trace"] = base + ".trace.json"
+            tracer.write(paths["trace"])
+
+def profile_summary(path, limit=10):
+    """The `limit` most expensive functions by cumulative time from a cProfile dump"""
+    stats = pstats.Stats(path)
+    stats.sort_stats("cumulative")
+    lines = []
+    for (filename, line, function), (_, calls, _, cumulative, _) in list(stats.stats.items()):
+        lines.append((cumulative, f"{cumulative:8.3f}s {calls:>8} {function} ({os.path.basename(filename)}:{line})"))
+    return [text for _, text in sorted(lines, reverse=True)[:limit]]
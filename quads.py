@@ -0,0 +1,181 @@
+import numpy as np
+
+from .mesh_arrays import (
+    read_coords,
+    read_topology,
+    next_corner,
+    edge_keys,
+    rebuild_mesh,
+)
+
+# UV coordinates closer than this count as the same, anything else is a seam
+_UV_EPSILON = 1e-5
+
+# ------------------------------
+# Pure NumPy core
+# ------------------------------
+def _angle_between(u, v):
+    dot = np.einsum('ij,ij->i', u, v)
+    norms = np.linalg.norm(u, axis=1) * np.linalg.norm(v, axis=1)
+    return np.degrees(np.arccos(np.clip(dot / np.maximum(norms, 1e-30), -1.0, 1.0)))
+
+def candidate_pairs(coords, loop_verts, loop_starts, loop_totals, angle_limit, shape_threshold,
+                    corner_uvs=(), face_materials=None):
+    """
+    Score every triangle pair that could be joined into a quad.
+
+    Two triangles qualify when they share a manifold, consistently wound
+    edge, lie on the same material and UV island across that edge, the angle
+    between their normals is at most `angle_limit` degrees and every corner
+    of the resulting (convex) quad is within `shape_threshold` degrees of 90.
+
+    Returns (face_a, face_b, quad_corners, score): quad_corners holds the
+    four source corners of each quad in winding order, lower scores are
+    better pairs.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    tris = np.flatnonzero(loop_totals == 3)
+    empty = (np.empty(0, np.int64), np.empty(0, np.int64), np.empty((0, 4), np.int64), np.empty(0))
+    if len(tris) < 2:
+        return empty
+
+    # Edge use counts over all faces, only edges with exactly two users can be joined
+    all_keys = edge_keys(np.column_stack((loop_verts, loop_verts[next_corner(loop_starts, loop_totals)])), len(coords))
+    unique_keys, key_counts = np.unique(all_keys, return_counts=True)
+
+    # Triangle corners (T, 3) and their edges: edge k runs from corner k to corner k+1
+    corners = loop_starts[tris][:, None] + np.arange(3)
+    verts = loop_verts[corners]
+    tri_keys = edge_keys(np.column_stack((verts.ravel(), np.roll(verts, -1, axis=1).ravel())), len(coords))
+    manifold = key_counts[np.searchsorted(unique_keys, tri_keys)] == 2
+
+    edge_ids = np.flatnonzero(manifold)
+    order = edge_ids[np.argsort(tri_keys[edge_ids], kind='stable')]
+    sorted_keys = tri_keys[order]
+    shared = np.flatnonzero(sorted_keys[1:] == sorted_keys[:-1])
+    e1, e2 = order[shared], order[shared + 1]
+    t1, k1 = np.divmod(e1, 3)
+    t2, k2 = np.divmod(e2, 3)
+
+    # a -> b in the first triangle must be b -> a in the second, otherwise normals disagree
+    a, b = verts[t1, k1], verts[t1, (k1 + 1) % 3]
+    consistent = (verts[t2, k2] == b) & (verts[t2, (k2 + 1) % 3] == a)
+    t1, k1, t2, k2 = t1[consistent], k1[consistent], t2[consistent], k2[consistent]
+    if len(t1) == 0:
+        return empty
+
+    # Quad a, c2, b, c1 keeps the winding of both triangles
+    quad_corners = np.column_stack((
+        corners[t1, k1],
+        corners[t2, (k2 + 2) % 3],
+        corners[t1, (k1 + 1) % 3],
+        corners[t1, (k1 + 2) % 3],
+    ))
+    keep = np.ones(len(t1), dtype=bool)
+
+    # Seams: material changes and UV discontinuities across the shared edge
+    if face_materials is not None:
+        keep &= face_materials[tris[t1]] == face_materials[tris[t2]]
+    for uvs in corner_uvs:
+        same_a = np.abs(uvs[corners[t1, k1]] - uvs[corners[t2, (k2 + 1) % 3]]).max(axis=1) <= _UV_EPSILON
+        same_b = np.abs(uvs[corners[t1, (k1 + 1) % 3]] - uvs[corners[t2, k2]]).max(axis=1) <= _UV_EPSILON
+        keep &= same_a & same_b
+
+    # Dihedral angle between the two triangle normals
+    p = coords[loop_verts[quad_corners]]
+    a_, c2, b_, c1 = p[:, 0], p[:, 1], p[:, 2], p[:, 3]
+    n1 = np.cross(b_ - a_, c1 - a_)
+    n2 = np.cross(a_ - b_, c2 - b_)
+    face_angle = _angle_between(n1, n2)
+    keep &= face_angle <= angle_limit
+
+    # Shape: corner angles of the quad, convex and close to square
+    normal = n1 + n2
+    shape_error = np.zeros(len(t1))
+    for i in range(4):
+        prev_edge = p[:, (i - 1) % 4] - p[:, i]
+        next_edge = p[:, (i + 1) % 4] - p[:, i]
+        keep &= np.einsum('ij,ij->i', np.cross(next_edge, prev_edge), normal) > 0.0
+        shape_error = np.maximum(shape_error, np.abs(_angle_between(prev_edge, next_edge) - 90.0))
+    keep &= shape_error <= shape_threshold
+
+    score = face_angle / max(angle_limit, 1e-6) + shape_error / max(shape_threshold, 1e-6)
+    return tris[t1][keep], tris[t2][keep], quad_corners[keep], score[keep]
+
+def greedy_pairs(face_a, face_b, score, face_count):
+    """
+    Pick non-overlapping pairs, best score first.
+
+    Every round accepts all pairs that are the best remaining choice for both
+    of their faces, which gives the same result as a sequential greedy pass
+    but stays vectorized.
+    """
+    rank = np.empty(len(score), dtype=np.int64)
+    rank[np.lexsort((np.arange(len(score)), score))] = np.arange(len(score))
+    remaining = np.arange(len(score))
+    used = np.zeros(face_count, dtype=bool)
+    chosen = []
+    while len(remaining):
+        r = rank[remaining]
+        best = np.full(face_count, len(score), dtype=np.int64)
+        np.minimum.at(best, face_a[remaining], r)
+        np.minimum.at(best, face_b[remaining], r)
+        winners = remaining[(best[face_a[remaining]] == r) & (best[face_b[remaining]] == r)]
+        chosen.append(winners)
+        used[face_a[winners]] = True
+        used[face_b[winners]] = True
+        remaining = remaining[~(used[face_a[remaining]] | used[face_b[remaining]])]
+    return np.sort(np.concatenate(chosen)) if chosen else np.empty(0, dtype=np.int64)
+
+def join_pairs(loop_starts, loop_totals, face_a, face_b, quad_corners):
+    """
+    New topology with every (face_a, face_b) pair replaced by its quad, which
+    takes the place of face_a. Returns (loop_starts, corner_src, face_src).
+    """
+    face_count = len(loop_totals)
+    keep_face = np.ones(face_count, dtype=bool)
+    keep_face[face_b] = False
+    face_src = np.flatnonzero(keep_face)
+
+    quad_of_face = np.full(face_count, -1, dtype=np.int64)
+    quad_of_face[face_a] = np.arange(len(face_a))
+    totals = loop_totals[face_src].copy()
+    is_quad = quad_of_face[face_src] >= 0
+    totals[is_quad] = 4
+    starts = np.concatenate(([0], np.cumsum(totals)[:-1])) if len(totals) else totals
+
+    corner_src = np.empty(int(totals.sum()), dtype=np.int64)
+    plain = face_src[~is_quad]
+    plain_totals = loop_totals[plain]
+    offsets = np.arange(int(plain_totals.sum())) - np.repeat(np.cumsum(plain_totals) - plain_totals, plain_totals)
+    corner_src[np.repeat(starts[~is_quad], plain_totals) + offsets] = np.repeat(loop_starts[plain], plain_totals) + offsets
+    quad_starts = starts[is_quad]
+    corner_src[quad_starts[:, None] + np.arange(4)] = quad_corners[quad_of_face[face_src[is_quad]]]
+    return starts, corner_src, face_src
+
+# ------------------------------
+# Mesh data-block entry point
+# ------------------------------
+def tris_to_quads_mesh(mesh, angle_limit, shape_threshold):
+    """Join triangle pairs of an Object mode mesh in place, returns the number of removed faces"""
+    coords = read_coords(mesh)
+    loop_verts, loop_starts, loop_totals = read_topology(mesh)
+    corner_uvs = []
+    for layer in mesh.uv_layers:
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        layer.data.foreach_get("uv", uvs)
+        corner_uvs.append(uvs.reshape(-1, 2))
+    materials = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", materials)
+
+    face_a, face_b, quad_corners, score = candidate_pairs(
+        coords, loop_verts, loop_starts, loop_totals, angle_limit, shape_threshold, corner_uvs, materials
+    )
+    chosen = greedy_pairs(face_a, face_b, score, len(loop_totals))
+    if len(chosen) == 0:
+        return 0
+
+    starts, corner_src, face_src = join_pairs(loop_starts, loop_totals, face_a[chosen], face_b[chosen], quad_corners[chosen])
+    identity = np.arange(len(coords))
+    rebuild_mesh(mesh, coords, loop_verts[corner_src], starts, identity, corner_src, face_src, identity)
+    return len(chosen)
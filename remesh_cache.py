@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .mesh_arrays import read_coords, read_topology, write_mesh
+
+# Bump when the stored layout changes, old entries then simply miss
+CACHE_FORMAT = 1
+
+class RemeshCache:
+    """
+    On-disk cache of QuadriFlow results.
+
+    Entries are keyed by a hash of the input vertex/face buffers plus every
+    remesh setting, and stored as uncompressed .npz files (float32 positions,
+    int32 topology, per-face smooth flags). Least recently used entries are
+    removed once the directory grows beyond `max_bytes`.
+    """
+
+    def __init__(self, root, max_bytes=2 << 30):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def key(coords, loop_verts, loop_starts, settings):
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(json.dumps({"format": CACHE_FORMAT, **settings}, sort_keys=True).encode("utf-8"))
+        for array in (coords, loop_verts, loop_starts):
+            array = np.ascontiguousarray(array)
+            digest.update(str(array.shape).encode("ascii"))
+            digest.update(memoryview(array).cast("B"))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.root, key + ".npz")
+
+    def load(self, key):
+        """(coords, loop_verts, loop_starts, smooth) for `key`, or None on a miss"""
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                entry = data["coords"], data["loop_verts"], data["loop_starts"], data["smooth"]
+        except (OSError, KeyError, ValueError):
+            self.misses += 1
+            return None
+        # The file's mtime doubles as its LRU timestamp
+        os.utime(path)
+        self.hits += 1
+        return entry
+
+    def store(self, key, coords, loop_verts, loop_starts, smooth):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, coords=coords, loop_verts=loop_verts, loop_starts=loop_starts, smooth=smooth)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith(".npz"):
+                stat = os.stat(os.path.join(self.root, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries)[:-1]:
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.root, name))
+            total -= size
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    # ------------------------------
+    # Mesh data-blocks
+    # ------------------------------
+    def mesh_key(self, mesh, settings):
+        loop_verts, loop_starts, _ = read_topology(mesh)
+        return self.key(read_coords(mesh), loop_verts, loop_starts, settings)
+
+    def restore_mesh(self, key, mesh):
+        """Replace the geometry of `mesh` with the cached result, returns False on a miss"""
+        entry = self.load(key)
+        if entry is None:
+            return False
+        coords, loop_verts, loop_starts, smooth = entry
+        write_mesh(mesh, coords, loop_verts, loop_starts)
+        mesh.polygons.foreach_set("use_smooth", smooth)
+        mesh.update()
+        return True
+
+    def store_mesh(self, key, mesh):
+        loop_verts, loop_starts, _ = read_topology(mesh)
+        smooth = np.empty(len(mesh.polygons), dtype=bool)
+        mesh.polygons.foreach_get("use_smooth", smooth)
+        self.store(key, read_coords(mesh), loop_verts, loop_starts, smooth)
@@ -0,0 +1,18 @@
+"""
+The tests cover the Blender-free cores and run with plain pytest:
+
+    python -m pytest tests
+
+The add-on's __init__ needs bpy, so the modules are imported through a bare
+`meshtools` package that skips it.
+"""
+import os
+import sys
+import types
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if "meshtools" not in sys.modules:
+    package = types.ModuleType("meshtools")
+    package.__path__ = [ADDON_DIR]
+    sys.modules["meshtools"] = package
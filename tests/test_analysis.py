@@ -0,0 +1,54 @@
+import numpy as np
+
+from meshtools.analysis import RemeshCostModel, distance_histogram, edge_usage, nearest_distances, suggest_merge_distance
+
+def quad_strip(count):
+    """`count` unit quads in a row: (loop_verts, loop_starts, loop_totals, edges)"""
+    bottom = np.arange(count)
+    quads = np.column_stack((bottom, bottom + 1, bottom + count + 2, bottom + count + 1))
+    edges = {tuple(sorted((a, b))) for quad in quads.tolist() for a, b in zip(quad, quad[1:] + quad[:1])}
+    return quads.ravel(), np.arange(0, 4 * count, 4), np.full(count, 4), np.array(sorted(edges))
+
+def test_edge_usage_counts_boundary_and_non_manifold_edges():
+    loop_verts, loop_starts, loop_totals, edges = quad_strip(3)
+    # 3 quads in a row: 10 edges, the 2 inner ones shared
+    assert edge_usage(loop_verts, loop_starts, loop_totals, edges, 8) == (8, 0)
+
+    # A third quad on the middle edge makes it non-manifold, a wire edge counts too
+    fin = np.array([1, 5, 9, 8])
+    loop_verts = np.concatenate((loop_verts, fin))
+    edges = np.concatenate((edges, [[1, 8], [8, 9], [5, 9], [10, 11]]))
+    boundary, non_manifold = edge_usage(loop_verts, np.arange(0, 16, 4), np.full(4, 4), edges, 12)
+    assert non_manifold == 2
+    assert boundary == 11
+
+def test_edge_usage_without_faces():
+    assert edge_usage(np.empty(0, int), np.empty(0, int), np.empty(0, int), np.array([[0, 1]]), 2) == (0, 1)
+
+def test_distance_histogram_bins_by_edge_length():
+    nearest = np.array([0.0, 0.0, 5e-5, 5e-4, 5e-3, 5e-2, 0.5, np.inf])
+    histogram = distance_histogram(nearest, 1.0)
+    assert [count for _, count in histogram] == [3, 1, 1, 1, 2]
+    assert histogram[-1][0] == float('inf')
+
+def test_suggest_merge_distance_stops_at_the_gap():
+    rng = np.random.default_rng(0)
+    grid = np.stack(np.meshgrid(np.arange(10.0), np.arange(10.0), [0.0]), axis=-1).reshape(-1, 3)
+    duplicates = grid[:20] + rng.normal(0.0, 1e-5, (20, 3))
+    coords = np.concatenate((grid, duplicates))
+    nearest = nearest_distances(coords, 0.1)
+    distance = suggest_merge_distance(nearest, 1.0)
+    assert distance is not None
+    assert np.count_nonzero(nearest <= distance) == 40
+    assert distance < 0.1
+
+def test_suggest_merge_distance_without_duplicates():
+    grid = np.stack(np.meshgrid(np.arange(5.0), np.arange(5.0), [0.0]), axis=-1).reshape(-1, 3)
+    assert suggest_merge_distance(nearest_distances(grid, 0.1), 1.0) is None
+
+def test_remesh_cost_model_observe_scales_estimates():
+    model = RemeshCostModel()
+    seconds, peak = model.estimate(100_000, 5_000)
+    model.observe(100_000, 5_000, seconds * 2.0, peak * 3)
+    assert np.isclose(model.estimate(100_000, 5_000)[0], seconds * 2.0)
+    assert model.max_triangles(5_000, model.estimate(100_000, 5_000)[1]) in range(99_990, 100_010)
@@ -0,0 +1,168 @@
+"""DownloadCache and DownloadQueue against a local http.server stand-in"""
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from meshtools import download
+from meshtools.download import DownloadCache, DownloadCancelled, DownloadError, DownloadQueue
+
+class FileHandler(BaseHTTPRequestHandler):
+    """Serves server.files with ETags and single byte ranges (If-Range aware)"""
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        if self.path in self.server.failures:
+            self.server.failures[self.path] -= 1
+            if not self.server.failures[self.path]:
+                del self.server.failures[self.path]
+            self.send_error(503)
+            return
+        body = self.server.files.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        start = 0
+        byte_range = self.headers.get("Range")
+        if byte_range and self.headers.get("If-Range", etag) == etag:
+            start = int(byte_range.split("=")[1].split("-")[0])
+            if start >= len(body):
+                self.send_response(416)
+                self.end_headers()
+                return
+        self.send_response(206 if start else 200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body) - start))
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        self.end_headers()
+        self.wfile.write(body[start:])
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FileHandler)
+    httpd.files, httpd.requests, httpd.failures = {}, [], {}
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def payload(size, seed=0):
+    return bytes((i * 31 + seed) % 251 for i in range(size))
+
+def test_fetch_stores_by_content_hash(server, tmp_path):
+    body = payload(100_000)
+    server.files["/model.glb"] = body
+    cache = DownloadCache(str(tmp_path))
+    path = cache.fetch(server.url + "/model.glb", "model.glb")
+    sha256 = hashlib.sha256(body).hexdigest()
+    assert os.path.basename(path) == sha256 + ".glb"
+    with open(path, "rb") as f:
+        assert f.read() == body
+
+def test_cache_hit_skips_the_network(server, tmp_path):
+    server.files["/model.glb"] = payload(1000)
+    cache = DownloadCache(str(tmp_path))
+    first = cache.fetch(server.url + "/model.glb", "model.glb")
+    assert cache.lookup(server.url + "/model.glb") == first
+    assert cache.fetch(server.url + "/model.glb", "model.glb") == first
+    assert len(server.requests) == 1
+
+def test_same_content_is_stored_once(server, tmp_path):
+    server.files["/a.glb"] = server.files["/b.glb"] = payload(1000)
+    cache = DownloadCache(str(tmp_path))
+    assert cache.fetch(server.url + "/a.glb", "a.glb") == cache.fetch(server.url + "/b.glb", "b.glb")
+
+def test_cancelled_download_resumes_with_range(server, tmp_path):
+    body = payload(4 * download.CHUNK_SIZE, seed=3)
+    server.files["/big.glb"] = body
+    cache = DownloadCache(str(tmp_path))
+    cancel = threading.Event()
+    with pytest.raises(DownloadCancelled):
+        cache.fetch(server.url + "/big.glb", "big.glb", progress=lambda done, total: cancel.set(), cancel=cancel)
+    assert cache.lookup(server.url + "/big.glb") is None
+
+    progress = []
+    path = cache.fetch(server.url + "/big.glb", "big.glb", progress=lambda done, total: progress.append((done, total)))
+    headers = server.requests[-1][1]
+    assert headers["Range"] == f"bytes={download.CHUNK_SIZE}-"
+    assert "If-Range" in headers
+    # Progress continues from the partial file, and the hash covers both parts
+    assert progress[0][0] > download.CHUNK_SIZE and progress[-1] == (len(body), len(body))
+    assert os.path.basename(path) == hashlib.sha256(body).hexdigest() + ".glb"
+    with open(path, "rb") as f:
+        assert f.read() == body
+
+def test_changed_file_restarts_instead_of_resuming(server, tmp_path):
+    server.files["/big.glb"] = payload(3 * download.CHUNK_SIZE)
+    cache = DownloadCache(str(tmp_path))
+    cancel = threading.Event()
+    with pytest.raises(DownloadCancelled):
+        cache.fetch(server.url + "/big.glb", "big.glb", progress=lambda done, total: cancel.set(), cancel=cancel)
+    changed = payload(3 * download.CHUNK_SIZE, seed=7)
+    server.files["/big.glb"] = changed
+    path = cache.fetch(server.url + "/big.glb", "big.glb")
+    with open(path, "rb") as f:
+        assert f.read() == changed
+
+def test_least_recently_used_files_are_evicted(server, tmp_path, monkeypatch):
+    clock = iter(range(1000))
+    monkeypatch.setattr(download.time, "time", lambda: next(clock))
+    for name in ("a", "b", "c"):
+        server.files[f"/{name}.glb"] = payload(1000, seed=ord(name))
+    cache = DownloadCache(str(tmp_path), max_bytes=2500)
+    a = cache.fetch(server.url + "/a.glb", "a.glb")
+    cache.fetch(server.url + "/b.glb", "b.glb")
+    # Touching a makes b the least recently used file
+    cache.lookup(server.url + "/a.glb")
+    cache.fetch(server.url + "/c.glb", "c.glb")
+    assert cache.lookup(server.url + "/b.glb") is None
+    assert cache.lookup(server.url + "/a.glb") == a
+    assert cache.lookup(server.url + "/c.glb") is not None
+
+def test_http_errors(server, tmp_path):
+    cache = DownloadCache(str(tmp_path))
+    with pytest.raises(DownloadError) as error:
+        cache.fetch(server.url + "/missing.glb", "missing.glb")
+    assert error.value.status == 404
+    assert not download.is_retryable(error.value)
+    assert download.is_retryable(DownloadError("busy", status=503))
+
+def test_queue_retries_server_errors(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(DownloadQueue, "BACKOFF", 0.01)
+    body = payload(5000)
+    server.files["/flaky.glb"] = body
+    server.failures["/flaky.glb"] = 2
+    downloads = DownloadQueue(DownloadCache(str(tmp_path)), workers=2)
+    try:
+        path = downloads.submit(server.url + "/flaky.glb", "flaky.glb").result(timeout=30)
+    finally:
+        downloads.shutdown()
+    with open(path, "rb") as f:
+        assert f.read() == body
+    assert len(server.requests) == 3
+
+def test_pinned_files_are_not_evicted(server, tmp_path, monkeypatch):
+    clock = iter(range(1000))
+    monkeypatch.setattr(download.time, "time", lambda: next(clock))
+    for name in ("a", "b", "c"):
+        server.files[f"/{name}.glb"] = payload(1000, seed=ord(name))
+    urls = [server.url + f"/{name}.glb" for name in ("a", "b", "c")]
+    cache = DownloadCache(str(tmp_path), max_bytes=1500)
+    cache.pin(urls[:2])
+    paths = [cache.fetch(url, os.path.basename(url)) for url in urls]
+    # a and b wait for their import, the cache grows past its budget meanwhile
+    assert all(os.path.exists(path) for path in paths)
+    cache.unpin(urls[:2])
+    cache.fetch(urls[2], "c.glb")
+    server.files["/d.glb"] = payload(1000, seed=ord("d"))
+    cache.fetch(server.url + "/d.glb", "d.glb")
+    assert cache.lookup(urls[0]) is None and cache.lookup(urls[1]) is None
@@ -0,0 +1,92 @@
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from meshtools.gltf_fast import GLBFile, UnsupportedGLB, detect_format
+
+COORDS = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float32)
+UVS = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=np.float32)
+INDICES = np.array([0, 1, 2, 0, 2, 3], dtype=np.uint16)
+
+def write_glb(path, gltf=None, primitive=None):
+    """Single quad GLB with POSITION, TEXCOORD_0 and uint16 indices, `primitive` replaces its fields"""
+    blobs = [COORDS.tobytes(), UVS.tobytes(), INDICES.tobytes()]
+    views, offset = [], 0
+    for blob in blobs:
+        views.append({"buffer": 0, "byteOffset": offset, "byteLength": len(blob)})
+        offset += (len(blob) + 3) & ~3
+    binary = b"".join(blob.ljust((len(blob) + 3) & ~3, b"\0") for blob in blobs)
+    document = {
+        "asset": {"version": "2.0"},
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0, "TEXCOORD_0": 1}, "indices": 2, **(primitive or {})}]}],
+        "accessors": [
+            {"bufferView": 0, "componentType": 5126, "count": 4, "type": "VEC3"},
+            {"bufferView": 1, "componentType": 5126, "count": 4, "type": "VEC2"},
+            {"bufferView": 2, "componentType": 5123, "count": 6, "type": "SCALAR"},
+        ],
+        "bufferViews": views,
+        "buffers": [{"byteLength": len(binary)}],
+        **(gltf or {}),
+    }
+    text = json.dumps(document).encode("utf-8")
+    text = text.ljust((len(text) + 3) & ~3, b" ")
+    with open(path, "wb") as f:
+        f.write(struct.pack("<4sII", b"glTF", 2, 12 + 8 + len(text) + 8 + len(binary)))
+        f.write(struct.pack("<II", len(text), 0x4E4F534A) + text)
+        f.write(struct.pack("<II", len(binary), 0x004E4942) + binary)
+    return str(path)
+
+def test_mesh_buffers(tmp_path):
+    path = write_glb(tmp_path / "quad.glb")
+    assert detect_format(path) == 'GLB'
+    with GLBFile(path) as glb:
+        coords, loop_verts, loop_starts, corner_uvs, face_materials, materials = glb.mesh_buffers(0)
+        assert np.array_equal(coords, COORDS)
+        assert loop_verts.dtype == np.int32
+        assert loop_verts.tolist() == INDICES.tolist()
+        assert loop_starts.tolist() == [0, 3]
+        # V is flipped to Blender's bottom-left origin
+        assert np.allclose(corner_uvs[:, 1], 1.0 - UVS[INDICES, 1])
+        assert face_materials.tolist() == [0, 0]
+        assert materials == [-1]
+
+def test_missing_position_is_unsupported(tmp_path):
+    path = write_glb(tmp_path / "no_position.glb", primitive={"attributes": {"TEXCOORD_0": 1}})
+    with GLBFile(path) as glb, pytest.raises(UnsupportedGLB):
+        glb.mesh_buffers(0)
+
+def test_unknown_component_type_is_unsupported(tmp_path):
+    path = write_glb(tmp_path / "int32.glb")
+    with GLBFile(path) as glb:
+        glb.json["accessors"][2]["componentType"] = 5124
+        with pytest.raises(UnsupportedGLB):
+            glb.mesh_buffers(0)
+
+def test_compressed_files_are_unsupported(tmp_path):
+    path = write_glb(tmp_path / "draco.glb", gltf={"extensionsUsed": ["KHR_draco_mesh_compression"]})
+    with pytest.raises(UnsupportedGLB):
+        GLBFile(path)
+
+def test_detect_format(tmp_path):
+    obj = tmp_path / "model.obj"
+    obj.write_text("# comment\nv 0 0 0\n")
+    gltf = tmp_path / "model.gltf"
+    gltf.write_text('{"asset": {}}')
+    assert detect_format(str(obj)) == 'OBJ'
+    assert detect_format(str(gltf)) == 'GLTF'
+
+def test_out_of_range_indices_are_unsupported(tmp_path):
+    path = write_glb(tmp_path / "range.glb")
+    with GLBFile(path) as glb:
+        glb.json["accessors"][0]["count"] = 3
+        with pytest.raises(UnsupportedGLB):
+            glb.mesh_buffers(0)
+
+def test_partial_triangles_are_unsupported(tmp_path):
+    path = write_glb(tmp_path / "partial.glb")
+    with GLBFile(path) as glb:
+        glb.json["accessors"][2]["count"] = 5
+        with pytest.raises(UnsupportedGLB):
+            glb.mesh_buffers(0)
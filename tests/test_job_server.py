@@ -0,0 +1,57 @@
+"""Job submission checks of the job server over a local HTTP round trip, without workers"""
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from meshtools import job_server
+
+@pytest.fixture
+def server(tmp_path):
+    jobs = job_server.JobServer(str(tmp_path), blender="blender")
+    httpd = job_server.ThreadingHTTPServer(("127.0.0.1", 0), job_server.JobRequestHandler)
+    httpd.jobs = jobs
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def post(httpd, body):
+    request = urllib.request.Request(f"http://127.0.0.1:{httpd.server_port}/jobs",
+                                     data=json.dumps(body).encode(), method="POST")
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def test_options_are_normalized(server):
+    status, body = post(server, {"path": "model.obj", "options": {"bake": True, "bake_backend": "native", "target_faces": 5000.0}})
+    assert status == 202
+    options = server.jobs.jobs[body["id"]]["job"]["options"]
+    assert options["bake_backend"] == "NATIVE"
+    assert options["target_faces"] == 5000 and isinstance(options["target_faces"], int)
+    assert options["merge"] is True
+
+@pytest.mark.parametrize("options", [
+    ["bake"],
+    "bake",
+    {"bake_backend": "cycles"},
+    {"target_faces": "many"},
+    {"target_faces": 10.5},
+    {"bake": 1},
+    {"unknown": True},
+])
+def test_bad_options_are_rejected(server, options):
+    status, body = post(server, {"path": "model.obj", "options": options})
+    assert status == 400
+    assert body["error"]
+    assert not server.jobs.jobs
+
+def test_bad_request_bodies_are_rejected(server):
+    assert post(server, ["model.obj"])[0] == 400
+    assert post(server, {"model_url": 5})[0] == 400
+    assert post(server, {})[0] == 400
@@ -0,0 +1,53 @@
+import numpy as np
+
+from meshtools.mesh_merge import find_close_pairs, weld_faces, weld_map
+
+def brute_force_pairs(coords, distance):
+    delta = coords[:, None] - coords[None]
+    close = np.einsum('ijk,ijk->ij', delta, delta) <= distance * distance
+    a, b = np.nonzero(np.triu(close, k=1))
+    return set(zip(a.tolist(), b.tolist()))
+
+def test_find_close_pairs_matches_brute_force():
+    rng = np.random.default_rng(0)
+    coords = rng.random((400, 3))
+    a, b = find_close_pairs(coords, 0.05)
+    found = {(min(i, j), max(i, j)) for i, j in zip(a.tolist(), b.tolist())}
+    assert len(found) == len(a)
+    assert found == brute_force_pairs(coords, 0.05)
+
+def test_find_close_pairs_without_candidates():
+    a, b = find_close_pairs(np.zeros((1, 3)), 1.0)
+    assert len(a) == len(b) == 0
+    a, b = find_close_pairs(np.random.default_rng(1).random((10, 3)), 0.0)
+    assert len(a) == 0
+
+def test_weld_map_merges_duplicates_in_index_order():
+    coords = np.array([[0, 0, 0], [1, 0, 0], [0, 0, 1e-6], [1, 0, 0], [5, 5, 5]], dtype=np.float64)
+    remap, keep = weld_map(coords, 1e-4)
+    assert keep.tolist() == [0, 1, 4]
+    assert remap.tolist() == [0, 1, 0, 1, 2]
+
+def test_weld_map_does_not_chain():
+    coords = np.column_stack((np.arange(10) * 0.9, np.zeros(10), np.zeros(10)))
+    remap, keep = weld_map(coords, 1.0)
+    assert keep.tolist() == [0, 2, 4, 6, 8]
+    # Every vertex stays within the merge distance of the vertex it was welded to
+    assert (np.linalg.norm(coords - coords[keep][remap], axis=1) <= 1.0).all()
+
+def test_weld_map_zero_distance_only_welds_exact_duplicates():
+    coords = np.array([[0, 0, 0], [0, 0, 1e-9], [0, 0, 0]], dtype=np.float64)
+    remap, keep = weld_map(coords, 0.0)
+    assert keep.tolist() == [0, 1]
+    assert remap.tolist() == [0, 1, 0]
+
+def test_weld_faces_drops_collapsed_faces():
+    # Two triangles, the second collapses once vertices 2 and 3 are welded
+    loop_verts = np.array([0, 1, 2, 1, 3, 2])
+    loop_starts = np.array([0, 3])
+    loop_totals = np.array([3, 3])
+    remap = np.array([0, 1, 2, 2])
+    new_verts, new_starts, corner_src, face_src = weld_faces(remap, loop_verts, loop_starts, loop_totals)
+    assert face_src.tolist() == [0]
+    assert new_verts.tolist() == [0, 1, 2]
+    assert corner_src.tolist() == [0, 1, 2]
@@ -0,0 +1,37 @@
+import numpy as np
+
+from meshtools.normals import edge_split_vertex_count, face_normals, split_normals
+
+def cube():
+    coords = np.array([[x, y, z] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], dtype=np.float64)
+    faces = [[0, 1, 3, 2], [4, 6, 7, 5], [0, 4, 5, 1], [2, 3, 7, 6], [0, 2, 6, 4], [1, 5, 7, 3]]
+    loop_verts = np.array(faces).ravel()
+    return coords, loop_verts, np.arange(0, 24, 4), np.full(6, 4)
+
+def test_face_normals_point_outwards():
+    coords, loop_verts, loop_starts, loop_totals = cube()
+    normals = face_normals(coords, loop_verts, loop_starts, loop_totals)
+    centers = coords[loop_verts].reshape(6, 4, 3).mean(axis=1)
+    assert np.allclose(normals, centers)
+
+def test_split_normals_keep_hard_edges_below_the_angle():
+    coords, loop_verts, loop_starts, loop_totals = cube()
+    normals, fans = split_normals(coords, loop_verts, loop_starts, loop_totals, np.radians(30.0))
+    assert len(np.unique(fans)) == 24
+    face = np.repeat(face_normals(coords, loop_verts, loop_starts, loop_totals), 4, axis=0)
+    assert np.allclose(normals, face, atol=1e-6)
+    assert edge_split_vertex_count(len(coords), loop_verts, fans) == 24
+
+def test_split_normals_smooth_above_the_angle():
+    coords, loop_verts, loop_starts, loop_totals = cube()
+    normals, fans = split_normals(coords, loop_verts, loop_starts, loop_totals, np.radians(100.0))
+    assert len(np.unique(fans)) == 8
+    expected = coords[loop_verts] / np.sqrt(3.0)
+    assert np.allclose(normals, expected, atol=1e-6)
+
+def test_split_normals_sharp_edges_split_fans():
+    coords, loop_verts, loop_starts, loop_totals = cube()
+    sharp = np.array([[0, 1], [1, 3], [3, 2], [2, 0]])
+    _, fans = split_normals(coords, loop_verts, loop_starts, loop_totals, np.radians(100.0), sharp)
+    # The first face is cut off at its four corners, the rest stays smooth
+    assert len(np.unique(fans)) == 12
@@ -0,0 +1,53 @@
+import numpy as np
+
+from meshtools.quads import candidate_pairs, greedy_pairs, join_pairs
+
+def triangulated_grid(side):
+    """side x side unit squares, each split along its diagonal into two triangles"""
+    u, v = np.meshgrid(np.arange(side + 1), np.arange(side + 1))
+    coords = np.column_stack((u.ravel(), v.ravel(), np.zeros(u.size))).astype(np.float64)
+    first = (np.arange(side)[:, None] * (side + 1) + np.arange(side)).ravel()
+    a, b, c, d = first, first + 1, first + side + 2, first + side + 1
+    tris = np.column_stack((a, b, c, a, c, d)).reshape(-1, 3)
+    loop_totals = np.full(len(tris), 3)
+    loop_starts = np.arange(0, 3 * len(tris), 3)
+    return coords, tris.ravel(), loop_starts, loop_totals
+
+def test_candidate_pairs_only_joins_square_diagonals():
+    coords, loop_verts, loop_starts, loop_totals = triangulated_grid(2)
+    face_a, face_b, quad_corners, score = candidate_pairs(coords, loop_verts, loop_starts, loop_totals, 40.0, 10.0)
+    # Across a grid edge the quad would have 45 degree corners, only the diagonals qualify
+    assert sorted(zip(face_a.tolist(), face_b.tolist())) == [(0, 1), (2, 3), (4, 5), (6, 7)]
+    assert np.allclose(score, 0.0)
+    assert quad_corners.shape == (4, 4)
+
+def test_candidate_pairs_respects_uv_seams_and_materials():
+    coords, loop_verts, loop_starts, loop_totals = triangulated_grid(1)
+    uvs = coords[loop_verts, :2].copy()
+    assert len(candidate_pairs(coords, loop_verts, loop_starts, loop_totals, 40.0, 10.0, [uvs])[0]) == 1
+    uvs[3] += 0.5
+    assert len(candidate_pairs(coords, loop_verts, loop_starts, loop_totals, 40.0, 10.0, [uvs])[0]) == 0
+    materials = np.array([0, 1])
+    assert len(candidate_pairs(coords, loop_verts, loop_starts, loop_totals, 40.0, 10.0, (), materials)[0]) == 0
+
+def test_greedy_pairs_matches_sequential_greedy():
+    rng = np.random.default_rng(0)
+    face_count = 60
+    face_a = rng.integers(0, face_count, 200)
+    face_b = (face_a + rng.integers(1, face_count, 200)) % face_count
+    score = rng.random(200)
+
+    used, expected = set(), []
+    for i in sorted(range(len(score)), key=lambda i: (score[i], i)):
+        if face_a[i] not in used and face_b[i] not in used:
+            used.update((face_a[i], face_b[i]))
+            expected.append(i)
+    assert greedy_pairs(face_a, face_b, score, face_count).tolist() == sorted(expected)
+
+def test_join_pairs_builds_quads():
+    coords, loop_verts, loop_starts, loop_totals = triangulated_grid(1)
+    face_a, face_b, quad_corners, score = candidate_pairs(coords, loop_verts, loop_starts, loop_totals, 40.0, 10.0)
+    starts, corner_src, face_src = join_pairs(loop_starts, loop_totals, face_a, face_b, quad_corners)
+    assert starts.tolist() == [0]
+    assert face_src.tolist() == [0]
+    assert sorted(loop_verts[corner_src].tolist()) == [0, 1, 2, 3]
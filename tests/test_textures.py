@@ -0,0 +1,143 @@
+import os
+import struct
+import sys
+import zlib
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from meshtools.textures import TextureStore, box_downscale, encode_exr, encode_png, mip_chain, parse_sizes
+
+def decode_png(data):
+    """RGBA rows of an 8-bit PNG written with the "Up" filter, top row first"""
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    offset, chunks = 8, {}
+    while offset < len(data):
+        length, kind = struct.unpack(">I4s", data[offset:offset + 8])
+        body = data[offset + 8:offset + 8 + length]
+        crc, = struct.unpack(">I", data[offset + 8 + length:offset + 12 + length])
+        assert crc == zlib.crc32(kind + body) & 0xFFFFFFFF
+        chunks[kind] = chunks.get(kind, b"") + body
+        offset += 12 + length
+    width, height, depth, color_type = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    assert (depth, color_type) == (8, 6)
+    raw = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(height, width * 4 + 1)
+    assert (raw[:, 0] == 2).all()
+    rows = np.cumsum(raw[:, 1:].astype(np.uint64), axis=0) % 256
+    return rows.astype(np.uint8).reshape(height, width, 4)
+
+def test_encode_png_round_trip():
+    rng = np.random.default_rng(0)
+    pixels = rng.random((5, 7, 4)).astype(np.float32)
+    decoded = decode_png(encode_png(pixels))
+    expected = (pixels[::-1] * 255.0 + 0.5).astype(np.uint8)
+    assert np.array_equal(decoded, expected)
+
+def test_encode_png_clamps():
+    pixels = np.full((1, 1, 4), 2.0, dtype=np.float32)
+    pixels[..., 0] = -1.0
+    assert decode_png(encode_png(pixels)).ravel().tolist() == [0, 255, 255, 255]
+
+def test_box_downscale_averages_and_repeats_odd_edges():
+    pixels = np.arange(9, dtype=np.float32).reshape(3, 3, 1)
+    half = box_downscale(pixels)
+    assert half.shape == (2, 2, 1)
+    assert half[0, 0, 0] == np.mean([0, 1, 3, 4])
+    assert half[1, 1, 0] == 8.0
+
+def test_mip_chain_sizes():
+    pixels = np.zeros((64, 32, 4), dtype=np.float32)
+    variants = mip_chain(pixels, [128, 32, 8])
+    assert variants[128].shape[:2] == (64, 32)
+    assert variants[32].shape[:2] == (32, 16)
+    assert variants[8].shape[:2] == (8, 4)
+
+def decode_exr(data):
+    """(h, w, 4) float32 RGBA rows, top first, of an uncompressed single part FLOAT OpenEXR"""
+    assert struct.unpack("<ii", data[:8]) == (20000630, 2)
+    offset, attributes = 8, {}
+    while data[offset]:
+        name, offset = data[offset:data.index(b"\0", offset)], data.index(b"\0", offset) + 1
+        kind, offset = data[offset:data.index(b"\0", offset)], data.index(b"\0", offset) + 1
+        size, = struct.unpack("<i", data[offset:offset + 4])
+        attributes[name] = (kind, data[offset + 4:offset + 4 + size])
+        offset += 4 + size
+    offset += 1
+    assert attributes[b"compression"] == (b"compression", b"\0")
+    channels, chlist = [], attributes[b"channels"][1]
+    while chlist[0]:
+        end = chlist.index(b"\0")
+        assert struct.unpack("<iB3xii", chlist[end + 1:end + 17]) == (2, 0, 1, 1)
+        channels.append(chlist[:end])
+        chlist = chlist[end + 17:]
+    assert channels == [b"A", b"B", b"G", b"R"]
+    x0, y0, x1, y1 = struct.unpack("<4i", attributes[b"dataWindow"][1])
+    width, height = x1 - x0 + 1, y1 - y0 + 1
+    table = np.frombuffer(data, dtype="<u8", count=height, offset=offset)
+    rows = np.empty((height, width, 4), dtype=np.float32)
+    for y, start in enumerate(table):
+        line, size = struct.unpack("<ii", data[start:start + 8])
+        assert (line, size) == (y, 16 * width)
+        abgr = np.frombuffer(data, dtype="<f4", count=4 * width, offset=int(start) + 8).reshape(4, width)
+        rows[y] = abgr[::-1].T
+    return rows
+
+def test_encode_exr_keeps_float_values():
+    rng = np.random.default_rng(1)
+    pixels = (rng.random((3, 5, 4)) * 40.0 - 10.0).astype(np.float32)
+    assert np.array_equal(decode_exr(encode_exr(pixels)), pixels[::-1])
+
+def test_parse_sizes():
+    assert parse_sizes("512, 1024;256,") == [1024, 512, 256]
+    assert parse_sizes("") == []
+    with pytest.raises(ValueError):
+        parse_sizes("1024, 0")
+    with pytest.raises(ValueError):
+        parse_sizes("big")
+
+class FakeImage:
+    """The parts of bpy.types.Image the texture store reads"""
+
+    def __init__(self, name, pixels, filepath="", is_float=False):
+        self.name = name
+        self.size = (pixels.shape[1], pixels.shape[0])
+        self.channels = pixels.shape[2]
+        self.pixels = SimpleNamespace(foreach_get=lambda out: out.__setitem__(slice(None), pixels.ravel()))
+        self.filepath = filepath
+        self.source = 'FILE' if filepath else 'GENERATED'
+        self.packed_file = None
+        self.is_dirty = False
+        self.is_float = is_float
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "bpy", SimpleNamespace(path=SimpleNamespace(abspath=lambda path: path)))
+    return TextureStore(str(tmp_path / "textures"), workers=2)
+
+def test_store_writes_variant_set_once(store):
+    pixels = np.random.default_rng(2).random((64, 32, 4)).astype(np.float32)
+    images = [FakeImage("a", pixels), FakeImage("b", pixels.copy())]
+    paths, stats = store.store_images(images, max_size=0, variants=[128, 32, 8])
+    assert paths["a"] == paths["b"] and paths["a"].endswith(".png")
+    assert (stats["written"], stats["reused"]) == (3, 3)
+    names = sorted(os.listdir(store.root))
+    assert len(names) == 3 and sum(name.endswith(("_32.png", "_8.png")) for name in names) == 2
+    variant = next(name for name in names if name.endswith("_8.png"))
+    with open(os.path.join(store.root, variant), "rb") as f:
+        assert decode_png(f.read()).shape == (8, 4, 4)
+
+    _, stats = store.store_images(images[:1], max_size=32, variants=[8])
+    assert (stats["written"], stats["reused"]) == (0, 2)
+
+def test_store_keeps_float_images_float(store, tmp_path):
+    pixels = np.full((4, 4, 4), 7.5, dtype=np.float32)
+    paths, _ = store.store_images([FakeImage("hdr", pixels, is_float=True)], max_size=2, variants=[1])
+    with open(paths["hdr"], "rb") as f:
+        level = decode_exr(f.read())
+    assert paths["hdr"].endswith("_2.exr") and level.shape == (2, 2, 4) and (level == 7.5).all()
+
+    source = tmp_path / "scan.exr"
+    source.write_bytes(b"not decoded, copied as it is")
+    paths, _ = store.store_images([FakeImage("disk", pixels, filepath=str(source), is_float=True)], variants=[2])
+    assert paths["disk"].endswith(".exr") and open(paths["disk"], "rb").read() == source.read_bytes()
@@ -0,0 +1,250 @@
+import hashlib
+import os
+import shutil
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+
+# Folder next to the exported FBX files that holds the shared texture files
+STORE_DIR = "textures"
+PNG_LEVEL = 6
+
+# ------------------------------
+# Pure NumPy core
+# ------------------------------
+def box_downscale(pixels):
+    """Half size mip level of an (h, w, c) float array, odd edges are repeated"""
+    h, w = pixels.shape[:2]
+    if h % 2 and h > 1:
+        pixels = np.concatenate((pixels, pixels[-1:]), axis=0)
+    if w % 2 and w > 1:
+        pixels = np.concatenate((pixels, pixels[:, -1:]), axis=1)
+    h, w, c = pixels.shape
+    if h == 1 and w == 1:
+        return pixels
+    if h == 1:
+        return pixels.reshape(1, w // 2, 2, c).mean(axis=2)
+    if w == 1:
+        return pixels.reshape(h // 2, 2, 1, c).mean(axis=1)
+    return pixels.reshape(h // 2, 2, w // 2, 2, c).mean(axis=(1, 3))
+
+def parse_sizes(text):
+    """Resolutions from a comma separated list, largest first"""
+    sizes = sorted({int(value) for value in text.replace(";", ",").split(",") if value.strip()}, reverse=True)
+    if sizes and sizes[-1] < 1:
+        raise ValueError(f"Invalid texture sizes: {text!r}")
+    return sizes
+
+def mip_chain(pixels, sizes):
+    """
+    Downscaled variants of `pixels` for every size in `sizes` (largest side),
+    as {size: array}. Each variant is the first 2x2 box filtered mip level
+    that fits, sizes the image already fits keep the full resolution.
+    """
+    variants = {}
+    level = pixels
+    for size in sorted(sizes, reverse=True):
+        while max(level.shape[:2]) > size:
+            level = box_downscale(level)
+        variants[size] = level
+    return variants
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+def encode_png(pixels):
+    """8-bit RGBA PNG of bottom-up (h, w, 4) float pixels as Blender stores them"""
+    rgba = (np.clip(pixels[::-1], 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+    h, w = rgba.shape[:2]
+    rows = rgba.reshape(h, w * 4)
+    # "Up" filter: every row stored as the difference to the one above, compresses much better
+    filtered = np.empty((h, w * 4 + 1), dtype=np.uint8)
+    filtered[:, 0] = 2
+    filtered[0, 1:] = rows[0]
+    filtered[1:, 1:] = rows[1:] - rows[:-1]
+    return b"".join((
+        b"\x89PNG\r\n\x1a\n",
+        _png_chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 6, 0, 0, 0)),
+        _png_chunk(b"IDAT", zlib.compress(filtered.tobytes(), PNG_LEVEL)),
+        _png_chunk(b"IEND", b""),
+    ))
+
+def encode_exr(pixels):
+    """
+    Uncompressed 32-bit float RGBA OpenEXR of bottom-up (h, w, 4) pixels,
+    for float images whose values (HDR, displacement) don't fit 8 bits.
+    """
+    h, w = pixels.shape[:2]
+
+    def attribute(name, kind, value):
+        return name + b"\0" + kind + b"\0" + struct.pack("<i", len(value)) + value
+
+    # Channels are listed (and stored) alphabetically, FLOAT (2) with 1x1 sampling
+    channels = b"".join(name + b"\0" + struct.pack("<iB3xii", 2, 0, 1, 1) for name in (b"A", b"B", b"G", b"R")) + b"\0"
+    window = struct.pack("<4i", 0, 0, w - 1, h - 1)
+    header = b"".join((
+        struct.pack("<ii", 20000630, 2),
+        attribute(b"channels", b"chlist", channels),
+        attribute(b"compression", b"compression", b"\0"),
+        attribute(b"dataWindow", b"box2i", window),
+        attribute(b"displayWindow", b"box2i", window),
+        attribute(b"lineOrder", b"lineOrder", b"\0"),
+        attribute(b"pixelAspectRatio", b"float", struct.pack("<f", 1.0)),
+        attribute(b"screenWindowCenter", b"v2f", struct.pack("<ff", 0.0, 0.0)),
+        attribute(b"screenWindowWidth", b"float", struct.pack("<f", 1.0)),
+        b"\0",
+    ))
+    # One block per scan line, top row first: y, byte count, then the A, B, G and R rows
+    blocks = np.empty(h, dtype=[("y", "<i4"), ("size", "<i4"), ("data", "<f4", (4, w))])
+    blocks["y"] = np.arange(h)
+    blocks["size"] = 16 * w
+    blocks["data"] = pixels[::-1][..., [3, 2, 1, 0]].transpose(0, 2, 1)
+    offsets = len(header) + 8 * h + np.arange(h, dtype="<u8") * blocks.itemsize
+    return header + offsets.astype("<u8").tobytes() + blocks.tobytes()
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _copy_atomic(source, path):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, path)
+
+def _file_digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _read_pixels(image):
+    """(h, w, 4) float32 RGBA pixels of a Blender image, bottom row first"""
+    width, height = image.size
+    pixels = np.empty(width * height * image.channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    pixels = pixels.reshape(height, width, image.channels)
+    if image.channels != 4:
+        rgba = np.ones((height, width, 4), dtype=np.float32)
+        rgba[..., :min(image.channels, 3)] = pixels[..., :3]
+        if image.channels == 1:
+            rgba[..., 1:3] = pixels[..., :1]
+        pixels = rgba
+    return pixels
+
+# ------------------------------
+# Texture store
+# ------------------------------
+class TextureStore:
+    """
+    Content-addressed texture files in one directory.
+
+    Files are named after the hash of their content plus the variant size
+    (`<hash>.<ext>` for the full resolution, `<hash>_<size>.<ext>` for the
+    downscaled mip levels), so identical images used by many materials,
+    objects or exports are written once and files from earlier exports are
+    reused as they are. Float images are written as OpenEXR, others as PNG.
+    Downscaling and encoding run on a thread pool, only reading pixels
+    needs the main thread.
+    """
+
+    def __init__(self, root, workers=None):
+        self.root = root
+        self.workers = workers or os.cpu_count() or 1
+        os.makedirs(root, exist_ok=True)
+
+    def store_images(self, images, max_size=0, variants=()):
+        """
+        Store every image, downscaled so its largest side is at most
+        `max_size` (0 keeps the resolution), plus one downscaled variant
+        for every size in `variants` smaller than the image. Returns
+        ({image name: path of the max_size file}, stats).
+        """
+        paths = {}
+        stats = {"images": len(images), "written": 0, "reused": 0, "bytes": 0}
+        planned = set()
+        jobs = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for image in images:
+                task = self._plan(image, max_size, variants, planned)
+                if task is None:
+                    continue
+                path, files, work = task
+                paths[image.name] = path
+                missing = [file for file in files if file not in planned and not os.path.exists(file)]
+                stats["reused"] += len(files) - len(missing)
+                planned.update(files)
+                if missing:
+                    jobs.append((missing, pool.submit(work, missing)))
+            for missing, future in jobs:
+                future.result()
+                stats["written"] += len(missing)
+        stats["bytes"] = sum(os.path.getsize(path) for path in set(paths.values()))
+        return paths, stats
+
+    def _plan(self, image, max_size, variants, planned):
+        """
+        (path of the max_size file, paths of the image's whole file set,
+        fn(missing paths) writing them) for one image, None for images
+        without pixels. Pixels are only read when a file is missing.
+        """
+        # Imported here so the NumPy core above loads without Blender
+        import bpy
+        width, height = image.size
+        if not width or not height:
+            return None
+        source = bpy.path.abspath(image.filepath) if image.filepath else ""
+        on_disk = image.source == 'FILE' and image.packed_file is None and not image.is_dirty and os.path.isfile(source)
+        ext = ".exr" if image.is_float else ".png"
+        encode = encode_exr if image.is_float else encode_png
+        reference = max_size if max_size and max(width, height) > max_size else 0
+        sizes = sorted({size for size in variants if 0 < size < max(width, height)} | {reference}, reverse=True)
+
+        pixels = None
+        if on_disk:
+            # Files on disk are hashed as they are, so reused file sets need no pixel read
+            digest = _file_digest(source)
+            full_ext = os.path.splitext(source)[1].lower() or ext
+        else:
+            pixels = _read_pixels(image)
+            digest = hashlib.blake2b(pixels.tobytes(), digest_size=16).hexdigest()
+            full_ext = ext
+        files = {size: os.path.join(self.root, f"{digest}_{size}{ext}" if size else digest + full_ext) for size in sizes}
+        # Every file but an on-disk original is encoded from the pixels
+        encoded = {size: path for size, path in files.items() if size or not on_disk}
+        if pixels is None and any(path not in planned and not os.path.exists(path) for path in encoded.values()):
+            pixels = _read_pixels(image)
+
+        def work(missing):
+            if on_disk and files.get(0) in missing:
+                # The full resolution of an unchanged file is stored byte for byte, keeping its format and depth
+                _copy_atomic(source, files[0])
+            # mip_chain keys by largest side, the full resolution (0) is the image's own
+            targets = {size or max(width, height): size for size, path in encoded.items() if path in missing}
+            for target, level in mip_chain(pixels, targets).items():
+                _write_atomic(files[targets[target]], encode(level))
+        return files[reference], list(files.values()), work
+
+@contextmanager
+def stored_textures(images, root, max_size=0, variants=()):
+    """
+    Point `images` at their content-hashed store files while the block runs
+    (for an FBX export with path_mode='RELATIVE'), yields the store stats.
+    filepath_raw is used so no image gets reloaded.
+    """
+    paths, stats = TextureStore(root).store_images(images, max_size, variants)
+    originals = {}
+    try:
+        for image in images:
+            if image.name in paths:
+                originals[image] = image.filepath_raw
+                image.filepath_raw = paths[image.name]
+        yield stats
+    finally:
+        for image, filepath in originals.items():
+            image.filepath_raw = filepath
@@ -1,4 +1,7 @@
 import bpy
+from . import analysis, operators
+
+LOG_ICONS = {'WARNING': 'ERROR', 'ERROR': 'CANCEL'}
 
 class MeshToolsPanel(bpy.types.Panel):
     bl_label = "Mesh Tools"
@@ -15,7 +18,14 @@ class MeshToolsPanel(bpy.types.Panel):
         col = layout.column(align=True)
 
         col.operator("wm.meshtools_import_model", icon='IMPORT')
+        if operators.download_running():
+            col.operator("wm.meshtools_cancel_import", icon='CANCEL')
         col.operator("wm.meshtools_import_local_model", icon='FILE_FOLDER')
+        row = col.row(align=True)
+        row.prop(scene, "meshtools_download_workers", text="Downloads")
+        row.prop(scene, "meshtools_downloads_per_host", text="Per Host")
+        col.prop(scene, "meshtools_cache_size")
+        col.prop(scene, "meshtools_fast_glb")
 
         # ---------------------------
         # Warning Box Section (Collapsible)
@@ -29,6 +39,17 @@ class MeshToolsPanel(bpy.types.Panel):
         else:
             col.prop(scene, "meshtools_exp_warning", text="⚠️ Warning", icon='ERROR')
 
+        # ---------------------------
+        # Analysis Section (Collapsible)
+        # ---------------------------
+        if scene.meshtools_exp_analysis:
+            analysis_box = col.box()
+            analysis_box.label(text="Analysis:")
+            analysis_box.operator("wm.meshtools_analyze", icon='VIEWZOOM')
+            self.draw_analysis(analysis_box, context)
+        else:
+            col.prop(scene, "meshtools_exp_analysis", text="Analysis", icon='VIEWZOOM')
+
         # ---------------------------
         # Mesh Tools Section (Collapsible)
         # ---------------------------
@@ -42,7 +63,9 @@ class MeshToolsPanel(bpy.types.Panel):
             row.prop(scene, "merge_distance")
             row.operator("wm.meshtools_merge_vertices", icon='AUTOMERGE_ON')
 
-            mesh_box.prop(scene, "smooth_angle")
+            row = mesh_box.row()
+            row.prop(scene, "smooth_angle")
+            row.prop(scene, "meshtools_smooth_mode", text="")
             mesh_box.operator("wm.meshtools_smooth_shading", icon='SHADING_SOLID')
             mesh_box.prop(scene, "material_metallic")
             mesh_box.prop(scene, "material_roughness")
@@ -51,8 +74,23 @@ class MeshToolsPanel(bpy.types.Panel):
             mesh_box.prop(scene, "use_preserve_sharp")
             mesh_box.prop(scene, "use_preserve_boundary")
             mesh_box.prop(scene, "smooth_normals")
-            mesh_box.prop(scene, "target_faces")
+            row = mesh_box.row()
+            row.prop(scene, "target_faces")
+            row.prop(scene, "meshtools_remesh_memory_budget", text="MB")
+            row = mesh_box.row()
+            row.prop(scene, "meshtools_use_remesh_cache")
+            row.prop(scene, "meshtools_remesh_cache_size", text="MB")
+            row = mesh_box.row()
+            row.prop(scene, "meshtools_bake_backend", text="")
+            row.prop(scene, "meshtools_bake_size", text="Size")
+            if scene.meshtools_bake_backend == 'BAKELAB':
+                mesh_box.prop(scene, "meshtools_bake_timeout")
+            else:
+                mesh_box.prop(scene, "meshtools_bake_workers")
             mesh_box.operator("wm.meshtools_bake", icon='MOD_REMESH')
+            row = mesh_box.row(align=True)
+            row.prop(scene, "meshtools_lod_budgets", text="LODs")
+            row.operator("wm.meshtools_lod_chain", text="", icon='MOD_DECIM')
         else:
             col.prop(scene, "meshtools_exp_mesh_tools", text="Mesh Tools", icon='MODIFIER')
 
@@ -62,6 +100,15 @@ class MeshToolsPanel(bpy.types.Panel):
         col.operator("wm.meshtools_export_fbx", icon='EXPORT')
         col.operator("wm.meshtools_quick_export_fbx", icon='EXPORT')
         col.prop(scene, "meshtools_export_fbx_path", text="Export Path")
+        row = col.row(align=True)
+        row.prop(scene, "meshtools_texture_store")
+        row.prop(scene, "meshtools_export_texture_size", text="")
+        if scene.meshtools_texture_store:
+            col.prop(scene, "meshtools_texture_variants", text="Variants")
+        col.prop(scene, "meshtools_export_dir", text="Export Folder")
+        row = col.row(align=True)
+        row.operator("wm.meshtools_export_changed", icon='FILE_REFRESH')
+        row.prop(scene, "meshtools_export_workers", text="Workers")
 
         # ---------------------------
         # Status / Progress Section
@@ -76,7 +123,50 @@ class MeshToolsPanel(bpy.types.Panel):
         if scene.meshtools_exp_log:
             log_box = col.box()
             log_box.label(text="Log:")
-            log_box.prop(scene, "meshtools_log", text="")
-            log_box.operator("wm.meshtools_clear_log", text="Clear Log", icon='X')
+            for _, level, message in operators.log_buffer.tail(scene.meshtools_log_lines):
+                log_box.label(text=message, icon=LOG_ICONS.get(level, 'NONE'))
+            row = log_box.row()
+            row.prop(scene, "meshtools_log_lines")
+            row.operator("wm.meshtools_clear_log", text="Clear Log", icon='X')
+            log_box.prop(scene, "meshtools_log_file")
+            row = log_box.row()
+            row.prop(scene, "meshtools_trace_dir")
+            row.prop(scene, "meshtools_profile", text="", icon='TIME')
+        else:
+            col.prop(scene, "meshtools_exp_log", text="Log", icon='TEXT')
+
+    def draw_analysis(self, box, context):
+        # Only shows cached results, the Analyze operator computes them
+        obj = context.active_object
+        result = analysis.analysis_cache.get(obj.data) if obj and obj.type == 'MESH' else None
+        if result is None:
+            box.label(text="Not analyzed yet or changed since")
+            return
+        box.label(text=f"Faces: {result['faces']} ({result['tris']} tris, {result['quads']} quads, {result['ngons']} ngons)")
+        box.label(text=f"Vertices: {result['vertices']}")
+        box.label(text=f"Non-manifold edges: {result['non_manifold_edges']}",
+                  icon='ERROR' if result['non_manifold_edges'] else 'CHECKMARK')
+        box.label(text=f"Boundary edges: {result['boundary_edges']}")
+        if result["bounds"]:
+            size = [high - low for low, high in zip(*result["bounds"])]
+            box.label(text="Size: " + " x ".join(f"{value:.3g}" for value in size))
+
+        if result["histogram"]:
+            box.label(text=f"Nearest vertex (edge length {result['edge_length']:.3g}):")
+            lower = 0.0
+            for upper, count in result["histogram"]:
+                bound = f">= {lower:.2g}" if upper == float('inf') else f"< {upper:.2g}"
+                box.label(text=f"    {bound}: {count}")
+                lower = upper
+        row = box.row()
+        if result["merge_distance"]:
+            row.label(text=f"{result['duplicates']} near duplicates, merge {result['merge_distance']:.3g}")
+            row.operator("wm.meshtools_use_merge_suggestion", text="Use")
         else:
-            col.prop(scene, "meshtools_exp_log", text="Log", icon='TEXT')
\ No newline at end of file
+            row.label(text="No near-duplicate vertices")
+
+        seconds, memory = analysis.remesh_costs.estimate(result["triangles"], context.scene.target_faces)
+        box.label(text=f"Remesh estimate: ~{seconds:.0f}s, ~{memory / (1 << 20):.0f} MB", icon='TIME')
+        budget = context.scene.meshtools_remesh_memory_budget
+        if budget and memory > budget * 1024 * 1024:
+            box.label(text=f"Over the {budget} MB budget, a decimated proxy gets remeshed", icon='INFO')